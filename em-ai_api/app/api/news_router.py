@@ -6,13 +6,11 @@ from fastapi.exceptions import ResponseValidationError
 
 from app.config.auth import verify_token
 from app.config.settings import FILE_PATHS
+from app.config.custom_errors import ModelNotReadyError
+from app.config.ai_status_code import Success
 from app.common.log.log_config import setup_logger
 from app.common.core.utils import get_current_datetime, make_dir
-from app.common.news.news_hf_models.news_category import NewsCategoryModel
-from app.common.news.news_hf_models.news_company import NewsCompanyModel
-from app.common.news.news_hf_models.news_esg import NewsESGModel
-from app.common.news.news_hf_models.news_keyphrase import NewsKeyphraseModel
-from app.common.news.news_hf_models.news_investment import NewsInvestmentModel
+from app.common.core.model_registry import model_registry, lazy_loader, warmup_model
 from app.models.news_models import (
     NewsCategoryRequest,
     NewsCompanyRequest,
@@ -29,12 +27,38 @@ make_dir(file_path)
 file_path += f"/news_{get_current_datetime()}.log"
 logger = setup_logger("news", file_path)
 
-# 각 모델별 객체 생성
-news_category_model = NewsCategoryModel()
-news_company_model = NewsCompanyModel()
-news_esg_model = NewsESGModel()
-news_keyphrase_model = NewsKeyphraseModel()
-news_investment_model = NewsInvestmentModel()
+# 각 모델별 객체 등록 (torch/peft 모듈 import 와 실제 로딩은 앱 시작 시 디바이스별로 병렬 수행)
+NEWS_MODELS_MODULE = "app.common.news.news_hf_models"
+model_registry.register(
+    "news_category",
+    lazy_loader(f"{NEWS_MODELS_MODULE}.news_category", "NewsCategoryModel"),
+    "cuda:0",
+    warmup_model,
+)
+model_registry.register(
+    "news_company",
+    lazy_loader(f"{NEWS_MODELS_MODULE}.news_company", "NewsCompanyModel"),
+    "cuda:0",
+    warmup_model,
+)
+model_registry.register(
+    "news_keyphrase",
+    lazy_loader(f"{NEWS_MODELS_MODULE}.news_keyphrase", "NewsKeyphraseModel"),
+    "cuda:0",
+    warmup_model,
+)
+model_registry.register(
+    "news_esg",
+    lazy_loader(f"{NEWS_MODELS_MODULE}.news_esg", "NewsESGModel"),
+    "cuda:1",
+    warmup_model,
+)
+model_registry.register(
+    "news_investment",
+    lazy_loader(f"{NEWS_MODELS_MODULE}.news_investment", "NewsInvestmentModel"),
+    "cuda:1",
+    warmup_model,
+)
 
 
 @router.post("/categories", response_model=NewsResponse)
@@ -49,12 +73,17 @@ async def get_news_category(request: NewsCategoryRequest, token: str = Depends(v
         dict: 분류된 뉴스 카테고리
     """
     try:
+        news_category_model = model_registry.get("news_category")
         news_category_model.postprocess(request.content)
         return news_category_model.response_model
     except ExpiredSignatureError:
         msg = "토근이 만료되었습니다. 담당자에게 문의하거나 토큰을 재발급 받으세요."
         logger.error(msg)
         return {"status": "error", "code": 401, "message": f"[UNAUTHORIZED] {msg}"}
+    except ModelNotReadyError as e:
+        msg = f"모델이 아직 준비되지 않았습니다: {e}"
+        logger.error(msg)
+        return {"status": "error", "code": 503, "message": f"[SERVICE UNAVAILABLE] {msg}"}
     except ResponseValidationError as e:
         msg = f"생성된 응답의 키 값이 잘못되었습니다: {e}"
         logger.error(msg)
@@ -79,12 +108,17 @@ async def get_news_company(request: NewsCompanyRequest, token: str = Depends(ver
         dict: 분류된 뉴스 기업
     """
     try:
+        news_company_model = model_registry.get("news_company")
         news_company_model.postprocess(request.content)
         return news_company_model.response_model
     except ExpiredSignatureError:
         msg = "토근이 만료되었습니다. 담당자에게 문의하거나 토큰을 재발급 받으세요."
         logger.error(msg)
         return {"status": "error", "code": 401, "message": f"[UNAUTHORIZED] {msg}"}
+    except ModelNotReadyError as e:
+        msg = f"모델이 아직 준비되지 않았습니다: {e}"
+        logger.error(msg)
+        return {"status": "error", "code": 503, "message": f"[SERVICE UNAVAILABLE] {msg}"}
     except ResponseValidationError as e:
         msg = f"생성된 응답의 키 값이 잘못되었습니다: {e}"
         logger.error(msg)
@@ -109,12 +143,17 @@ async def get_news_keyphrase(request: NewsKeyphraseRequest, token: str = Depends
         dict: 추출된 뉴스 키워드
     """
     try:
+        news_keyphrase_model = model_registry.get("news_keyphrase")
         news_keyphrase_model.postprocess(request.content)
         return news_keyphrase_model.response_model
     except ExpiredSignatureError:
         msg = "토근이 만료되었습니다. 담당자에게 문의하거나 토큰을 재발급 받으세요."
         logger.error(msg)
         return {"status": "error", "code": 401, "message": f"[UNAUTHORIZED] {msg}"}
+    except ModelNotReadyError as e:
+        msg = f"모델이 아직 준비되지 않았습니다: {e}"
+        logger.error(msg)
+        return {"status": "error", "code": 503, "message": f"[SERVICE UNAVAILABLE] {msg}"}
     except ResponseValidationError as e:
         msg = f"생성된 응답의 키 값이 잘못되었습니다: {e}"
         logger.error(msg)
@@ -139,12 +178,17 @@ async def get_news_esg_sentiment(request: NewsESGRequest, token: str = Depends(v
         dict: 분류된 뉴스 ESG 감성
     """
     try:
+        news_esg_model = model_registry.get("news_esg")
         news_esg_model.postprocess(request.content)
         return news_esg_model.response_model
     except ExpiredSignatureError:
         msg = "토근이 만료되었습니다. 담당자에게 문의하거나 토큰을 재발급 받으세요."
         logger.error(msg)
         return {"status": "error", "code": 401, "message": f"[UNAUTHORIZED] {msg}"}
+    except ModelNotReadyError as e:
+        msg = f"모델이 아직 준비되지 않았습니다: {e}"
+        logger.error(msg)
+        return {"status": "error", "code": 503, "message": f"[SERVICE UNAVAILABLE] {msg}"}
     except ResponseValidationError as e:
         msg = f"생성된 응답의 키 값이 잘못되었습니다: {e}"
         logger.error(msg)
@@ -169,12 +213,17 @@ async def get_news_investment(request: NewsInvestmentRequest, token: str = Depen
         dict: 분류된 뉴스 투자 정보
     """
     try:
+        news_investment_model = model_registry.get("news_investment")
         news_investment_model.postprocess(request.title, request.content)
         return news_investment_model.response_model
     except ExpiredSignatureError:
         msg = "토근이 만료되었습니다. 담당자에게 문의하거나 토큰을 재발급 받으세요."
         logger.error(msg)
         return {"status": "error", "code": 401, "message": f"[UNAUTHORIZED] {msg}"}
+    except ModelNotReadyError as e:
+        msg = f"모델이 아직 준비되지 않았습니다: {e}"
+        logger.error(msg)
+        return {"status": "error", "code": 503, "message": f"[SERVICE UNAVAILABLE] {msg}"}
     except ResponseValidationError as e:
         msg = f"생성된 응답의 키 값이 잘못되었습니다: {e}"
         logger.error(msg)
@@ -185,3 +234,35 @@ async def get_news_investment(request: NewsInvestmentRequest, token: str = Depen
         logger.error(msg)
         logger.error(traceback.format_exc())
         return {"status": "error", "code": 500, "message": f"[INTERNAL SERVER ERROR] {msg}"}
+
+
+@router.get("/prefilter-stats", response_model=NewsResponse)
+async def get_news_prefilter_stats(token: str = Depends(verify_token)):
+    """투자/ESG 사전 필터의 스킵률과 오스킵률을 조회합니다.
+
+    Args:
+        token: 사용자 인증 토큰
+
+    Returns:
+        dict: 태스크별 사전 필터 통계
+    """
+    try:
+        results = [
+            model_registry.get(name).prefilter.to_dict()
+            for name in ("news_investment", "news_esg")
+        ]
+        return {
+            "status": "success",
+            "code": Success.SUCCESS["code"],
+            "message": Success.SUCCESS["message"],
+            "data": {"results": results},
+        }
+    except ModelNotReadyError as e:
+        msg = f"모델이 아직 준비되지 않았습니다: {e}"
+        logger.error(msg)
+        return {"status": "error", "code": 503, "message": f"[SERVICE UNAVAILABLE] {msg}"}
+    except Exception as e:
+        msg = f"API 호출 중 에러가 발생했습니다: {e}"
+        logger.error(msg)
+        logger.error(traceback.format_exc())
+        return {"status": "error", "code": 500, "message": f"[INTERNAL SERVER ERROR] {msg}"}
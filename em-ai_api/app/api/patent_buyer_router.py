@@ -0,0 +1,102 @@
+import traceback
+
+from fastapi import APIRouter, Depends
+from jwt import ExpiredSignatureError
+from fastapi.exceptions import ResponseValidationError
+
+from app.config.auth import verify_token
+from app.config.settings import FILE_PATHS
+from app.config.custom_errors import ModelNotReadyError
+from app.common.log.log_config import setup_logger
+from app.common.core.utils import get_current_datetime, make_dir
+from app.common.core.model_registry import model_registry, lazy_loader, warmup_model
+from app.common.patent.patent_utils.potential_buyer_info_utils import PatentBuyerInfoUtils
+from app.common.patent.patent_utils.tech_price_pred_utils import TECH_VALUE_PRED_MODEL_PATH
+from app.models.patent_models import PotentialBuyersRequest, TechValueRequest, PatentResponse
+
+router = APIRouter()
+
+# Initialize logger
+file_path = FILE_PATHS["log"] + "patent"
+make_dir(file_path)
+file_path += f"/patent_buyer_{get_current_datetime()}.log"
+logger = setup_logger("patent_buyer", file_path)
+
+# Initialize utils
+patent_buyer_info_utils = PatentBuyerInfoUtils()
+
+# 모델 객체 등록 (실제 로딩은 앱 시작 시 수행)
+model_registry.register(
+    "tech_value_pred",
+    lazy_loader(
+        "app.common.patent.patent_utils.tech_price_pred_utils",
+        "TechValuePredictionModel",
+        TECH_VALUE_PRED_MODEL_PATH,
+    ),
+    "cpu",
+    warmup_model,
+)
+
+
+@router.post("/potential-buyers", response_model=PatentResponse)
+async def get_potential_buyers_info(
+    request: PotentialBuyersRequest, token: str = Depends(verify_token)
+):
+    """특허에 대한 잠재적 구매자 정보를 조회합니다.
+
+    Args:
+        request: 잠재적 구매자 정보 조회 요청 데이터
+        token: 사용자 인증 토큰
+
+    Returns:
+        dict: 특허에 대한 잠재적 구매자 정보
+    """
+    try:
+        result = patent_buyer_info_utils.get_corp_with_similar_patent(
+            request.patentId, request.topK
+            )
+        return result
+    except ExpiredSignatureError:
+        msg = "토근이 만료되었습니다. 담당자에게 문의하거나 토큰을 재발급 받으세요."
+        logger.error(msg)
+        return {"status": "error", "code": 401, "message": f"[UNAUTHORIZED] {msg}"}
+    except ResponseValidationError as e:
+        msg = f"생성된 응답의 키 값이 잘못되었습니다: {e}"
+        logger.error(msg)
+        logger.error(traceback.format_exc())
+        return {"status": "error", "code": 400, "message": f"[BAD REQUEST] {msg}"}
+    except Exception as e:
+        msg = f"API 호출 중 에러가 발생했습니다: {e}"
+        logger.error(msg)
+        logger.error(traceback.format_exc())
+        return {"status": "error", "code": 500, "message": f"[INTERNAL SERVER ERROR] {msg}"}
+
+
+@router.post("/price-pred", response_model=PatentResponse)
+async def predict_tech_value(request: TechValueRequest, token: str = Depends(verify_token)):
+    """기술에 대한 가격을 예측합니다."""
+    try:
+        tech_value_pred_utils = model_registry.get("tech_value_pred")
+        tech_value_pred_utils.postprocess(
+            tech_name=[request.techName],
+            tech_description=[request.techDescription]
+        )
+        return tech_value_pred_utils.response_model
+    except ExpiredSignatureError:
+        msg = "토근이 만료되었습니다. 담당자에게 문의하거나 토큰을 재발급 받으세요."
+        logger.error(msg)
+        return {"status": "error", "code": 401, "message": f"[UNAUTHORIZED] {msg}"}
+    except ModelNotReadyError as e:
+        msg = f"모델이 아직 준비되지 않았습니다: {e}"
+        logger.error(msg)
+        return {"status": "error", "code": 503, "message": f"[SERVICE UNAVAILABLE] {msg}"}
+    except ResponseValidationError as e:
+        msg = f"생성된 응답의 키 값이 잘못되었습니다: {e}"
+        logger.error(msg)
+        logger.error(traceback.format_exc())
+        return {"status": "error", "code": 400, "message": f"[BAD REQUEST] {msg}"}
+    except Exception as e:
+        msg = f"API 호출 중 에러가 발생했습니다: {e}"
+        logger.error(msg)
+        logger.error(traceback.format_exc())
+        return {"status": "error", "code": 500, "message": f"[INTERNAL SERVER ERROR] {msg}"}
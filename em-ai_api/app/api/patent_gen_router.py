@@ -0,0 +1,55 @@
+import traceback
+
+from fastapi import APIRouter, Depends
+from jwt import ExpiredSignatureError
+from fastapi.exceptions import ResponseValidationError
+
+from app.config.auth import verify_token
+from app.config.settings import FILE_PATHS
+from app.common.log.log_config import setup_logger
+from app.common.core.utils import get_current_datetime, make_dir
+from app.common.patent.patent_utils.patent_generation_utils import PatentGenerationUtils
+from app.models.patent_models import PatentGenerationRequest, PatentGenerationResponse
+
+router = APIRouter()
+
+# Initialize logger
+file_path = FILE_PATHS["log"] + "patent"
+make_dir(file_path)
+file_path += f"/patent_gen_{get_current_datetime()}.log"
+logger = setup_logger("patent_gen", file_path)
+
+# Initialize utils
+patent_gen_utils = PatentGenerationUtils()
+
+
+@router.post("/generation", response_model=PatentGenerationResponse)
+async def generate_patent_draft(
+    request: PatentGenerationRequest, token: str = Depends(verify_token)
+):
+    """특허 초안을 생성합니다.
+
+    Args:
+        request: 특허 초안 생성 요청 데이터
+        token: 사용자 인증 토큰
+
+    Returns:
+        dict: 생성된 특허 초안
+    """
+    try:
+        result = await patent_gen_utils.generate_patent(request.userText)
+        return result
+    except ExpiredSignatureError:
+        msg = "토근이 만료되었습니다. 담당자에게 문의하거나 토큰을 재발급 받으세요."
+        logger.error(msg)
+        return {"status": "error", "code": 401, "message": f"[UNAUTHORIZED] {msg}"}
+    except ResponseValidationError as e:
+        msg = f"생성된 응답의 키 값이 잘못되었습니다: {e}"
+        logger.error(msg)
+        logger.error(traceback.format_exc())
+        return {"status": "error", "code": 400, "message": f"[BAD REQUEST] {msg}"}
+    except Exception as e:
+        msg = f"API 호출 중 에러가 발생했습니다: {e}"
+        logger.error(msg)
+        logger.error(traceback.format_exc())
+        return {"status": "error", "code": 500, "message": f"[INTERNAL SERVER ERROR] {msg}"}
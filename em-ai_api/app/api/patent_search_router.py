@@ -0,0 +1,410 @@
+import json
+import traceback
+import importlib
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+from jwt import ExpiredSignatureError
+from fastapi.exceptions import ResponseValidationError
+
+from app.config.auth import verify_token
+from app.config.settings import (
+    FILE_PATHS,
+    IPC_NETWORK_SEARCH_BACKEND,
+    IPC_NETWORK_SETTINGS,
+    BULK_SEARCH_SETTINGS,
+    SEARCH_FACET_SETTINGS,
+)
+from app.config.custom_errors import ModelNotReadyError
+from app.config.ai_status_code import Success
+from app.common.log.log_config import setup_logger
+from app.common.core.utils import get_current_datetime, make_dir
+from app.common.core.model_registry import model_registry, lazy_loader, warmup_model
+from app.common.patent.base.es_client import es_client_pool
+from app.common.patent.base.rule_query_parser import fast_path_stats
+from app.common.patent.base.patent_columns import COLUMN_NAMES1, COLUMN_NAMES2
+from app.models.patent_models import (
+    SimilarPatentsRequest,
+    SimilarPatentsBulkRequest,
+    SimilarPatentIPCNetworKeywordRequest,
+    SimilarPatentIPCNetworNLRequest,
+    SimilarPatentsIPCNetworkRequest,
+    PatentResponse,
+)
+
+router = APIRouter()
+
+# Initialize logger
+file_path = FILE_PATHS["log"] + "patent"
+make_dir(file_path)
+file_path += f"/patent_search_{get_current_datetime()}.log"
+logger = setup_logger("patent_search", file_path)
+
+# 모델 객체 등록 (BGE-M3, LangChain 쿼리 생성기는 앱 시작 시 병렬로 import/로딩)
+model_registry.register(
+    "patent_search",
+    lazy_loader("app.common.patent.patent_utils.patent_search_utils", "PatentSearchUtils"),
+    "cpu",
+    warmup_model,
+)
+model_registry.register(
+    "patent_query_constructor",
+    lambda: importlib.import_module(
+        "app.common.patent.base.patent_query_generator"
+    ).query_constructor,
+    "cpu",
+)
+
+
+def get_ipc_network_options(request) -> dict | None:
+    """IPC 네트워크 요청 옵션 (network 가 false 이면 None)"""
+    if not request.network:
+        return None
+    return {
+        "level": request.ipcLevel,
+        "sample_size": request.networkSize or IPC_NETWORK_SETTINGS["sample_size"],
+        "max_nodes": request.maxNodes or IPC_NETWORK_SETTINGS["max_nodes"],
+    }
+
+
+def get_facet_options(request) -> dict | None:
+    """facet 요청 옵션 (facets 가 없으면 None)"""
+    if not request.facets:
+        return None
+    return {
+        "names": list(dict.fromkeys(request.facets)),
+        # kNN 의 k 는 결과 수 이상이어야 하므로 결과 수보다 작으면 결과 수만큼 집계
+        "size": min(
+            max(request.facetSize or SEARCH_FACET_SETTINGS["size"], request.size), SEARCH_FACET_SETTINGS["max_size"]
+        ),
+        "buckets": request.facetBuckets or SEARCH_FACET_SETTINGS["buckets"],
+        "ipc_level": getattr(request, "ipcLevel", "subclass"),
+    }
+
+
+async def on_startup():
+    # 검색 라우트가 공유하는 Elasticsearch 클라이언트 생성
+    await es_client_pool.open()
+
+
+async def on_shutdown():
+    try:
+        await model_registry.get("patent_search").embedding_service.close()
+    except ModelNotReadyError:
+        pass
+    await es_client_pool.close()
+
+
+@router.post("/similar-patents", response_model=PatentResponse)
+async def get_similar_patents_info(
+    request: SimilarPatentsRequest, token: str = Depends(verify_token)
+):
+    """특허에 대한 유사 특허 정보를 조회합니다.
+
+    Args:
+        request: 유사 특허 정보 조회 요청 데이터
+        token: 사용자 인증 토큰
+
+    Returns:
+        dict: 특허에 대한 유사 특허 정보
+    """
+    try:
+        patent_search_utils = model_registry.get("patent_search")
+        model_registry.get("patent_query_constructor")
+        async with patent_search_utils.get_es_client() as es:
+            result = await patent_search_utils.cached_search_es_patent_vector(
+                es,
+                "similar-patents",
+                query=request.userText,
+                size=request.size,
+                mode="nl",
+                column_names=COLUMN_NAMES1,
+                facets=get_facet_options(request),
+            )
+            return result
+    except ExpiredSignatureError:
+        msg = "토근이 만료되었습니다. 담당자에게 문의하거나 토큰을 재발급 받으세요."
+        logger.error(msg)
+        return {"status": "error", "code": 401, "message": f"[UNAUTHORIZED] {msg}"}
+    except ModelNotReadyError as e:
+        msg = f"모델이 아직 준비되지 않았습니다: {e}"
+        logger.error(msg)
+        return {"status": "error", "code": 503, "message": f"[SERVICE UNAVAILABLE] {msg}"}
+    except ResponseValidationError as e:
+        msg = f"생성된 응답의 키 값이 잘못되었습니다: {e}"
+        logger.error(msg)
+        logger.error(traceback.format_exc())
+        return {"status": "error", "code": 400, "message": f"[BAD REQUEST] {msg}"}
+    except Exception as e:
+        msg = f"API 호출 중 에러가 발생했습니다: {e}"
+        logger.error(msg)
+        logger.error(traceback.format_exc())
+        return {"status": "error", "code": 500, "message": f"[INTERNAL SERVER ERROR] {msg}"}
+
+
+@router.post("/similar-patents/bulk", response_model=PatentResponse)
+async def get_similar_patents_info_bulk(
+    request: SimilarPatentsBulkRequest, token: str = Depends(verify_token)
+):
+    """여러 질의의 유사 특허 정보를 한 번에 조회합니다.
+
+    질의를 묶음 단위로 배치 인코딩 + _msearch 하고, 묶음이 끝날 때마다 질의별 결과를
+    NDJSON(application/x-ndjson) 한 줄씩 스트리밍합니다. 각 줄은 {"index", "status", "code", "message", "data"} 입니다.
+
+    Args:
+        request: 유사 특허 대량 조회 요청 데이터
+        token: 사용자 인증 토큰
+
+    Returns:
+        StreamingResponse: 질의별 유사 특허 정보 (NDJSON)
+    """
+    try:
+        if len(request.queries) > BULK_SEARCH_SETTINGS["max_queries"]:
+            msg = f"질의는 최대 {BULK_SEARCH_SETTINGS['max_queries']}개까지 요청할 수 있습니다."
+            logger.error(msg)
+            return {"status": "error", "code": 400, "message": f"[BAD REQUEST] {msg}"}
+        patent_search_utils = model_registry.get("patent_search")
+        if request.mode == "nl":
+            model_registry.get("patent_query_constructor")
+        queries = [query.userText for query in request.queries]
+        sizes = [query.size for query in request.queries]
+
+        async def stream_results():
+            try:
+                async with patent_search_utils.get_es_client() as es:
+                    async for result in patent_search_utils.bulk_search_es_patent_vector(
+                        es, queries, sizes, mode=request.mode, column_names=COLUMN_NAMES1
+                    ):
+                        yield json.dumps(result, ensure_ascii=False) + "\n"
+            except Exception as e:
+                # 스트리밍 중에는 상태 코드를 바꿀 수 없으므로 마지막 줄로 에러 전달
+                msg = f"API 호출 중 에러가 발생했습니다: {e}"
+                logger.error(msg)
+                logger.error(traceback.format_exc())
+                yield json.dumps(
+                    {"status": "error", "code": 500, "message": f"[INTERNAL SERVER ERROR] {msg}"},
+                    ensure_ascii=False,
+                ) + "\n"
+
+        return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+    except ExpiredSignatureError:
+        msg = "토근이 만료되었습니다. 담당자에게 문의하거나 토큰을 재발급 받으세요."
+        logger.error(msg)
+        return {"status": "error", "code": 401, "message": f"[UNAUTHORIZED] {msg}"}
+    except ModelNotReadyError as e:
+        msg = f"모델이 아직 준비되지 않았습니다: {e}"
+        logger.error(msg)
+        return {"status": "error", "code": 503, "message": f"[SERVICE UNAVAILABLE] {msg}"}
+    except Exception as e:
+        msg = f"API 호출 중 에러가 발생했습니다: {e}"
+        logger.error(msg)
+        logger.error(traceback.format_exc())
+        return {"status": "error", "code": 500, "message": f"[INTERNAL SERVER ERROR] {msg}"}
+
+
+@router.post("/ipc-network-kw", response_model=PatentResponse)
+async def get_similar_patent_ipcs_by_keyword(
+    request: SimilarPatentIPCNetworKeywordRequest, token: str = Depends(verify_token)
+):
+    """특허에 대한 IPC 네트워크 정보를 조회합니다.
+
+    Args:
+        request: IPC 네트워크 정보 조회 요청 데이터
+        token: 사용자 인증 토큰
+
+    Returns:
+        dict: 특허에 대한 IPC 네트워크 정보
+    """
+    try:
+        patent_search_utils = model_registry.get("patent_search")
+        async with patent_search_utils.get_es_client(IPC_NETWORK_SEARCH_BACKEND) as es:
+            result = await patent_search_utils.cached_search_es_patent_vector(
+                es,
+                "ipc-network-kw",
+                query=request.keyword,
+                size=request.size,
+                mode="keyword",
+                column_names=COLUMN_NAMES2,
+                ipc_network=get_ipc_network_options(request),
+                hs_code=request.hsCode,
+                facets=get_facet_options(request),
+            )
+            return result
+    except ExpiredSignatureError:
+        msg = "토근이 만료되었습니다. 담당자에게 문의하거나 토큰을 재발급 받으세요."
+        logger.error(msg)
+        return {"status": "error", "code": 401, "message": f"[UNAUTHORIZED] {msg}"}
+    except ModelNotReadyError as e:
+        msg = f"모델이 아직 준비되지 않았습니다: {e}"
+        logger.error(msg)
+        return {"status": "error", "code": 503, "message": f"[SERVICE UNAVAILABLE] {msg}"}
+    except ResponseValidationError as e:
+        msg = f"생성된 응답의 키 값이 잘못되었습니다: {e}"
+        logger.error(msg)
+        logger.error(traceback.format_exc())
+        return {"status": "error", "code": 400, "message": f"[BAD REQUEST] {msg}"}
+    except Exception as e:
+        msg = f"API 호출 중 에러가 발생했습니다: {e}"
+        logger.error(msg)
+        logger.error(traceback.format_exc())
+        return {"status": "error", "code": 500, "message": f"[INTERNAL SERVER ERROR] {msg}"}
+
+
+@router.post("/ipc-network-nl", response_model=PatentResponse)
+async def get_similar_patent_ipcs_by_sentence(
+    request: SimilarPatentIPCNetworNLRequest, token: str = Depends(verify_token)
+):
+    """특허에 대한 IPC 네트워크 정보를 조회합니다.
+
+    Args:
+        request: IPC 네트워크 정보 조회 요청 데이터
+        token: 사용자 인증 토큰
+
+    Returns:
+        dict: 특허에 대한 IPC 네트워크 정보
+    """
+    try:
+        patent_search_utils = model_registry.get("patent_search")
+        model_registry.get("patent_query_constructor")
+        async with patent_search_utils.get_es_client(IPC_NETWORK_SEARCH_BACKEND) as es:
+            result = await patent_search_utils.cached_search_es_patent_vector(
+                es,
+                "ipc-network-nl",
+                query=request.userText,
+                size=request.size,
+                mode="nl",
+                column_names=COLUMN_NAMES2,
+                ipc_network=get_ipc_network_options(request),
+                hs_code=request.hsCode,
+                facets=get_facet_options(request),
+            )
+            return result
+    except ExpiredSignatureError:
+        msg = "토근이 만료되었습니다. 담당자에게 문의하거나 토큰을 재발급 받으세요."
+        logger.error(msg)
+        return {"status": "error", "code": 401, "message": f"[UNAUTHORIZED] {msg}"}
+    except ModelNotReadyError as e:
+        msg = f"모델이 아직 준비되지 않았습니다: {e}"
+        logger.error(msg)
+        return {"status": "error", "code": 503, "message": f"[SERVICE UNAVAILABLE] {msg}"}
+    except ResponseValidationError as e:
+        msg = f"생성된 응답의 키 값이 잘못되었습니다: {e}"
+        logger.error(msg)
+        logger.error(traceback.format_exc())
+        return {"status": "error", "code": 400, "message": f"[BAD REQUEST] {msg}"}
+    except Exception as e:
+        msg = f"API 호출 중 에러가 발생했습니다: {e}"
+        logger.error(msg)
+        logger.error(traceback.format_exc())
+        return {"status": "error", "code": 500, "message": f"[INTERNAL SERVER ERROR] {msg}"}
+
+
+@router.post("/similar-patents-ipc-network", response_model=PatentResponse)
+async def get_similar_patents_and_ipcs(
+    request: SimilarPatentsIPCNetworkRequest, token: str = Depends(verify_token)
+):
+    """유사 특허 정보와 IPC 네트워크 정보를 검색 1회로 함께 조회합니다.
+
+    Args:
+        request: 유사 특허 + IPC 네트워크 조회 요청 데이터
+        token: 사용자 인증 토큰
+
+    Returns:
+        dict: data.similarPatents(/similar-patents 결과)와 data.ipcNetwork(/ipc-network-nl 결과)
+    """
+    try:
+        patent_search_utils = model_registry.get("patent_search")
+        model_registry.get("patent_query_constructor")
+        async with patent_search_utils.get_es_client() as es:
+            result = await patent_search_utils.cached_search_combined(
+                es,
+                "similar-patents-ipc-network",
+                query=request.userText,
+                size=request.size,
+                mode="nl",
+                ipc_network=get_ipc_network_options(request),
+                facets=get_facet_options(request),
+            )
+            return result
+    except ExpiredSignatureError:
+        msg = "토근이 만료되었습니다. 담당자에게 문의하거나 토큰을 재발급 받으세요."
+        logger.error(msg)
+        return {"status": "error", "code": 401, "message": f"[UNAUTHORIZED] {msg}"}
+    except ModelNotReadyError as e:
+        msg = f"모델이 아직 준비되지 않았습니다: {e}"
+        logger.error(msg)
+        return {"status": "error", "code": 503, "message": f"[SERVICE UNAVAILABLE] {msg}"}
+    except ResponseValidationError as e:
+        msg = f"생성된 응답의 키 값이 잘못되었습니다: {e}"
+        logger.error(msg)
+        logger.error(traceback.format_exc())
+        return {"status": "error", "code": 400, "message": f"[BAD REQUEST] {msg}"}
+    except Exception as e:
+        msg = f"API 호출 중 에러가 발생했습니다: {e}"
+        logger.error(msg)
+        logger.error(traceback.format_exc())
+        return {"status": "error", "code": 500, "message": f"[INTERNAL SERVER ERROR] {msg}"}
+
+
+@router.get("/search-stats", response_model=PatentResponse)
+async def get_search_stats(token: str = Depends(verify_token)):
+    """검색 경로의 커넥션 풀 / 캐시 사용량을 조회합니다.
+
+    Args:
+        token: 사용자 인증 토큰
+
+    Returns:
+        dict: 커넥션 풀 및 캐시 통계
+    """
+    try:
+        patent_search_utils = model_registry.get("patent_search")
+        return {
+            "status": "success",
+            "code": Success.SUCCESS["code"],
+            "message": Success.SUCCESS["message"],
+            "data": {
+                "results": [
+                    {
+                        "esPool": es_client_pool.stats(),
+                        "embeddingCache": patent_search_utils.embedding_cache.stats(),
+                        "embeddingService": patent_search_utils.embedding_service.stats(),
+                        "fastPath": fast_path_stats.to_dict(),
+                        "speculation": patent_search_utils.speculation_stats(),
+                        "localIndex": (
+                            patent_search_utils.local_index.stats()
+                            if patent_search_utils.local_index is not None
+                            else None
+                        ),
+                        "datePartitions": (
+                            patent_search_utils.partition_router.stats()
+                            if patent_search_utils.partition_router is not None
+                            else None
+                        ),
+                        "knnCandidatePolicy": (
+                            patent_search_utils.candidate_policy.stats()
+                            if patent_search_utils.candidate_policy is not None
+                            else None
+                        ),
+                        "resultCache": (
+                            patent_search_utils.result_cache.stats()
+                            if patent_search_utils.result_cache is not None
+                            else None
+                        ),
+                        "retrievalStore": (
+                            patent_search_utils.retrieval_store.stats()
+                            if patent_search_utils.retrieval_store is not None
+                            else None
+                        ),
+                        "queryCache": (
+                            patent_search_utils.query_cache.stats()
+                            if patent_search_utils.query_cache is not None
+                            else None
+                        ),
+                    }
+                ]
+            },
+        }
+    except ModelNotReadyError as e:
+        msg = f"모델이 아직 준비되지 않았습니다: {e}"
+        logger.error(msg)
+        return {"status": "error", "code": 503, "message": f"[SERVICE UNAVAILABLE] {msg}"}
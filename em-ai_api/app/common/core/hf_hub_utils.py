@@ -0,0 +1,128 @@
+import os
+import json
+import argparse
+from typing import Optional, Text
+
+from huggingface_hub import HfApi, snapshot_download
+from huggingface_hub.utils import LocalEntryNotFoundError
+
+from app.config.settings import HF_TOKEN, HF_HUB_CACHE, HF_HUB_OFFLINE, MODEL_MANIFEST_PATH
+
+# 서빙에 필요 없는 가중치 포맷은 받지 않음
+IGNORE_PATTERNS = ["*.msgpack", "*.h5", "*.ot", "flax_model*", "tf_model*", "rust_model*", "onnx/*"]
+ADAPTER_CONFIG_FILE = "adapter_config.json"
+
+
+def load_model_manifest(path: Text = MODEL_MANIFEST_PATH) -> dict:
+    """모델 매니페스트(모델 아이디 -> 고정 revision / 로컬 경로)를 읽는 함수
+
+    Args:
+        path (Text): 매니페스트 파일 경로
+
+    Returns:
+        dict: {model_id: {"revision": str, "local_path": str(optional)}}
+    """
+    if not os.path.isfile(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+MODEL_MANIFEST = load_model_manifest()
+
+
+def resolve_model_path(model_id: Text, manifest: Optional[dict] = None) -> Text:
+    """모델 아이디를 로컬 경로로 변환
+
+    매니페스트에 로컬 경로가 있으면 그대로 사용하고, 없으면 고정된 revision 으로 허브 캐시에서만 찾는다.
+    캐시에 없을 때에만(오프라인 모드가 아닌 경우) 토큰으로 인증해서 내려받는다.
+
+    Args:
+        model_id (Text): 허깅페이스 모델 아이디
+        manifest (dict, optional): 모델 매니페스트. Defaults to MODEL_MANIFEST.
+
+    Returns:
+        Text: 모델 파일이 있는 로컬 디렉토리 경로
+
+    Raises:
+        LocalEntryNotFoundError: 오프라인 모드에서 캐시에 모델이 없는 경우
+    """
+    entry = (MODEL_MANIFEST if manifest is None else manifest).get(model_id, {})
+    local_path = entry.get("local_path")
+    if local_path and os.path.isdir(local_path):
+        return local_path
+
+    revision = entry.get("revision", "main")
+    try:
+        return snapshot_download(
+            model_id, revision=revision, cache_dir=HF_HUB_CACHE, local_files_only=True
+        )
+    except LocalEntryNotFoundError:
+        if HF_HUB_OFFLINE:
+            raise
+        return fetch_model(model_id, revision)
+
+
+def fetch_model(model_id: Text, revision: Text = "main") -> Text:
+    """허브에서 모델을 내려받아 캐시에 저장 (인증이 필요한 유일한 경로)"""
+    return snapshot_download(
+        model_id,
+        revision=revision,
+        cache_dir=HF_HUB_CACHE,
+        token=HF_TOKEN,
+        ignore_patterns=IGNORE_PATTERNS,
+    )
+
+
+def get_base_model_id(model_path: Text) -> Optional[Text]:
+    """PEFT 어댑터 디렉토리라면 베이스 모델 아이디를 반환"""
+    adapter_config_path = os.path.join(model_path, ADAPTER_CONFIG_FILE)
+    if not os.path.isfile(adapter_config_path):
+        return None
+    with open(adapter_config_path, "r", encoding="utf-8") as f:
+        return json.load(f).get("base_model_name_or_path")
+
+
+def prefetch_models(manifest: dict, pin: bool = False) -> dict:
+    """매니페스트의 모델(및 어댑터의 베이스 모델)을 배포 전에 캐시에 내려받는 함수
+
+    Args:
+        manifest (dict): 모델 매니페스트
+        pin (bool): True 이면 각 모델의 revision 을 현재 커밋 해시로 고정
+
+    Returns:
+        dict: 갱신된 매니페스트
+    """
+    api = HfApi(token=HF_TOKEN)
+    queue = list(manifest)
+    while queue:
+        model_id = queue.pop(0)
+        entry = manifest.setdefault(model_id, {"revision": "main"})
+        if pin:
+            entry["revision"] = api.model_info(model_id, revision=entry["revision"]).sha
+        path = fetch_model(model_id, entry["revision"])
+        print(f"{model_id}@{entry['revision']} -> {path}")
+
+        base_model_id = get_base_model_id(path)
+        if base_model_id and base_model_id not in manifest:
+            queue.append(base_model_id)
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="배포 전 허깅페이스 모델 캐시 준비")
+    parser.add_argument("command", choices=["prefetch", "resolve"])
+    parser.add_argument("--pin", action="store_true", help="revision 을 커밋 해시로 고정하고 매니페스트에 기록")
+    parser.add_argument("--manifest", default=MODEL_MANIFEST_PATH)
+    args = parser.parse_args()
+
+    manifest = load_model_manifest(args.manifest)
+    if args.command == "prefetch":
+        manifest = prefetch_models(manifest, pin=args.pin)
+        with open(args.manifest, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=4)
+            f.write("\n")
+    else:
+        # 오프라인 상태에서 모든 모델이 캐시로부터 해석되는지 확인
+        for model_id in manifest:
+            print(f"{model_id} -> {resolve_model_path(model_id, manifest)}")
@@ -0,0 +1,196 @@
+import time
+import threading
+import importlib
+import traceback
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Optional
+
+from app.config.settings import FILE_PATHS, MODEL_LOAD_WORKERS_PER_DEVICE
+from app.config.custom_errors import ModelNotReadyError
+from app.common.log.log_config import setup_logger
+from app.common.core.utils import get_current_datetime
+
+# 컴포넌트 상태
+STATE_PENDING = "pending"
+STATE_LOADING = "loading"
+STATE_WARMING_UP = "warming_up"
+STATE_READY = "ready"
+STATE_FAILED = "failed"
+
+# Initialize logger
+file_path = FILE_PATHS["log"] + f"core/model_registry_{get_current_datetime()}.log"
+logger = setup_logger("model_registry", file_path)
+
+
+def lazy_loader(module_path: str, class_name: str, *args, **kwargs) -> Callable[[], Any]:
+    """모듈 import 를 로딩 시점(로더 스레드)까지 미루는 로더 생성
+
+    라우터 import 시점에는 torch, peft, FlagEmbedding 같은 무거운 의존성을 불러오지 않는다.
+
+    Args:
+        module_path (str): 모델 클래스가 정의된 모듈 경로
+        class_name (str): 모델 클래스 이름
+
+    Returns:
+        Callable: 모델 객체를 생성해서 반환하는 함수
+    """
+
+    def _load():
+        model_class = getattr(importlib.import_module(module_path), class_name)
+        return model_class(*args, **kwargs)
+
+    return _load
+
+
+def warmup_model(model: Any):
+    """모델 객체의 warmup 메서드 호출 (예외가 나면 레지스트리가 컴포넌트를 failed 로 기록)"""
+    model.warmup()
+
+
+class ModelComponent:
+    """레지스트리에 등록되는 모델 컴포넌트"""
+
+    def __init__(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        device: str = "cpu",
+        warmup: Optional[Callable[[Any], Any]] = None,
+    ):
+        self.name = name
+        self.loader = loader
+        self.device = device
+        self.warmup = warmup
+        self.instance = None
+        self.state = STATE_PENDING
+        self.load_time = None
+        self.warmup_time = None
+        self.error = None
+
+    def to_dict(self) -> dict:
+        return {
+            "state": self.state,
+            "device": self.device,
+            "loadTime": self.load_time,
+            "warmupTime": self.warmup_time,
+            "error": self.error,
+        }
+
+
+class ModelRegistry:
+    """모델 로딩/워밍업을 병렬로 수행하고 준비 상태를 관리하는 레지스트리
+
+    디바이스(cuda:0, cuda:1, cpu ...)별로 스레드 풀을 두고, 서로 다른 디바이스의 모델은 동시에 로드한다.
+    전체 로딩 시간은 모델 로딩 시간의 합이 아니라 가장 느린 모델(혹은 디바이스)에 의해 결정된다.
+    """
+
+    def __init__(self, workers_per_device: int = MODEL_LOAD_WORKERS_PER_DEVICE):
+        self.workers_per_device = workers_per_device
+        self.components: dict[str, ModelComponent] = {}
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def register(
+        self,
+        name: str,
+        loader: Callable[[], Any],
+        device: str = "cpu",
+        warmup: Optional[Callable[[Any], Any]] = None,
+    ):
+        """모델 컴포넌트 등록
+
+        Args:
+            name (str): 컴포넌트 이름
+            loader (Callable): 모델 객체를 생성해서 반환하는 함수
+            device (str, optional): 모델이 올라가는 디바이스. Defaults to "cpu".
+            warmup (Callable, optional): 로드된 모델 객체로 합성 입력 추론을 수행하는 함수. Defaults to None.
+        """
+        with self._lock:
+            self.components[name] = ModelComponent(name, loader, device, warmup)
+
+    def _load_component(self, component: ModelComponent):
+        try:
+            component.state = STATE_LOADING
+            start = time.perf_counter()
+            instance = component.loader()
+            component.load_time = round(time.perf_counter() - start, 3)
+
+            if component.warmup is not None:
+                component.state = STATE_WARMING_UP
+                start = time.perf_counter()
+                component.warmup(instance)
+                component.warmup_time = round(time.perf_counter() - start, 3)
+
+            component.instance = instance
+            component.state = STATE_READY
+            logger.info(
+                f"[{component.name}] 모델 로딩 완료 : load {component.load_time}s, warmup {component.warmup_time}s"
+            )
+        except Exception as e:
+            component.state = STATE_FAILED
+            component.error = str(e)
+            logger.error(f"[{component.name}] 모델 로딩 실패 : {e}\n{traceback.format_exc()}")
+
+    def load_all(self):
+        """등록된 모든 컴포넌트를 디바이스별 스레드 풀에서 병렬로 로드"""
+        self.started_at = time.time()
+        devices = {}
+        for component in self.components.values():
+            if component.state in (STATE_PENDING, STATE_FAILED):
+                devices.setdefault(component.device, []).append(component)
+
+        executors = []
+        futures = []
+        for components in devices.values():
+            executor = ThreadPoolExecutor(
+                max_workers=max(1, min(self.workers_per_device, len(components)))
+            )
+            executors.append(executor)
+            futures.extend(executor.submit(self._load_component, c) for c in components)
+        wait(futures)
+        for executor in executors:
+            executor.shutdown(wait=False)
+        self.finished_at = time.time()
+
+    def start(self):
+        """백그라운드 스레드에서 모델 로딩을 시작 (서버는 즉시 요청을 받을 수 있음)"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self.load_all, name="model-loader", daemon=True)
+        self._thread.start()
+
+    def wait_until_ready(self, timeout: Optional[float] = None) -> bool:
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.is_ready()
+
+    def get(self, name: str) -> Any:
+        """준비가 완료된 모델 객체 반환
+
+        Raises:
+            ModelNotReadyError: 모델이 아직 로딩 중이거나 로딩에 실패한 경우
+        """
+        component = self.components.get(name)
+        if component is None:
+            raise ModelNotReadyError(f"등록되지 않은 모델입니다: {name}")
+        if component.state != STATE_READY:
+            raise ModelNotReadyError(f"{name} ({component.state})")
+        return component.instance
+
+    def is_ready(self) -> bool:
+        return all(c.state == STATE_READY for c in self.components.values())
+
+    def status(self) -> dict:
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = round((self.finished_at or time.time()) - self.started_at, 3)
+        return {
+            "ready": self.is_ready(),
+            "elapsed": elapsed,
+            "components": {name: c.to_dict() for name, c in self.components.items()},
+        }
+
+
+model_registry = ModelRegistry()
@@ -0,0 +1,74 @@
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+ROLES = ["all", "news", "patent-search", "patent-gen", "buyers"]
+
+# 별도 프로세스에서 app.main 을 import 하고 (옵션에 따라 모델 로딩까지) 시간과 메모리를 측정하는 스크립트
+MEASURE_SCRIPT = """
+import json, sys, time, resource
+start = time.perf_counter()
+import app.main
+import_time = time.perf_counter() - start
+import_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+result = {
+    "importTime": round(import_time, 3),
+    "importMaxRssMb": round(import_rss, 1),
+    "modules": len(sys.modules),
+    "heavyModules": sorted(m for m in ("torch", "peft", "bitsandbytes", "FlagEmbedding",
+                                       "langchain", "sqlalchemy") if m in sys.modules),
+}
+if "--load" in sys.argv:
+    from app.common.core.model_registry import model_registry
+    start = time.perf_counter()
+    model_registry.load_all()
+    result["loadTime"] = round(time.perf_counter() - start, 3)
+    result["loadMaxRssMb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+    result["ready"] = model_registry.is_ready()
+    result["components"] = list(model_registry.components)
+print(json.dumps(result))
+"""
+
+
+def measure_role(role: str, load: bool = False) -> dict:
+    """SERVICE_ROLE 을 지정한 새 프로세스에서 import(및 모델 로딩) 비용을 측정
+
+    Args:
+        role (str): 측정할 역할
+        load (bool): True 이면 모델 로딩까지 측정
+
+    Returns:
+        dict: 측정 결과
+    """
+    env = dict(os.environ, SERVICE_ROLE=role)
+    args = [sys.executable, "-c", MEASURE_SCRIPT] + (["--load"] if load else [])
+    completed = subprocess.run(args, env=env, capture_output=True, text=True)
+    if completed.returncode != 0:
+        return {"error": completed.stderr.strip().splitlines()[-1:]}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def build_report(roles: list[str], load: bool = False) -> list[dict]:
+    """역할별 측정 결과와 "all" 대비 절감량 계산"""
+    results = {role: measure_role(role, load) for role in roles}
+    baseline = results.get("all", {})
+    report = []
+    for role, result in results.items():
+        row = {"role": role, **result}
+        for key in ("importTime", "importMaxRssMb", "loadTime", "loadMaxRssMb"):
+            if key in row and key in baseline and role != "all":
+                row[f"{key}Saved"] = round(baseline[key] - row[key], 3)
+        report.append(row)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="역할별 import 시간/메모리 리포트")
+    parser.add_argument("--roles", nargs="+", default=ROLES)
+    parser.add_argument("--load", action="store_true", help="모델 로딩까지 포함해서 측정")
+    args = parser.parse_args()
+
+    for row in build_report(args.roles, args.load):
+        print(json.dumps(row, ensure_ascii=False))
@@ -1,18 +1,25 @@
 import os
 import traceback
-import subprocess
 from typing import Text
 from abc import ABC, abstractmethod
 
 import torch
 import requests
 from peft import PeftModel, PeftConfig
+from huggingface_hub.utils import LocalEntryNotFoundError
 from huggingface_hub.utils._errors import RepositoryNotFoundError
-from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, BitsAndBytesConfig
+from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
 
-from app.config.settings import FILE_PATHS, HF_TOKEN
+from app.config.settings import FILE_PATHS
+from app.common.core.hf_hub_utils import resolve_model_path
 from app.common.log.log_config import setup_logger
-from app.common.news.base.hf_model_utils import seed_everything, processing
+from app.common.news.base.hf_model_utils import (
+    seed_everything,
+    processing,
+    get_quantization_config,
+    get_baked_model_dir,
+    load_bake_manifest,
+)
 from app.common.core.utils import get_current_datetime, make_dir, format_error_message
 from app.config.ai_status_code import ModelExecutionError, ResourceError, ServiceInternalError
 
@@ -20,9 +27,7 @@ from app.config.ai_status_code import ModelExecutionError, ResourceError, Servic
 MAX_LIMIT = 4000
 INPUT_MAX_LENGTH = 1024
 OUTPUT_MAX_LENGTH = 512
-
-# HuggingFace CLI 로그인
-subprocess.run(["huggingface-cli", "login", "--token", HF_TOKEN])
+WARMUP_TEXT = "삼성전자가 반도체 생산 설비에 대규모 투자를 진행한다고 밝혔다."
 
 os.environ["CUBLAS_WORKSPACE_CONFIG"] = ":4096:8"
 
@@ -49,25 +54,26 @@ class HuggingFaceModel(ABC):
         }
         try:
             self.peft_model_name = model_id
-            self.peft_config = PeftConfig.from_pretrained(self.peft_model_name)
-            self.qunat_config = BitsAndBytesConfig(
-                load_in_4bit=True,
-                bnb_4bit_compute_dtype=torch.bfloat16,
-                bnb_4bit_quant_type="nf4",
-                bnb_4bit_use_double_quant=True,
-            )
-            self.tokenizer = AutoTokenizer.from_pretrained(
-                self.peft_config.base_model_name_or_path,
-            )
+            self.bake_manifest = load_bake_manifest(model_id)
+            if self.bake_manifest is not None:
+                # 사전 병합/양자화된 아티팩트가 있으면 허브 조회와 양자화 과정 없이 바로 로드
+                self._load_baked_model(get_baked_model_dir(model_id))
+                return
+            # 매니페스트에 고정된 revision 으로 로컬 캐시에서 경로를 찾음 (캐시에 없을 때만 다운로드)
+            adapter_path = resolve_model_path(self.peft_model_name)
+            self.peft_config = PeftConfig.from_pretrained(adapter_path)
+            base_model_path = resolve_model_path(self.peft_config.base_model_name_or_path)
+            self.qunat_config = get_quantization_config()
+            self.tokenizer = AutoTokenizer.from_pretrained(base_model_path)
             self.hf_model = AutoModelForSeq2SeqLM.from_pretrained(
-                self.peft_config.base_model_name_or_path,
+                base_model_path,
                 torch_dtype=torch.bfloat16,
                 device_map={"": self.gpu_id},
                 quantization_config=self.qunat_config,
             )
             self.model = PeftModel.from_pretrained(
                 model=self.hf_model,
-                model_id=self.peft_model_name,
+                model_id=adapter_path,
                 device_map={"": self.gpu_id},
             )
         # 모델 로드 중 에러 발생 시
@@ -78,6 +84,14 @@ class HuggingFaceModel(ABC):
             )
             self.logger.error(f"Repository Not Found Error : {repoerror}")
             print(f"Repository Not Found Error : {traceback.format_exc()}")
+        # 오프라인 모드에서 캐시에 모델이 없는 경우
+        except LocalEntryNotFoundError as cache_error:
+            self.response_model["code"] = ModelExecutionError.MODEL_NOT_FOUND_ERROR["code"]
+            self.response_model["message"] = format_error_message(
+                ModelExecutionError.MODEL_NOT_FOUND_ERROR
+            )
+            self.logger.error(f"Local Entry Not Found Error : {cache_error}")
+            print(f"Local Entry Not Found Error : {traceback.format_exc()}")
         # API 연결 중 에러 발생 시
         except requests.exceptions.HTTPError as http_err:
             if http_err.response.status_code == 401:
@@ -150,6 +164,55 @@ class HuggingFaceModel(ABC):
                 self.logger.error(f"Exception : {e}")
                 print(f"Exception : {e}\n{traceback.format_exc()}")
 
+    def _load_baked_model(self, baked_dir: Text):
+        """model_bake 로 생성한 아티팩트를 로드하는 함수
+
+        아티팩트의 가중치는 이미 NF4로 양자화된 safetensors 이므로 mmap 으로 바로 로드되며,
+        strategy 가 "stack" 인 경우에만 어댑터를 위에 얹는다.
+
+        Args:
+            baked_dir : 아티팩트 디렉토리 경로
+        """
+        self.tokenizer = AutoTokenizer.from_pretrained(baked_dir)
+        self.hf_model = AutoModelForSeq2SeqLM.from_pretrained(
+            baked_dir,
+            torch_dtype=torch.bfloat16,
+            device_map={"": self.gpu_id},
+            use_safetensors=True,
+        )
+        if self.bake_manifest.get("strategy") == "stack":
+            self.model = PeftModel.from_pretrained(
+                model=self.hf_model,
+                model_id=os.path.join(baked_dir, "adapter"),
+                device_map={"": self.gpu_id},
+            )
+        else:
+            self.model = self.hf_model
+        self.logger.info(f"Baked model loaded : {baked_dir}")
+
+    def warmup(self):
+        """합성 입력으로 추론을 1회 수행하여 CUDA 커널/캐시를 미리 초기화
+
+        predict 는 추론 에러를 응답 모델에 기록하고 삼키므로, 실패가 로딩 실패로 드러나도록 생성 과정을 직접 호출한다.
+
+        Raises:
+            RuntimeError: 모델 로드에 실패한 경우
+            Exception: 합성 입력 추론에 실패한 경우 (예외를 그대로 전달)
+        """
+        if not hasattr(self, "model"):
+            raise RuntimeError(self.response_model["message"])
+        with torch.no_grad():
+            input_ids = self.tokenizer(
+                f"summary : {processing(WARMUP_TEXT)}",
+                max_length=self.input_max_length,
+                truncation=True,
+                padding="max_length",
+                return_tensors="pt",
+            ).input_ids.cuda()
+            output = self.model.generate(input_ids=input_ids, max_length=self.output_max_length)
+        if output.numel() == 0:
+            raise RuntimeError("warmup 추론 결과가 비어 있습니다")
+
     @abstractmethod
     def validate_input(self, input_title: Text = None, input_content: Text = None):
         """입력 텍스트의 유효성을 검사하는 함수
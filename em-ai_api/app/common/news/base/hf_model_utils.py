@@ -1,16 +1,22 @@
 import re
 import os
 import ast
+import json
 import random
 import typing as t
 
 import torch
 import numpy as np
 from datasets import logging
+from transformers import BitsAndBytesConfig
+
+from app.config.settings import BAKED_MODEL_DIR
 
 
 logging.set_verbosity(logging.ERROR)
 
+BAKE_MANIFEST_FILE = "bake_manifest.json"
+
 
 def convert_format(input_datas: t.Dict, model_name: t.Text):
     """
@@ -45,6 +51,35 @@ def convert_format(input_datas: t.Dict, model_name: t.Text):
     return id_dict, content_dict, extra_list
 
 
+def get_quantization_config() -> BitsAndBytesConfig:
+    """뉴스 모델 공통 4bit(NF4) 양자화 설정"""
+    return BitsAndBytesConfig(
+        load_in_4bit=True,
+        bnb_4bit_compute_dtype=torch.bfloat16,
+        bnb_4bit_quant_type="nf4",
+        bnb_4bit_use_double_quant=True,
+    )
+
+
+def get_baked_model_dir(model_id: t.Text) -> t.Text:
+    """모델 아이디에 해당하는 사전 빌드(bake) 아티팩트 디렉토리 경로"""
+    return os.path.join(BAKED_MODEL_DIR, model_id.replace("/", "--"))
+
+
+def load_bake_manifest(model_id: t.Text) -> t.Optional[t.Dict]:
+    """사전 빌드 아티팩트의 매니페스트를 읽는 함수
+
+    input : 허깅페이스 모델 아이디
+
+    output : 매니페스트 딕셔너리 (아티팩트가 없으면 None)
+    """
+    manifest_path = os.path.join(get_baked_model_dir(model_id), BAKE_MANIFEST_FILE)
+    if not os.path.isfile(manifest_path):
+        return None
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
 def seed_everything(seed):
     """
     재현성을 위한 시드 설정 함수
@@ -0,0 +1,125 @@
+"""뉴스 모델 사전 빌드(bake) 커맨드
+
+기동 시마다 수행하던 "베이스 모델 다운로드 -> NF4 양자화 -> PEFT 어댑터 적용" 과정을 오프라인에서 한 번만 수행하고,
+바로 서빙 가능한 아티팩트(safetensors)를 BAKED_MODEL_DIR 아래에 모델별로 저장한다.
+HuggingFaceModel 은 아티팩트가 있으면 이를 우선 로드한다.
+
+bitsandbytes 양자화는 CUDA가 필요하므로 GPU가 있는 환경에서 실행해야 한다.
+
+Usage:
+    python -m app.common.news.base.model_bake                      # 전체 뉴스 모델
+    python -m app.common.news.base.model_bake --model-id illunex-ai/news-category-add --strategy merge
+"""
+import os
+import json
+import time
+import shutil
+import argparse
+import datetime
+import tempfile
+from typing import Text
+
+import torch
+from peft import PeftModel, PeftConfig
+from transformers import AutoModelForSeq2SeqLM, AutoTokenizer
+
+from app.common.core.hf_hub_utils import resolve_model_path
+from app.common.news.base.hf_model_utils import (
+    BAKE_MANIFEST_FILE,
+    get_quantization_config,
+    get_baked_model_dir,
+)
+
+# 서빙 중인 뉴스 모델 (news_company 는 news-esg-qlora 를 공유)
+NEWS_MODEL_IDS = [
+    "illunex-ai/news-category-add",
+    "illunex-ai/news-esg-qlora",
+    "illunex-ai/news-keyphrase-large",
+    "illunex-ai/news_investment_extract",
+]
+BAKE_STRATEGIES = ["stack", "merge"]
+
+
+def _save_quantized(model_dir: Text, output_dir: Text, gpu_id: int):
+    """bf16 가중치를 NF4로 양자화한 뒤 safetensors 로 저장"""
+    quantized = AutoModelForSeq2SeqLM.from_pretrained(
+        model_dir,
+        torch_dtype=torch.bfloat16,
+        device_map={"": gpu_id},
+        quantization_config=get_quantization_config(),
+    )
+    quantized.save_pretrained(output_dir, safe_serialization=True)
+    return quantized
+
+
+def bake_model(model_id: Text, strategy: Text = "stack", gpu_id: int = 0) -> Text:
+    """모델 아이디에 해당하는 서빙용 아티팩트를 생성
+
+    Args:
+        model_id : 허깅페이스 PEFT 어댑터 모델 아이디
+        strategy : "stack" - 양자화된 베이스 + 어댑터 (기존 서빙과 동일한 연산),
+                   "merge" - 어댑터를 병합한 뒤 양자화 (추론 시 어댑터 연산 없음)
+        gpu_id : 양자화에 사용할 gpu 아이디
+
+    Returns:
+        아티팩트 디렉토리 경로
+    """
+    if strategy not in BAKE_STRATEGIES:
+        raise ValueError(f"strategy 는 {BAKE_STRATEGIES} 중 하나여야 합니다: {strategy}")
+
+    output_dir = get_baked_model_dir(model_id)
+    tmp_output_dir = output_dir + ".tmp"
+    shutil.rmtree(tmp_output_dir, ignore_errors=True)
+    os.makedirs(tmp_output_dir)
+
+    adapter_path = resolve_model_path(model_id)
+    peft_config = PeftConfig.from_pretrained(adapter_path)
+    base_model_id = peft_config.base_model_name_or_path
+    base_model_path = resolve_model_path(base_model_id)
+    tokenizer = AutoTokenizer.from_pretrained(base_model_path)
+
+    if strategy == "merge":
+        # bf16 베이스에 어댑터를 병합한 뒤 양자화
+        base_model = AutoModelForSeq2SeqLM.from_pretrained(
+            base_model_path, torch_dtype=torch.bfloat16
+        )
+        merged = PeftModel.from_pretrained(base_model, adapter_path).merge_and_unload()
+        with tempfile.TemporaryDirectory() as merged_dir:
+            merged.save_pretrained(merged_dir, safe_serialization=True)
+            del base_model, merged
+            _save_quantized(merged_dir, tmp_output_dir, gpu_id)
+    else:
+        # 양자화된 베이스를 저장하고 어댑터는 별도 디렉토리에 저장
+        quantized = _save_quantized(base_model_path, tmp_output_dir, gpu_id)
+        adapter = PeftModel.from_pretrained(quantized, adapter_path)
+        adapter.save_pretrained(os.path.join(tmp_output_dir, "adapter"))
+
+    tokenizer.save_pretrained(tmp_output_dir)
+    manifest = {
+        "model_id": model_id,
+        "base_model": base_model_id,
+        "strategy": strategy,
+        "quantization": "nf4",
+        "created_at": datetime.datetime.now().isoformat(),
+    }
+    with open(os.path.join(tmp_output_dir, BAKE_MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=4)
+
+    # 완성된 아티팩트만 서빙 경로에 노출되도록 마지막에 교체
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.rename(tmp_output_dir, output_dir)
+    torch.cuda.empty_cache()
+    return output_dir
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="뉴스 모델 서빙용 아티팩트 생성")
+    parser.add_argument("--model-id", action="append", help="대상 모델 아이디 (생략 시 전체 뉴스 모델)")
+    parser.add_argument("--strategy", choices=BAKE_STRATEGIES, default="stack")
+    parser.add_argument("--gpu-id", type=int, default=0)
+    args = parser.parse_args()
+
+    for model_id in args.model_id or NEWS_MODEL_IDS:
+        start = time.perf_counter()
+        path = bake_model(model_id, strategy=args.strategy, gpu_id=args.gpu_id)
+        print(f"{model_id} -> {path} ({time.perf_counter() - start:.1f}s)")
@@ -0,0 +1,246 @@
+import os
+import json
+import pickle
+import hashlib
+import random
+import argparse
+import datetime
+import threading
+from typing import Optional, Text
+from abc import ABC, abstractmethod
+
+from app.config.settings import FILE_PATHS, NEWS_PREFILTER_SETTINGS, NEWS_PREFILTER_MODEL_DIR
+from app.common.core.utils import make_dir
+
+# 기본 어휘 사전 (학습된 선형 모델이 없을 때 사용)
+INVESTMENT_LEXICON = [
+    "투자", "유치", "시리즈", "펀딩", "인수", "합병", "M&A", "지분", "출자", "증자",
+    "벤처캐피탈", "VC", "엔젤", "시드", "프리IPO", "IPO", "상장", "브릿지", "밸류에이션",
+]
+ESG_LEXICON = [
+    "㈜", "(주)", "주식회사", "그룹", "전자", "기업", "회사", "홀딩스", "은행", "증권", "보험",
+    "건설", "화학", "제약", "바이오", "에너지", "공사", "재단", "Inc", "Corp",
+]
+TASK_LEXICONS = {"investment": INVESTMENT_LEXICON, "esg": ESG_LEXICON}
+
+PREFILTER_SKIP_MSG = "사전 필터에서 관련 정보가 없는 기사로 판단되었습니다."
+
+
+class NewsPreFilter(ABC):
+    """GPU 추론 전에 CPU 에서 기사 관련성을 빠르게 판단하는 사전 필터 추상 클래스"""
+
+    @abstractmethod
+    def relevance(self, text: Text) -> float:
+        """기사에 태스크 관련 정보(투자 정보, 기업 언급 등)가 있을 확률 (0~1)"""
+        pass
+
+
+class LexiconPreFilter(NewsPreFilter):
+    """어휘 사전 기반 사전 필터 (사전 단어가 하나도 없으면 관련성 0)"""
+
+    def __init__(self, lexicon: list[Text]):
+        self.lexicon = [word.lower() for word in lexicon]
+
+    def relevance(self, text: Text) -> float:
+        text = text.lower()
+        hits = sum(1 for word in self.lexicon if word in text)
+        return 1 - 0.5 ** hits
+
+
+class LinearPreFilter(NewsPreFilter):
+    """로그로 학습한 TF-IDF + 선형 분류기 기반 사전 필터"""
+
+    def __init__(self, model_path: Text):
+        with open(model_path, "rb") as f:
+            self.model = pickle.load(f)
+
+    def relevance(self, text: Text) -> float:
+        return float(self.model.predict_proba([text])[0][1])
+
+
+class PreFilterStats:
+    """사전 필터 스킵률 / 오스킵률 집계
+
+    스킵 판정된 요청 중 일부(audit_rate)는 실제로 모델을 실행해서 오스킵(실제로는 정보가 있는 기사) 여부를 확인한다.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.skipped = 0
+        self.audited = 0
+        self.false_skips = 0
+        self._lock = threading.Lock()
+
+    def update(self, skipped: bool, audited: bool = False, found: Optional[bool] = None):
+        with self._lock:
+            self.total += 1
+            self.skipped += int(skipped)
+            if audited:
+                self.audited += 1
+                self.false_skips += int(bool(found))
+
+    def to_dict(self) -> dict:
+        return {
+            "total": self.total,
+            "skipped": self.skipped,
+            "skipRate": round(self.skipped / self.total, 4) if self.total else 0.0,
+            "audited": self.audited,
+            "falseSkips": self.false_skips,
+            "falseSkipRate": round(self.false_skips / self.audited, 4) if self.audited else None,
+        }
+
+
+class PreFilterDecision:
+    def __init__(self, score: Optional[float] = None, skip: bool = False, audit: bool = False):
+        self.score = score
+        self.skip = skip
+        self.audit = audit
+
+
+class PreFilterGate:
+    """태스크별 사전 필터 실행, 통계 집계, 학습용 로그 기록"""
+
+    def __init__(self, task: Text, prefilter: Optional[NewsPreFilter], settings: dict):
+        self.task = task
+        self.prefilter = prefilter
+        self.skip_confidence = settings["skip_confidence"]
+        self.audit_rate = settings["audit_rate"]
+        # shadow 모드: 모든 기사를 채점만 하고 스킵하지 않음 (스킵 판정을 전부 audit 으로 처리해서
+        # 사전 필터에 편향되지 않은 학습 데이터와 실제 오스킵률 수집)
+        self.shadow = settings["mode"] == "shadow"
+        # 사전 필터가 꺼져 있으면(mode: off) 기록하지 않음
+        self.log_enabled = settings["log_enabled"] and prefilter is not None
+        self.log_text = settings["log_text"]
+        self.stats = PreFilterStats()
+        self._log_lock = threading.Lock()
+        self.log_path = FILE_PATHS["log"] + f"prefilter/{task}.jsonl"
+        if self.log_enabled:
+            make_dir(os.path.dirname(self.log_path))
+
+    def check(self, text: Text) -> PreFilterDecision:
+        """관련 없을 확률이 skip_confidence 이상이면 스킵 판정 (shadow 모드에서는 스킵 판정도 모델 실행)"""
+        if self.prefilter is None:
+            return PreFilterDecision()
+        score = self.prefilter.relevance(text)
+        skip = (1 - score) >= self.skip_confidence
+        audit = skip and (self.shadow or random.random() < self.audit_rate)
+        return PreFilterDecision(score, skip, audit)
+
+    def record(self, decision: PreFilterDecision, text: Text, found: Optional[bool]):
+        """판정 결과와 실제 모델 결과(found)를 기록. 스킵되어 모델을 실행하지 않은 경우 found=None
+
+        기사 본문은 log_text 가 켜진 경우(학습 데이터 수집)에만 남기고, 기본으로는 본문 해시만 기록한다.
+        """
+        if self.prefilter is not None:
+            self.stats.update(decision.skip, decision.audit, found)
+        if not self.log_enabled:
+            return
+        row = {
+            "text_sha256": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+            "text_length": len(text),
+            "score": decision.score,
+            "skipped": decision.skip,
+            "shadow": self.shadow,
+            "found": found,
+            "created_at": datetime.datetime.now().isoformat(),
+        }
+        if self.log_text:
+            row["text"] = text
+        with self._log_lock, open(self.log_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def to_dict(self) -> dict:
+        return {
+            "task": self.task,
+            "mode": type(self.prefilter).__name__ if self.prefilter else None,
+            "shadow": self.shadow,
+            "skipConfidence": self.skip_confidence,
+            **self.stats.to_dict(),
+        }
+
+
+def get_prefilter_model_path(task: Text) -> Text:
+    return os.path.join(NEWS_PREFILTER_MODEL_DIR, f"{task}_prefilter.pkl")
+
+
+def get_prefilter_gate(task: Text) -> PreFilterGate:
+    """설정(mode: off / lexicon / linear / shadow)에 맞는 태스크별 사전 필터 생성
+
+    linear, shadow 모드에서 학습된 모델 파일이 없으면 어휘 사전 필터를 사용한다.
+    """
+    settings = NEWS_PREFILTER_SETTINGS[task]
+    prefilter = None
+    model_path = get_prefilter_model_path(task)
+    if settings["mode"] in ("linear", "shadow") and os.path.isfile(model_path):
+        prefilter = LinearPreFilter(model_path)
+    elif settings["mode"] in ("lexicon", "linear", "shadow"):
+        prefilter = LexiconPreFilter(TASK_LEXICONS[task])
+    return PreFilterGate(task, prefilter, settings)
+
+
+def load_training_data(log_path: Text) -> tuple[list[Text], list[int]]:
+    """사전 필터 로그에서 모델 실행 결과(found)와 본문(NEWS_PREFILTER_LOG_TEXT)이 있는 행만 학습 데이터로 사용
+
+    사전 필터에 편향되지 않은 데이터를 얻으려면 shadow 모드로 수집한 로그를 사용한다.
+    """
+    texts, labels = [], []
+    with open(log_path, "r", encoding="utf-8") as f:
+        for line in f:
+            row = json.loads(line)
+            if row.get("found") is None or not row.get("text"):
+                continue
+            texts.append(row["text"])
+            labels.append(int(row["found"]))
+    return texts, labels
+
+
+def train_linear_prefilter(task: Text, log_path: Text, test_size: float = 0.2) -> list[dict]:
+    """TF-IDF + 로지스틱 회귀 사전 필터 학습 및 임계값별 스킵률 / 오스킵률 리포트
+
+    Returns:
+        list[dict]: 임계값(skip_confidence)별 검증셋 스킵률, 오스킵률
+    """
+    from sklearn.pipeline import make_pipeline
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.model_selection import train_test_split
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    texts, labels = load_training_data(log_path)
+    x_train, x_test, y_train, y_test = train_test_split(
+        texts, labels, test_size=test_size, stratify=labels, random_state=42
+    )
+    model = make_pipeline(
+        TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 4), max_features=200000, sublinear_tf=True),
+        LogisticRegression(max_iter=1000, class_weight="balanced"),
+    )
+    model.fit(x_train, y_train)
+
+    model_path = get_prefilter_model_path(task)
+    make_dir(os.path.dirname(model_path))
+    with open(model_path, "wb") as f:
+        pickle.dump(model, f)
+
+    relevance = model.predict_proba(x_test)[:, 1]
+    report = []
+    for skip_confidence in (0.5, 0.7, 0.8, 0.9, 0.95, 0.99):
+        skipped = [(1 - r) >= skip_confidence for r in relevance]
+        n_skipped = sum(skipped)
+        false_skips = sum(1 for s, y in zip(skipped, y_test) if s and y == 1)
+        report.append({
+            "skipConfidence": skip_confidence,
+            "skipRate": round(n_skipped / len(y_test), 4),
+            # 정보가 있는 기사 중 잘못 스킵된 비율
+            "falseSkipRate": round(false_skips / max(1, sum(y_test)), 4),
+        })
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="뉴스 사전 필터 학습")
+    parser.add_argument("--task", choices=list(TASK_LEXICONS), required=True)
+    parser.add_argument("--log", help="학습용 사전 필터 로그(jsonl) 경로")
+    args = parser.parse_args()
+
+    log_path = args.log or FILE_PATHS["log"] + f"prefilter/{args.task}.jsonl"
+    for row in train_linear_prefilter(args.task, log_path):
+        print(json.dumps(row, ensure_ascii=False))
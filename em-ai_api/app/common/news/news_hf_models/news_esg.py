@@ -7,6 +7,7 @@ from icecream import ic
 from app.config.ai_status_code import Success
 from app.common.news.base.hf_model import HuggingFaceModel
 from app.common.news.base.hf_model_utils import esg_dumps
+from app.common.news.base.prefilter import get_prefilter_gate, PREFILTER_SKIP_MSG
 from app.common.core.utils import format_error_message
 from app.config.ai_status_code import ModelExecutionError, ServiceInternalError
 from app.config.custom_errors import DataNotFoundError
@@ -24,6 +25,7 @@ class NewsESGModel(HuggingFaceModel):
 
         """
         super().__init__(model_id, gpu_id)
+        self.prefilter = get_prefilter_gate("esg")
 
     def validate_input(self, input_content: Text):
         """입력 텍스트의 유효성을 검사하는 함수
@@ -65,10 +67,21 @@ class NewsESGModel(HuggingFaceModel):
         """
         try:
             self.validate_input(input_content)
+            # 기업 언급이 없을 것이 확실한 기사는 GPU 추론 없이 DATA_NOT_FOUND 처리
+            decision = self.prefilter.check(input_content)
+            if decision.skip and not decision.audit:
+                self.prefilter.record(decision, input_content, found=None)
+                raise DataNotFoundError(PREFILTER_SKIP_MSG)
+
             output = super().predict(input_text=input_content)
             output = ''.join(output)
             output = esg_dumps(output)
-            self.validate_output(output)
+            try:
+                self.validate_output(output)
+            except DataNotFoundError:
+                self.prefilter.record(decision, input_content, found=False)
+                raise
+            self.prefilter.record(decision, input_content, found=True)
 
             self.response_model["status"] = "success"
             self.response_model["code"] = Success.SUCCESS["code"]
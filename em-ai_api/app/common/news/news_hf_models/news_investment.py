@@ -8,6 +8,7 @@ from icecream import ic
 from app.config.ai_status_code import Success
 from app.common.news.base.hf_model import HuggingFaceModel
 from app.common.news.base.hf_model_utils import text_normalize
+from app.common.news.base.prefilter import get_prefilter_gate, PREFILTER_SKIP_MSG
 from app.common.core.utils import format_error_message, snake_to_camel
 from app.config.ai_status_code import ModelExecutionError, ServiceInternalError
 from app.config.custom_errors import DataNotFoundError
@@ -25,6 +26,7 @@ class NewsInvestmentModel(HuggingFaceModel):
 
         """
         super().__init__(model_id, gpu_id)
+        self.prefilter = get_prefilter_gate("investment")
 
     def validate_input(self, input_title: Text, input_content: Text):
         """입력 텍스트의 유효성을 검사하는 함수
@@ -76,11 +78,21 @@ class NewsInvestmentModel(HuggingFaceModel):
                 text_normalize(input_title), text_normalize(input_content)
             )
 
+            # 투자 정보가 없을 것이 확실한 기사는 GPU 추론 없이 DATA_NOT_FOUND 처리
+            decision = self.prefilter.check(input_text)
+            if decision.skip and not decision.audit:
+                self.prefilter.record(decision, input_text, found=None)
+                raise DataNotFoundError(PREFILTER_SKIP_MSG)
+
             output = super().predict(input_text=input_text)
             print("output ck : \n","".join(output))
-            output = ast.literal_eval("".join(output))
-
-            self.validate_output(output)
+            try:
+                output = ast.literal_eval("".join(output))
+                self.validate_output(output)
+            except (SyntaxError, DataNotFoundError):
+                self.prefilter.record(decision, input_text, found=False)
+                raise
+            self.prefilter.record(decision, input_text, found=True)
             self.response_model["data"]["results"] = [output]
             # data>results 안에 있는 key를 snake_case를 camelCase로 변환
             self.response_model["data"]["results"] = [
@@ -0,0 +1,247 @@
+"""출원일 연도별 특허 인덱스 라우팅
+
+색인기(patent_indexer --partition-by-year)는 문서를 출원 연도별 인덱스 "{alias}_{시각}_{연도}"
+(출원일이 없으면 "{alias}_{시각}_undated")에 나누어 색인하고, 모두 같은 alias 로 묶는다.
+검색 시 kNN 필터(LLM 변환 결과)의 metadata.applicate_date range 조건에서 연도 범위를 구하고,
+범위와 겹치는 연도 인덱스에만 검색을 보낸다. 날짜 조건이 없으면 alias 전체를 검색한다.
+
+Usage:
+    python -m app.common.patent.base.date_partitions route --filter '{"range": {"metadata.applicate_date": {"gte": "2023-01-01"}}}'
+    python -m app.common.patent.base.date_partitions bench --repeat 5
+"""
+import re
+import json
+import time
+import asyncio
+import argparse
+from typing import Optional, Text
+
+from app.config.settings import DATE_PARTITION_SETTINGS
+
+DATE_FIELD = "metadata.applicate_date"
+PARTITION_PATTERN = re.compile(r"_(\d{4})$")
+UNDATED_SUFFIX = "_undated"
+# 연도 범위 (None 은 제한 없음)
+YearRange = tuple[Optional[int], Optional[int]]
+UNBOUNDED: YearRange = (None, None)
+# 날짜 조건이 있는 자연어 질의 예시 (bench 기본 질의)
+BENCH_QUERIES = [
+    "2023년 상반기에 출원된 이차전지 양극재 특허",
+    "최근 5년간 출원된 전고체 배터리 특허",
+    "2020년 이후 삼성전자가 출원한 반도체 패키징 특허",
+    "2015년부터 2018년까지 출원된 수소 연료전지 특허",
+    "자율주행 라이다 센서 특허",
+]
+
+
+def _year(value) -> Optional[int]:
+    match = re.match(r"\s*(\d{4})", str(value))
+    return int(match.group(1)) if match else None
+
+
+def _intersect(a: YearRange, b: YearRange) -> YearRange:
+    lows = [y for y in (a[0], b[0]) if y is not None]
+    highs = [y for y in (a[1], b[1]) if y is not None]
+    return (max(lows) if lows else None, min(highs) if highs else None)
+
+
+def _union(a: YearRange, b: YearRange) -> YearRange:
+    low = None if a[0] is None or b[0] is None else min(a[0], b[0])
+    high = None if a[1] is None or b[1] is None else max(a[1], b[1])
+    return (low, high)
+
+
+def filter_year_range(es_filter: Optional[dict], field: Text = DATE_FIELD) -> YearRange:
+    """ES 필터가 매칭할 수 있는 문서의 출원 연도 범위
+
+    must / filter 는 범위를 교집합, should 는 합집합으로 계산하고, must_not 과 그 밖의 절은 범위를 제한하지 않는 것으로
+    본다 (항상 실제 범위를 포함하는 쪽으로 계산). gt / lt 는 연도 단위로는 gte / lte 와 같게 취급한다.
+    """
+    if not isinstance(es_filter, dict):
+        return UNBOUNDED
+    if "range" in es_filter:
+        bounds = es_filter["range"].get(field)
+        if not isinstance(bounds, dict):
+            return UNBOUNDED
+        low = bounds.get("gte", bounds.get("gt"))
+        high = bounds.get("lte", bounds.get("lt"))
+        return (_year(low) if low is not None else None, _year(high) if high is not None else None)
+    if "bool" not in es_filter:
+        return UNBOUNDED
+    clauses = es_filter["bool"]
+    year_range = UNBOUNDED
+    for occur in ("must", "filter"):
+        children = clauses.get(occur) or []
+        for child in children if isinstance(children, list) else [children]:
+            year_range = _intersect(year_range, filter_year_range(child, field))
+    should = clauses.get("should") or []
+    should = should if isinstance(should, list) else [should]
+    # minimum_should_match 가 없으면 must / filter 와 함께 쓰인 should 는 매칭 조건이 아님
+    if should and (clauses.get("minimum_should_match") or not any(clauses.get(o) for o in ("must", "filter"))):
+        should_range = filter_year_range(should[0], field)
+        for child in should[1:]:
+            should_range = _union(should_range, filter_year_range(child, field))
+        year_range = _intersect(year_range, should_range)
+    return year_range
+
+
+class DatePartitionRouter:
+    """alias 에 묶인 연도별 인덱스 목록을 주기적으로 조회하고, 필터의 연도 범위와 겹치는 인덱스를 선택"""
+
+    def __init__(
+        self,
+        alias: Text,
+        refresh_interval: float = DATE_PARTITION_SETTINGS["refresh_interval"],
+    ):
+        self.alias = alias
+        self.refresh_interval = refresh_interval
+        # 연도별 인덱스, 연도가 없는 인덱스 (undated 제외)
+        self.partitions: dict[int, list[Text]] = {}
+        self.other_indices: list[Text] = []
+        self.refreshed_at = 0.0
+        self._refresh: Optional[asyncio.Task] = None
+        self.routed = 0
+        self.full_searches = 0
+        self.searched_partitions = 0
+        self.stale_retries = 0
+
+    def set_indices(self, indices: list[Text]):
+        partitions: dict[int, list[Text]] = {}
+        other_indices = []
+        for name in sorted(indices):
+            match = PARTITION_PATTERN.search(name)
+            if match:
+                partitions.setdefault(int(match.group(1)), []).append(name)
+            elif not name.endswith(UNDATED_SUFFIX):
+                other_indices.append(name)
+        self.partitions = partitions
+        self.other_indices = other_indices
+
+    async def _fetch_indices(self, es):
+        if await es.indices.exists_alias(name=self.alias):
+            self.set_indices(list(await es.indices.get_alias(name=self.alias)))
+        else:
+            self.set_indices([])
+        self.refreshed_at = time.time()
+
+    async def refresh(self, es, force: bool = False):
+        """alias 구성 조회 (refresh_interval 마다 한 번, 동시 요청은 같은 조회를 기다림)"""
+        if not force and time.time() - self.refreshed_at < self.refresh_interval:
+            return
+        if self._refresh is None or self._refresh.done():
+            self._refresh = asyncio.ensure_future(self._fetch_indices(es))
+        await asyncio.shield(self._refresh)
+
+    def select(self, year_range: YearRange) -> Optional[list[Text]]:
+        """연도 범위와 겹치는 인덱스 목록 (연도 인덱스가 없거나 모든 연도가 선택되면 None: alias 전체 검색)"""
+        if not self.partitions or year_range == UNBOUNDED:
+            return None
+        low, high = year_range
+        years = [
+            year for year in self.partitions
+            if (low is None or year >= low) and (high is None or year <= high)
+        ]
+        if len(years) == len(self.partitions):
+            return None
+        return [name for year in sorted(years) for name in self.partitions[year]] + self.other_indices
+
+    async def route(self, es, es_filter: Optional[dict]) -> Text:
+        """kNN 필터에 맞는 검색 대상 (쉼표로 연결한 인덱스 목록 혹은 alias)"""
+        await self.refresh(es)
+        self.routed += 1
+        indices = self.select(filter_year_range(es_filter))
+        if indices is None:
+            self.full_searches += 1
+            return self.alias
+        self.searched_partitions += len(indices)
+        if not indices:
+            # 겹치는 연도가 없으면 결과도 없으므로 가장 작은 대상을 검색 (빈 인덱스 목록은 alias 전체로 해석됨)
+            return sorted(self.partitions.items())[0][1][0]
+        return ",".join(indices)
+
+    async def recover(self, es):
+        """라우팅한 인덱스가 없을 때(index_not_found) 호출: 색인기의 alias 교체(--delete-old)로 캐시된 인덱스가
+        삭제된 경우이므로 alias 구성을 바로 다시 조회한다 (호출한 쪽은 alias 로 재시도)"""
+        self.stale_retries += 1
+        await self.refresh(es, force=True)
+
+    def stats(self) -> dict:
+        partition_count = sum(len(names) for names in self.partitions.values())
+        routed_partial = self.routed - self.full_searches
+        return {
+            "alias": self.alias,
+            "years": sorted(self.partitions),
+            "partitions": partition_count,
+            "routed": self.routed,
+            "fullSearches": self.full_searches,
+            "avgPartitionsSearched": round(self.searched_partitions / routed_partial, 2) if routed_partial else None,
+            "staleRetries": self.stale_retries,
+        }
+
+
+async def bench_routing(queries: list[Text] = BENCH_QUERIES, repeat: int = 5) -> list[dict]:
+    """자연어 질의별로 alias 전체 검색과 연도 인덱스 라우팅 검색의 kNN 지연 시간 비교
+
+    질의 변환과 임베딩은 한 번만 수행하고, 같은 kNN 요청을 두 대상에 번갈아 repeat 번씩 보낸다.
+    """
+    from app.common.patent.base.es_client import es_client_pool
+    from app.common.patent.patent_utils.patent_search_utils import PatentSearchUtils, HIT_FILTER_PATH, INDEX_NAME
+
+    utils = PatentSearchUtils()
+    router = DatePartitionRouter(INDEX_NAME, refresh_interval=0)
+    report = []
+    async with es_client_pool.acquire() as es:
+        for query in queries:
+            result = await utils.translate_nl_query(query)
+            if result["status"] != "success":
+                report.append({"query": query, "error": result.get("message")})
+                continue
+            vector = await utils.encode_query(result["keywords"])
+            es_knn = utils._get_nl_knn(vector, result, 10)
+            targets = {"alias": INDEX_NAME, "routed": await router.route(es, es_knn["filter"])}
+            times = {name: 0.0 for name in targets}
+            hits = {}
+            for _ in range(repeat):
+                for name, index in targets.items():
+                    start = time.perf_counter()
+                    response = await es.search(
+                        index=index, filter_path=HIT_FILTER_PATH, **utils._get_knn_request(es, es_knn, 10)
+                    )
+                    times[name] += time.perf_counter() - start
+                    hits[name] = [hit["_id"] for hit in response.get("hits", {}).get("hits", [])]
+            alias_ms = times["alias"] / repeat * 1000
+            routed_ms = times["routed"] / repeat * 1000
+            report.append({
+                "query": query,
+                "yearRange": filter_year_range(es_knn["filter"]),
+                "indices": targets["routed"].split(","),
+                "aliasAvgMs": round(alias_ms, 2),
+                "routedAvgMs": round(routed_ms, 2),
+                "speedup": round(alias_ms / routed_ms, 2) if routed_ms else None,
+                "sameHits": hits["alias"] == hits["routed"],
+            })
+    await es_client_pool.close()
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="출원 연도별 인덱스 라우팅 확인 / 지연 시간 비교")
+    parser.add_argument("command", choices=["route", "bench"])
+    parser.add_argument("--filter", help="route: kNN 필터 (JSON)")
+    parser.add_argument("--indices", nargs="*", help="route: alias 에 묶인 인덱스 목록 (생략 시 ES 에서 조회)")
+    parser.add_argument("--queries", nargs="+", default=BENCH_QUERIES, help="bench: 자연어 질의")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.command == "route":
+        es_filter = json.loads(args.filter) if args.filter else None
+        print(json.dumps({"yearRange": filter_year_range(es_filter)}))
+        if args.indices is not None:
+            from app.common.patent.patent_utils.patent_search_utils import INDEX_NAME
+
+            router = DatePartitionRouter(INDEX_NAME)
+            router.set_indices(args.indices)
+            print(json.dumps({"indices": router.select(filter_year_range(es_filter)) or [INDEX_NAME]}))
+    else:
+        for row in asyncio.run(bench_routing(args.queries, args.repeat)):
+            print(json.dumps(row, ensure_ascii=False))
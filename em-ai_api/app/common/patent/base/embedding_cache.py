@@ -0,0 +1,135 @@
+import os
+import re
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from app.config.settings import EMBEDDING_CACHE_SETTINGS
+
+KEY_SIZE = 16
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키 생성을 위한 텍스트 정규화 (유니코드 NFKC, 소문자, 연속 공백 제거)"""
+    text = unicodedata.normalize("NFKC", text).lower()
+    return re.sub(r"\s+", " ", text).strip()
+
+
+class DiskEmbeddingTier:
+    """여러 워커 프로세스가 공유하는 memory-mapped 임베딩 캐시
+
+    고정 크기 슬롯 테이블(direct-mapped)로, 슬롯 = 키 해시 % 슬롯 수 이며 충돌 시 덮어쓴다.
+    쓰기는 "키 삭제 -> 벡터 기록 -> 키 기록" 순서로, 읽기는 벡터 복사 전후 키를 확인해서
+    다른 프로세스가 쓰는 중인 슬롯은 miss 로 처리한다.
+    """
+
+    def __init__(self, path: str, dim: int, slots: int):
+        self.path = path
+        self.slots = slots
+        self.dtype = np.dtype([("key", f"V{KEY_SIZE}"), ("vec", "<f4", (dim,))])
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        size = self.dtype.itemsize * slots
+        # 여러 프로세스가 동시에 생성해도 안전하도록 0으로 확장만 수행
+        with open(path, "ab") as f:
+            if f.tell() < size:
+                f.truncate(size)
+        self.table = np.memmap(path, dtype=self.dtype, mode="r+", shape=(slots,))
+
+    def _slot(self, key: bytes) -> int:
+        return int.from_bytes(key[:8], "little") % self.slots
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        slot = self._slot(key)
+        if self.table["key"][slot].tobytes() != key:
+            return None
+        vector = np.array(self.table["vec"][slot], dtype=np.float32)
+        if self.table["key"][slot].tobytes() != key:
+            return None
+        return vector
+
+    def put(self, key: bytes, vector: np.ndarray):
+        slot = self._slot(key)
+        self.table["key"][slot] = b"\x00" * KEY_SIZE
+        self.table["vec"][slot] = vector
+        self.table["key"][slot] = key
+
+
+class EmbeddingCache:
+    """질의 임베딩 캐시 (메모리 LRU + 선택적 디스크 mmap 계층)
+
+    키는 (모델 아이디, 정규화된 텍스트) 해시이고, 값은 float32 벡터이다.
+    """
+
+    def __init__(
+        self,
+        model_id: str,
+        dim: int = 1024,
+        max_items: int = EMBEDDING_CACHE_SETTINGS["max_items"],
+        disk_dir: Optional[str] = EMBEDDING_CACHE_SETTINGS["disk_dir"],
+        disk_slots: int = EMBEDDING_CACHE_SETTINGS["disk_slots"],
+    ):
+        self.model_id = model_id
+        self.dim = dim
+        self.max_items = max_items
+        self.memory = OrderedDict()
+        self.disk = None
+        if disk_dir:
+            file_name = f"{model_id.replace('/', '--')}_{dim}.cache"
+            self.disk = DiskEmbeddingTier(os.path.join(disk_dir, file_name), dim, disk_slots)
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _key(self, text: str) -> bytes:
+        data = f"{self.model_id}\0{normalize_text(text)}".encode("utf-8")
+        return hashlib.blake2b(data, digest_size=KEY_SIZE).digest()
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        key = self._key(text)
+        with self._lock:
+            vector = self.memory.get(key)
+            if vector is not None:
+                self.memory.move_to_end(key)
+                self.memory_hits += 1
+                return vector
+        if self.disk is not None:
+            vector = self.disk.get(key)
+            if vector is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._put_memory(key, vector)
+                return vector
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def _put_memory(self, key: bytes, vector: np.ndarray):
+        self.memory[key] = vector
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_items:
+            self.memory.popitem(last=False)
+
+    def put(self, text: str, vector: np.ndarray):
+        key = self._key(text)
+        vector = np.asarray(vector, dtype=np.float32).reshape(self.dim)
+        with self._lock:
+            self._put_memory(key, vector)
+        if self.disk is not None:
+            self.disk.put(key, vector)
+
+    def stats(self) -> dict:
+        total = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "modelId": self.model_id,
+            "memoryItems": len(self.memory),
+            "memoryHits": self.memory_hits,
+            "diskHits": self.disk_hits,
+            "misses": self.misses,
+            "hitRate": round((self.memory_hits + self.disk_hits) / total, 4) if total else None,
+            "diskEnabled": self.disk is not None,
+        }
@@ -0,0 +1,162 @@
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+import numpy as np
+
+from app.config.settings import EMBEDDING_SERVICE_SETTINGS, EMBEDDING_BACKEND
+
+
+def _set_intra_op_threads(num_threads: int):
+    """인코딩 워커 스레드의 torch intra-op 스레드 수 설정
+
+    torch.set_num_threads 는 프로세스 전체(뉴스 모델 추론 포함)에 적용되므로 torch 백엔드에서만 설정한다.
+    ONNX 백엔드는 OnnxBgeM3Encoder 의 세션 옵션(intra_op_num_threads)으로 설정한다.
+    """
+    if num_threads <= 0 or EMBEDDING_BACKEND != "torch":
+        return
+    import torch
+
+    torch.set_num_threads(num_threads)
+
+
+class EmbeddingService:
+    """동시에 들어온 인코딩 요청을 배치로 묶어 이벤트 루프 밖에서 실행하는 임베딩 서비스
+
+    요청은 asyncio 큐에 쌓이고, 배치 루프가 첫 요청 이후 max_wait_ms 동안(최대 max_batch_size 개)
+    요청을 더 모아서 워커 스레드에서 한 번에 인코딩한다. 호출자는 encode() 를 await 해서 벡터를 받는다.
+    인코딩 중에도 이벤트 루프는 막히지 않으므로 다른 엔드포인트는 영향을 받지 않는다.
+    """
+
+    def __init__(
+        self,
+        encode_batch: Callable[[list[str]], np.ndarray],
+        max_batch_size: int = EMBEDDING_SERVICE_SETTINGS["max_batch_size"],
+        max_wait_ms: float = EMBEDDING_SERVICE_SETTINGS["max_wait_ms"],
+        workers: int = EMBEDDING_SERVICE_SETTINGS["workers"],
+        intra_op_threads: int = EMBEDDING_SERVICE_SETTINGS["intra_op_threads"],
+    ):
+        self.encode_batch = encode_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="embedding",
+            initializer=_set_intra_op_threads,
+            initargs=(intra_op_threads,),
+        )
+        self.intra_op_threads = intra_op_threads
+        self.queue: Optional[asyncio.Queue] = None
+        self._loop = None
+        self._tasks: list[asyncio.Task] = []
+        self.requests = 0
+        self.batches = 0
+        self.encoded = 0
+        self.encode_time = 0.0
+        self.max_batch_seen = 0
+
+    def _ensure_started(self):
+        """현재 이벤트 루프에서 배치 루프 시작 (모델은 로더 스레드에서 생성되므로 첫 요청 시점에 시작)"""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+        self._loop = loop
+        self.queue = asyncio.Queue()
+        # 워커 수만큼 배치 루프를 두어 한 배치를 인코딩하는 동안 다음 배치를 모은다
+        self._tasks = [loop.create_task(self._batch_loop()) for _ in range(self.workers)]
+
+    async def encode(self, text: str) -> np.ndarray:
+        """텍스트 1개를 인코딩 (다른 동시 요청과 배치로 묶여서 실행)
+
+        Args:
+            text (str): 인코딩할 텍스트
+
+        Returns:
+            np.ndarray: float32 dense 벡터
+        """
+        self._ensure_started()
+        future = self._loop.create_future()
+        self.requests += 1
+        await self.queue.put((text, future))
+        return await future
+
+    async def encode_many(self, texts: list[str]) -> np.ndarray:
+        """이미 모인 텍스트 목록을 큐를 거치지 않고 한 배치로 인코딩 (대량 검색용)
+
+        Args:
+            texts (list[str]): 인코딩할 텍스트 (중복 없음)
+
+        Returns:
+            np.ndarray: (len(texts), dim) float32 dense 벡터
+        """
+        self._ensure_started()
+        vectors, elapsed = await self._loop.run_in_executor(self.executor, self._run_batch, texts)
+        self.requests += len(texts)
+        self._record_batch(len(texts), len(texts), elapsed)
+        return vectors
+
+    def _record_batch(self, batch_size: int, encoded: int, elapsed: float):
+        self.batches += 1
+        self.encoded += encoded
+        self.encode_time += elapsed
+        self.max_batch_seen = max(self.max_batch_seen, batch_size)
+
+    async def _collect_batch(self) -> list:
+        batch = [await self.queue.get()]
+        deadline = self._loop.time() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    def _run_batch(self, texts: list[str]) -> tuple[np.ndarray, float]:
+        start = time.perf_counter()
+        vectors = np.asarray(self.encode_batch(texts), dtype=np.float32)
+        return vectors, time.perf_counter() - start
+
+    async def _batch_loop(self):
+        while True:
+            batch = await self._collect_batch()
+            # 같은 배치 안의 중복 텍스트는 한 번만 인코딩
+            texts = list(dict.fromkeys(text for text, _ in batch))
+            try:
+                vectors, elapsed = await self._loop.run_in_executor(self.executor, self._run_batch, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            index = {text: i for i, text in enumerate(texts)}
+            for text, future in batch:
+                if not future.done():
+                    future.set_result(vectors[index[text]])
+            self._record_batch(len(batch), len(texts), elapsed)
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self._loop = None
+        self.executor.shutdown(wait=False)
+
+    def stats(self) -> dict:
+        return {
+            "maxBatchSize": self.max_batch_size,
+            "maxWaitMs": self.max_wait * 1000,
+            "workers": self.workers,
+            "intraOpThreads": self.intra_op_threads,
+            "queued": self.queue.qsize() if self.queue is not None else 0,
+            "requests": self.requests,
+            "batches": self.batches,
+            "encoded": self.encoded,
+            "avgBatchSize": round(self.encoded / self.batches, 2) if self.batches else None,
+            "maxBatchSeen": self.max_batch_seen,
+            "avgBatchTime": round(self.encode_time / self.batches, 4) if self.batches else None,
+        }
@@ -0,0 +1,98 @@
+import time
+import asyncio
+from contextlib import asynccontextmanager
+
+from elasticsearch import AsyncElasticsearch
+
+from app.config.settings import ES_CLOUD_ID, ES_API_KEY, ES_HOSTS, ES_CLIENT_SETTINGS
+
+
+class EsClientPool:
+    """애플리케이션 수명 동안 공유하는 AsyncElasticsearch 클라이언트와 커넥션 풀
+
+    요청마다 클라이언트를 만들고 닫으면 매번 Elastic Cloud 와 TLS 핸드셰이크가 발생하므로,
+    FastAPI lifespan 에서 한 번 생성하고 종료 시 정리한다.
+    """
+
+    def __init__(self):
+        self.client = None
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_requests = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self._lock = asyncio.Lock()
+
+    def _create_client(self) -> AsyncElasticsearch:
+        kwargs = {
+            "request_timeout": ES_CLIENT_SETTINGS["request_timeout"],
+            "retry_on_timeout": True,
+            "max_retries": ES_CLIENT_SETTINGS["max_retries"],
+            "retry_on_status": (429, 502, 503, 504),
+            "connections_per_node": ES_CLIENT_SETTINGS["connections_per_node"],
+            "http_compress": ES_CLIENT_SETTINGS["http_compress"],
+            "dead_node_backoff_factor": ES_CLIENT_SETTINGS["dead_node_backoff_factor"],
+            "max_dead_node_backoff": ES_CLIENT_SETTINGS["max_dead_node_backoff"],
+        }
+        if ES_HOSTS:
+            # 자체 클러스터(혹은 로컬 ES)일 때만 스니핑 사용 (Elastic Cloud 는 프록시 뒤에 있으므로 스니핑 불가)
+            return AsyncElasticsearch(
+                hosts=ES_HOSTS,
+                api_key=ES_API_KEY,
+                sniff_on_start=ES_CLIENT_SETTINGS["sniff"],
+                sniff_on_node_failure=ES_CLIENT_SETTINGS["sniff"],
+                min_delay_between_sniffing=60,
+                **kwargs,
+            )
+        return AsyncElasticsearch(cloud_id=ES_CLOUD_ID, api_key=ES_API_KEY, **kwargs)
+
+    async def open(self) -> AsyncElasticsearch:
+        async with self._lock:
+            if self.client is None:
+                self.client = self._create_client()
+        return self.client
+
+    async def close(self):
+        async with self._lock:
+            if self.client is not None:
+                await self.client.close()
+                self.client = None
+
+    @asynccontextmanager
+    async def acquire(self):
+        """공유 클라이언트를 사용하는 context manager (사용량 통계 집계)
+
+        Yields:
+            AsyncElasticsearch: 공유 Elasticsearch 클라이언트
+        """
+        client = self.client or await self.open()
+        self.in_flight += 1
+        self.total_requests += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        start = time.perf_counter()
+        try:
+            yield client
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            self.total_time += time.perf_counter() - start
+
+    def stats(self) -> dict:
+        nodes = []
+        if self.client is not None:
+            nodes = [str(node.base_url) for node in self.client.transport.node_pool.all()]
+        return {
+            "open": self.client is not None,
+            "nodes": nodes,
+            "connectionsPerNode": ES_CLIENT_SETTINGS["connections_per_node"],
+            "inFlight": self.in_flight,
+            "peakInFlight": self.peak_in_flight,
+            "totalRequests": self.total_requests,
+            "errors": self.errors,
+            "avgTime": round(self.total_time / self.total_requests, 4) if self.total_requests else None,
+        }
+
+
+es_client_pool = EsClientPool()
@@ -0,0 +1,98 @@
+"""특허 벡터 인덱스 매핑 생성 / 인덱스 생성
+
+Usage:
+    python -m app.common.patent.base.es_index mapping --quantization int8
+    python -m app.common.patent.base.es_index create --index em_ai_patent_vector_index_int8 --quantization int8
+"""
+import json
+import asyncio
+import argparse
+from typing import Text
+
+# 양자화 방식별 dense_vector index_options 타입 (bbq_hnsw 는 Elasticsearch 8.16 이상)
+INDEX_OPTIONS_TYPES = {"none": "hnsw", "int8": "int8_hnsw", "binary": "bbq_hnsw"}
+
+
+def generate_index_mapping(
+    dims: int = 1024,
+    quantization: Text = "none",
+    similarity: Text = "cosine",
+    m: int = 16,
+    ef_construction: int = 100,
+) -> dict:
+    """특허 벡터 인덱스 설정 / 매핑
+
+    문서 형식은 {"text", "embedding", "metadata": {...}} 이며, 메타데이터 문자열 필드는
+    ElasticsearchTranslator 의 match / term(.keyword) 절을 위해 동적 매핑(text + keyword)을 사용한다.
+    양자화 인덱스도 원본 float 벡터를 함께 저장하므로 rescore 절로 다시 점수를 계산할 수 있다.
+
+    Args:
+        dims (int): 벡터 차원
+        quantization (str): "none", "int8", "binary"
+        similarity (str): 유사도 함수
+        m (int): HNSW 이웃 수
+        ef_construction (int): HNSW 생성 시 후보 수
+
+    Returns:
+        dict: 인덱스 생성 요청 본문 (settings, mappings)
+    """
+    if quantization not in INDEX_OPTIONS_TYPES:
+        raise ValueError(f"quantization 은 {list(INDEX_OPTIONS_TYPES)} 중 하나여야 합니다: {quantization}")
+    return {
+        "settings": {"index": {"number_of_shards": 1, "number_of_replicas": 1}},
+        "mappings": {
+            "properties": {
+                "text": {"type": "text"},
+                "embedding": {
+                    "type": "dense_vector",
+                    "dims": dims,
+                    "index": True,
+                    "similarity": similarity,
+                    "index_options": {
+                        "type": INDEX_OPTIONS_TYPES[quantization],
+                        "m": m,
+                        "ef_construction": ef_construction,
+                    },
+                },
+                "metadata": {
+                    "dynamic": True,
+                    "properties": {
+                        "applicate_date": {"type": "date", "format": "yyyy-MM-dd||strict_date_optional_time"},
+                    },
+                },
+            }
+        },
+    }
+
+
+def get_index_quantization(mapping: dict, field: Text = "embedding") -> Text:
+    """인덱스 매핑(indices.get_mapping 결과의 mappings)에서 벡터 양자화 방식 조회"""
+    options = mapping["properties"][field].get("index_options", {})
+    types = {value: key for key, value in INDEX_OPTIONS_TYPES.items()}
+    return types.get(options.get("type"), "none")
+
+
+async def create_index(index: Text, quantization: Text = "none", dims: int = 1024) -> dict:
+    from app.common.patent.base.es_client import es_client_pool
+
+    body = generate_index_mapping(dims, quantization)
+    async with es_client_pool.acquire() as es:
+        result = await es.indices.create(index=index, settings=body["settings"], mappings=body["mappings"])
+    await es_client_pool.close()
+    return dict(result)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="특허 벡터 인덱스 매핑 생성")
+    parser.add_argument("command", choices=["mapping", "create"])
+    parser.add_argument("--index", help="생성할 인덱스 이름")
+    parser.add_argument("--quantization", choices=list(INDEX_OPTIONS_TYPES), default="none")
+    parser.add_argument("--dims", type=int, default=1024)
+    args = parser.parse_args()
+
+    if args.command == "mapping":
+        print(json.dumps(generate_index_mapping(args.dims, args.quantization), indent=4))
+    else:
+        if not args.index:
+            parser.error("--index 를 지정해야 합니다.")
+        print(json.dumps(asyncio.run(create_index(args.index, args.quantization, args.dims)), indent=4))
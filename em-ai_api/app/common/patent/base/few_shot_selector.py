@@ -0,0 +1,226 @@
+"""쿼리 생성 프롬프트의 few-shot 예시 동적 선택
+
+PATENT_QUERY_FEW_SHOT_EXAMPLES 전체 대신 질의와 가장 비슷한 예시 k 개만 프롬프트에 넣는다.
+예시 질의는 검색 임베딩 모델(BGE-M3)로 한 번만 임베딩하고, 질의 벡터(검색에서 이미 계산한 벡터)와의
+cosine 유사도 순으로 토큰 예산(token_budget) 안에서 고른다.
+
+report: 예시 집합에서 leave-one-out 으로 (해당 예시를 제외한) 전체 예시 프롬프트와 선택 예시 프롬프트를 비교한다.
+    - 프롬프트 토큰 수 / 절감률
+    - LLM 변환 지연 시간
+    - 정확도: 변환 결과(filter, keywords)가 예시의 정답과 같은 비율, 두 프롬프트의 결과가 같은 비율
+
+Usage:
+    python -m app.common.patent.base.few_shot_selector report --k 4 --token-budget 1200
+    python -m app.common.patent.base.few_shot_selector report --no-llm   # 토큰 수만 비교
+"""
+import json
+import math
+import time
+import asyncio
+import argparse
+from functools import lru_cache
+from typing import Optional, Sequence, Text
+
+import numpy as np
+from langchain.chains.query_constructor.prompt import USER_SPECIFIED_EXAMPLE_PROMPT
+
+from app.config.settings import FEW_SHOT_SELECTION_SETTINGS
+from app.common.patent.base.query_generator_utils import construct_examples
+
+
+# tiktoken 인코딩을 불러올 수 없을 때(오프라인 환경에서 BPE 파일이 캐시에 없는 경우) 글자 수로 추정하는 비율
+FALLBACK_CHARS_PER_TOKEN = 2.5
+
+
+@lru_cache(maxsize=None)
+def get_encoding(encoding: Text = FEW_SHOT_SELECTION_SETTINGS["encoding"]):
+    """토큰 수 계산용 tiktoken 인코딩 (처음 사용할 때 한 번만 로드, 불러올 수 없으면 None)
+
+    tiktoken 은 처음 사용할 때 BPE 파일을 내려받으므로 import 시점이 아니라 여기서만 로드한다.
+    """
+    try:
+        import tiktoken
+
+        return tiktoken.get_encoding(encoding)
+    except Exception as e:
+        print(f"tiktoken 인코딩({encoding})을 불러올 수 없어 글자 수로 토큰 수를 추정합니다: {e}")
+        return None
+
+
+def count_tokens(text: Text, encoding: Text = FEW_SHOT_SELECTION_SETTINGS["encoding"]) -> int:
+    tokenizer = get_encoding(encoding)
+    if tokenizer is None:
+        return math.ceil(len(text) / FALLBACK_CHARS_PER_TOKEN)
+    return len(tokenizer.encode(text))
+
+
+class FewShotExampleSelector:
+    """질의 벡터와 비슷한 few-shot 예시 선택 (예시 벡터와 예시별 토큰 수는 fit 에서 한 번만 계산)"""
+
+    def __init__(
+        self,
+        examples: Sequence[tuple],
+        k: int = FEW_SHOT_SELECTION_SETTINGS["k"],
+        token_budget: int = FEW_SHOT_SELECTION_SETTINGS["token_budget"],
+    ):
+        self.examples = list(examples)
+        self.queries = [query for query, _ in self.examples]
+        self.k = k
+        self.token_budget = token_budget
+        self.token_counts: list[int] = []
+        self.example_vectors: Optional[np.ndarray] = None
+        self.selections = 0
+        self.selected_tokens = 0
+
+    @property
+    def fitted(self) -> bool:
+        return self.example_vectors is not None
+
+    def fit(self, vectors):
+        self.token_counts = [
+            count_tokens(USER_SPECIFIED_EXAMPLE_PROMPT.format(**example))
+            for example in construct_examples(self.examples)
+        ]
+        vectors = np.asarray(vectors, dtype=np.float32)
+        self.example_vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+
+    def select(self, query_vector, candidates: Optional[Sequence[int]] = None) -> tuple[int, ...]:
+        """질의와 비슷한 예시 번호 (유사도 순으로 k 개, 토큰 예산을 넘는 예시는 건너뜀)
+
+        가장 비슷한 예시가 질의 바로 앞에 오도록 유사도 오름차순으로 반환한다.
+
+        Args:
+            query_vector: 질의 dense 벡터
+            candidates (Sequence[int], optional): 선택 대상 예시 번호 (생략 시 전체)
+
+        Returns:
+            tuple[int, ...]: 예시 번호 (PATENT_QUERY_FEW_SHOT_EXAMPLES 기준)
+        """
+        candidates = np.arange(len(self.examples)) if candidates is None else np.asarray(candidates)
+        query_vector = np.asarray(query_vector, dtype=np.float32)
+        scores = self.example_vectors[candidates] @ (query_vector / max(np.linalg.norm(query_vector), 1e-12))
+        picked, used = [], 0
+        for i in candidates[np.argsort(-scores, kind="stable")]:
+            if len(picked) == self.k:
+                break
+            if used + self.token_counts[i] > self.token_budget:
+                continue
+            picked.append(int(i))
+            used += self.token_counts[i]
+        self.selections += 1
+        self.selected_tokens += used
+        return tuple(reversed(picked))
+
+    def stats(self) -> dict:
+        return {
+            "examples": len(self.examples),
+            "k": self.k,
+            "tokenBudget": self.token_budget,
+            "allExampleTokens": sum(self.token_counts) if self.fitted else None,
+            "selections": self.selections,
+            "avgSelectedTokens": round(self.selected_tokens / self.selections, 1) if self.selections else None,
+        }
+
+
+async def _timed_translate(indices: tuple, query: Text) -> tuple[Optional[dict], float]:
+    from app.common.patent.base.patent_query_generator import get_query_constructor, _translate_structured_query
+
+    start = time.perf_counter()
+    try:
+        structured_query = await get_query_constructor(indices).ainvoke({"query": query}, config={"fix_invalid": True})
+        result = _translate_structured_query(structured_query)
+    except Exception as e:
+        result = {"status": "fail", "error": str(e)}
+    return result, time.perf_counter() - start
+
+
+def _expected_result(output: dict) -> Optional[dict]:
+    from app.common.patent.base.patent_query_generator import output_parser, _translate_structured_query
+
+    try:
+        return _translate_structured_query(output_parser.parse(json.dumps(output, ensure_ascii=False)))
+    except Exception:
+        return None
+
+
+def _same(result: Optional[dict], expected: Optional[dict]) -> Optional[bool]:
+    """변환 결과 비교 (비교 기준이 없으면 None)"""
+    if expected is None or expected.get("status") != "success":
+        return None
+    if result is None or result.get("status") != "success":
+        return False
+    return result["filter"] == expected["filter"] and result["keywords"] == expected["keywords"]
+
+
+async def report(
+    k: int = FEW_SHOT_SELECTION_SETTINGS["k"],
+    token_budget: int = FEW_SHOT_SELECTION_SETTINGS["token_budget"],
+    run_llm: bool = True,
+) -> dict:
+    """예시 집합 leave-one-out 비교 (질의 예시 하나를 빼고 나머지를 예시로 사용)"""
+    from app.common.patent.base.prompts import PATENT_QUERY_FEW_SHOT_EXAMPLES
+    from app.common.patent.base.patent_query_generator import build_prompt
+    from app.common.patent.patent_utils.patent_search_utils import PatentSearchUtils
+
+    examples = PATENT_QUERY_FEW_SHOT_EXAMPLES
+    utils = PatentSearchUtils()
+    selector = FewShotExampleSelector(examples, k, token_budget)
+    vectors = await utils.encode_queries(selector.queries)
+    selector.fit(vectors)
+    rows = []
+    for i, (query, output) in enumerate(examples):
+        others = tuple(j for j in range(len(examples)) if j != i)
+        picked = selector.select(vectors[i], candidates=others)
+        row = {
+            "query": query,
+            "selected": list(picked),
+            "fullTokens": count_tokens(build_prompt([examples[j] for j in others]).format(query=query)),
+            "selectedTokens": count_tokens(build_prompt([examples[j] for j in picked]).format(query=query)),
+        }
+        if run_llm:
+            expected = _expected_result(output)
+            full, full_time = await _timed_translate(others, query)
+            selected, selected_time = await _timed_translate(picked, query)
+            row.update({
+                "fullMs": round(full_time * 1000, 1),
+                "selectedMs": round(selected_time * 1000, 1),
+                "fullCorrect": _same(full, expected),
+                "selectedCorrect": _same(selected, expected),
+                "agree": _same(selected, full),
+            })
+        print(json.dumps(row, ensure_ascii=False), flush=True)
+        rows.append(row)
+    await utils.embedding_service.close()
+
+    def mean(key):
+        values = [row[key] for row in rows if row.get(key) is not None]
+        return round(float(np.mean(values)), 4) if values else None
+
+    summary = {
+        "examples": len(rows),
+        "k": k,
+        "tokenBudget": token_budget,
+        "avgFullTokens": mean("fullTokens"),
+        "avgSelectedTokens": mean("selectedTokens"),
+    }
+    summary["tokenReduction"] = round(1 - summary["avgSelectedTokens"] / summary["avgFullTokens"], 4)
+    if run_llm:
+        summary.update({
+            "avgFullMs": mean("fullMs"),
+            "avgSelectedMs": mean("selectedMs"),
+            "fullAccuracy": mean("fullCorrect"),
+            "selectedAccuracy": mean("selectedCorrect"),
+            "agreement": mean("agree"),
+        })
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="few-shot 예시 선택 토큰 / 지연 시간 / 정확도 비교")
+    parser.add_argument("command", choices=["report"])
+    parser.add_argument("--k", type=int, default=FEW_SHOT_SELECTION_SETTINGS["k"])
+    parser.add_argument("--token-budget", type=int, default=FEW_SHOT_SELECTION_SETTINGS["token_budget"])
+    parser.add_argument("--no-llm", action="store_true", help="LLM 호출 없이 토큰 수만 비교")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(report(args.k, args.token_budget, not args.no_llm)), ensure_ascii=False, indent=4))
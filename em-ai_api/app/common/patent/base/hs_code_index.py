@@ -0,0 +1,149 @@
+"""HS 품목 분류(hscode.json) -> IPC 접두어 트라이 인덱스
+
+hscode.json 은 "품목:세부분류" 별 IPC 코드 목록이다. 코드를 정규화(ipc_codes.normalize_ipc)한 뒤
+접두어 트라이로 컴파일하고, 각 트라이 노드에 해당 접두어를 가진 분류의 비트셋(int)을 저장한다.
+특허의 IPC 코드 1개가 속한 분류는 코드 길이만큼 트라이를 따라가며 비트셋을 OR 해서 구한다 (IPC 당 상수 시간).
+
+- "H01M10/05"  : H01M10/05, H01M10/0525, H01M10/058 ... (하위 그룹 포함)
+- "C01G51/00"  : 메인그룹 전체 (C01G51/...)
+
+Usage:
+    python -m app.common.patent.base.hs_code_index 양극재:활물질
+"""
+import json
+import argparse
+from typing import Optional, Text
+
+from app.common.patent.base.ipc_codes import normalize_ipc, parse_ipcs
+
+# 품목(":" 앞)만 지정하면 해당 품목의 모든 세부분류를 사용
+CATEGORY_SEPARATOR = ":"
+# match_phrase_prefix 의 마지막 토큰 확장 수 (서브그룹 번호 접두어)
+MAX_PREFIX_EXPANSIONS = 200
+
+
+def ipc_variants(prefix: Text) -> list[Text]:
+    """정규화된 IPC 접두어의 저장 형식별 표기
+
+    compact("H01M10/05"), spaced("H01M 10/05"), 메인그룹 0 채움("H01M010/05", "H01M 010/05")
+    """
+    compact = prefix.rstrip("/")
+    subclass, main_group = compact[:4], compact[4:]
+    if not main_group:
+        return [subclass]
+    main, separator, subgroup = main_group.partition("/")
+    padded = f"{int(main):03d}{separator}{subgroup}"
+    return list(dict.fromkeys([
+        compact, f"{subclass} {main_group}", f"{subclass}{padded}", f"{subclass} {padded}",
+    ]))
+
+
+def ipc_prefix(code: Text) -> Optional[Text]:
+    """HS 분류의 IPC 코드를 매칭용 접두어로 변환 ("/00" 은 메인그룹 전체)"""
+    code = normalize_ipc(code)
+    if code is None:
+        return None
+    return code[:-2] if code.endswith("/00") else code
+
+
+class HsCodeIndex:
+    def __init__(self, categories: dict[Text, list[Text]]):
+        self.categories = list(categories)
+        self.prefixes: list[list[Text]] = []
+        # 트라이: 노드별 자식(문자 -> 노드 번호)과 접두어가 끝나는 분류 비트셋
+        self._children: list[dict[Text, int]] = [{}]
+        self._masks: list[int] = [0]
+        for bit, codes in enumerate(categories.values()):
+            prefixes = list(dict.fromkeys(p for p in map(ipc_prefix, codes) if p))
+            self.prefixes.append(prefixes)
+            for prefix in prefixes:
+                self._insert(prefix, 1 << bit)
+
+    @classmethod
+    def from_json(cls, path: Text) -> "HsCodeIndex":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def _insert(self, prefix: Text, mask: int):
+        node = 0
+        for char in prefix:
+            child = self._children[node].get(char)
+            if child is None:
+                child = len(self._children)
+                self._children[node][char] = child
+                self._children.append({})
+                self._masks.append(0)
+            node = child
+        self._masks[node] |= mask
+
+    def match_ipc(self, code: Text) -> int:
+        """정규화된 IPC 코드 1개가 속한 분류 비트셋"""
+        node, mask = 0, 0
+        for char in code:
+            node = self._children[node].get(char)
+            if node is None:
+                break
+            mask |= self._masks[node]
+        return mask
+
+    def resolve(self, hs_code: Text) -> int:
+        """요청 HS 코드("품목:세부분류" 혹은 "품목")에 해당하는 분류 비트셋 (없으면 0)"""
+        hs_code = hs_code.strip()
+        mask = 0
+        for bit, category in enumerate(self.categories):
+            if category == hs_code or category.split(CATEGORY_SEPARATOR)[0] == hs_code:
+                mask |= 1 << bit
+        return mask
+
+    def names(self, mask: int) -> list[Text]:
+        return [category for bit, category in enumerate(self.categories) if mask >> bit & 1]
+
+    def tag(self, ipcs_value, mask: int = -1) -> list[Text]:
+        """metadata.ipcs 값이 속한 분류명 목록 (mask 로 대상 분류 제한)"""
+        matched = 0
+        for code in parse_ipcs(ipcs_value):
+            matched |= self.match_ipc(code)
+        return self.names(matched & mask)
+
+    def es_filter(self, mask: int, field: Text = "metadata.ipcs") -> dict:
+        """분류 비트셋의 IPC 접두어를 metadata.ipcs 에 대한 bool should 필터로 변환
+
+        ipcs 는 여러 코드를 담은 문자열(text)이므로 "H01M10/0525"(→ h01m10, 0525), "H01M 10/0525"(→ h01m, 10, 0525),
+        메인그룹 0 채움 "H01M010/0525"(→ h01m010, 0525) 등 저장 형식별 표기(ipc_variants) 모두에 대해 구문 접두어 매칭을 한다.
+        """
+        prefixes = dict.fromkeys(
+            prefix for bit, category_prefixes in enumerate(self.prefixes) if mask >> bit & 1
+            for prefix in category_prefixes
+        )
+        should = []
+        for prefix in prefixes:
+            for variant in ipc_variants(prefix):
+                should.append({
+                    "match_phrase_prefix": {field: {"query": variant, "max_expansions": MAX_PREFIX_EXPANSIONS}}
+                })
+        return {"bool": {"should": should, "minimum_should_match": 1}}
+
+    def stats(self) -> dict:
+        return {
+            "categories": len(self.categories),
+            "prefixes": sum(len(prefixes) for prefixes in self.prefixes),
+            "trieNodes": len(self._children),
+        }
+
+
+if __name__ == "__main__":
+    from app.config.settings import HS_CODE_PATH
+
+    parser = argparse.ArgumentParser(description="HS 코드 -> IPC 필터 확인")
+    parser.add_argument("hs_code", nargs="?", help="품목:세부분류 혹은 품목 (생략 시 전체 분류 목록)")
+    parser.add_argument("--ipcs", help="분류를 확인할 IPC 코드 문자열")
+    args = parser.parse_args()
+
+    index = HsCodeIndex.from_json(HS_CODE_PATH)
+    print(json.dumps(index.stats(), ensure_ascii=False))
+    if args.ipcs:
+        print(json.dumps(index.tag(args.ipcs), ensure_ascii=False))
+    if args.hs_code:
+        print(json.dumps(index.es_filter(index.resolve(args.hs_code)), ensure_ascii=False, indent=4))
+    else:
+        print(json.dumps(index.categories, ensure_ascii=False))
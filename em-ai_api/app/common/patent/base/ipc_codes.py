@@ -0,0 +1,113 @@
+"""IPC 코드 파싱 / 정규화 / 계층 절단 및 IPC 동시 출현 네트워크 계산
+
+IPC 코드는 "H01M 10/0525", "H01M10/0525", "H01M010/0525"(메인그룹 0 채움), "H01M 10/0525(2010.01)" 등
+여러 형식으로 저장되어 있으므로, 모두 "H01M10/0525" 형식으로 정규화해서 비교한다.
+계층: section(H) > class(H01) > subclass(H01M) > group(H01M10/00, 메인그룹) > subgroup(H01M10/0525)
+"""
+import re
+from typing import Iterable, Optional, Text
+
+import numpy as np
+
+IPC_LEVELS = ["section", "class", "subclass", "group", "subgroup"]
+# 구분자(쉼표, 공백, | 등)와 관계없이 문자열에서 IPC 코드를 찾는다
+IPC_PATTERN = re.compile(r"([A-H])\s*(\d{2})\s*([A-Z])(?:\s*(\d{1,4})(?:\s*/\s*(\d{1,6}))?)?")
+
+
+def _format_ipc(match: re.Match) -> Text:
+    section, klass, subclass, main_group, subgroup = match.groups()
+    code = f"{section}{klass}{subclass}"
+    if main_group is None:
+        return code
+    return f"{code}{int(main_group)}/{subgroup or '00'}"
+
+
+def normalize_ipc(code: Text) -> Optional[Text]:
+    """IPC 코드 1개를 "H01M10/0525" 형식으로 정규화 (IPC 형식이 아니면 None)"""
+    match = IPC_PATTERN.search(code.upper())
+    return _format_ipc(match) if match else None
+
+
+def parse_ipcs(value) -> list[Text]:
+    """metadata.ipcs 값(문자열 혹은 리스트)에서 정규화된 IPC 코드 목록 추출 (순서 유지, 중복 제거)"""
+    if value is None:
+        return []
+    if not isinstance(value, str):
+        value = " ".join(str(v) for v in value)
+    return list(dict.fromkeys(_format_ipc(match) for match in IPC_PATTERN.finditer(value.upper())))
+
+
+def truncate_ipc(code: Text, level: Text = "subgroup") -> Text:
+    """정규화된 IPC 코드를 계층(level)까지 자름"""
+    if level == "section":
+        return code[:1]
+    if level == "class":
+        return code[:3]
+    if level == "subclass" or len(code) <= 4:
+        return code[:4]
+    if level == "group":
+        return code.split("/")[0] + "/00"
+    if level == "subgroup":
+        return code
+    raise ValueError(f"level 은 {IPC_LEVELS} 중 하나여야 합니다: {level}")
+
+
+def build_ipc_network(ipcs_values: Iterable, level: Text = "subclass", max_nodes: int = 100) -> dict:
+    """문서별 IPC 목록으로 IPC 동시 출현 네트워크 계산
+
+    코드별 출현 문서 수를 먼저 세어 상위 max_nodes 개 코드만 남긴 뒤, 남은 코드로 문서 x 코드 희소 출현 행렬 M 을 만든다.
+    노드 크기는 열 합(코드가 나온 문서 수), 엣지 가중치는 M^T M 의 상삼각(두 코드가 함께 나온 문서 수)으로 한 번에 계산하므로
+    메모리는 hit 수 x 전체 IPC 어휘가 아니라 출현 항목 수와 max_nodes^2 에 비례한다.
+
+    Args:
+        ipcs_values (Iterable): 문서별 metadata.ipcs 값
+        level (str): IPC 계층 (section, class, subclass, group, subgroup)
+        max_nodes (int): 최대 노드 수
+
+    Returns:
+        dict: {"level", "docCount", "nodes": [{"id", "count"}], "edges": [{"source", "target", "weight"}]}
+    """
+    from scipy.sparse import csr_matrix
+
+    vocab: dict[Text, int] = {}
+    rows, cols = [], []
+    doc_count = 0
+    for value in ipcs_values:
+        codes = {truncate_ipc(code, level) for code in parse_ipcs(value)}
+        if not codes:
+            continue
+        for code in codes:
+            rows.append(doc_count)
+            cols.append(vocab.setdefault(code, len(vocab)))
+        doc_count += 1
+    network = {"level": level, "docCount": doc_count, "nodes": [], "edges": []}
+    if not vocab:
+        return network
+
+    rows, cols = np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)
+    codes = np.array(list(vocab))
+    counts = np.bincount(cols, minlength=len(vocab))
+    # 출현 문서 수 내림차순, 같으면 코드 오름차순
+    keep = np.lexsort((codes, -counts))[:max_nodes]
+    codes, counts = codes[keep], counts[keep]
+    position = np.full(len(vocab), -1, dtype=np.int64)
+    position[keep] = np.arange(len(keep))
+    kept = position[cols] >= 0
+    incidence = csr_matrix(
+        (np.ones(int(kept.sum()), dtype=np.float32), (rows[kept], position[cols[kept]])),
+        shape=(doc_count, len(keep)),
+    )
+
+    co_occurrence = (incidence.T @ incidence).toarray()
+    sources, targets = np.triu_indices(len(codes), k=1)
+    weights = co_occurrence[sources, targets]
+    nonzero = weights > 0
+    sources, targets, weights = sources[nonzero], targets[nonzero], weights[nonzero]
+    order = np.argsort(-weights, kind="stable")
+
+    network["nodes"] = [{"id": str(code), "count": int(count)} for code, count in zip(codes, counts)]
+    network["edges"] = [
+        {"source": str(codes[sources[i]]), "target": str(codes[targets[i]]), "weight": int(weights[i])}
+        for i in order
+    ]
+    return network
@@ -0,0 +1,296 @@
+"""kNN num_candidates 자동 튜닝 (recall@k / 지연 시간 측정 -> 필터 선택도별 정책 테이블)
+
+tune: 질의 집합을 재생하면서 질의마다
+    - 필터 선택도 (필터에 맞는 문서 수 / 전체 문서 수, count API)
+    - 정답: 필터 + script_score cosine 으로 구한 정확한 top-k
+    - num_candidates = k * factor (CANDIDATE_FACTORS) 별 kNN recall@k 와 평균 지연 시간
+을 측정하고, 선택도 구간마다 목표 recall 을 만족하는 가장 작은 factor 를 정책으로 저장한다.
+
+런타임: CandidatePolicy 가 정책 파일을 읽고, SelectivityEstimator(인덱스 표본 문서에 필터를 로컬 평가)로
+질의 필터의 선택도를 추정해 질의별 num_candidates 를 정한다. 필터가 좁을수록 HNSW 탐색에서 후보가
+걸러지므로 더 많은 후보가 필요하다.
+
+Usage:
+    python -m app.common.patent.base.knn_autotuner tune --sizes 10 50 --output app/common/patent/resources/knn_candidate_policy.json
+    python -m app.common.patent.base.knn_autotuner tune --queries-file labeled_queries.jsonl --target-recall 0.98
+    python -m app.common.patent.base.knn_autotuner show
+"""
+import json
+import time
+import asyncio
+import argparse
+from typing import Optional, Text
+
+import numpy as np
+
+from app.config.settings import KNN_CANDIDATE_POLICY_SETTINGS
+from app.common.patent.base.local_filter import matches
+
+# num_candidates / k 후보
+CANDIDATE_FACTORS = [1, 2, 3, 5, 10, 20, 50]
+# 선택도 구간 상한 (필터에 맞는 문서 비율)
+SELECTIVITY_BUCKETS = [0.001, 0.01, 0.05, 0.2, 1.0]
+# 정책이 없는 구간에 쓰는 factor (기존 고정값 size * 5)
+DEFAULT_FACTOR = 5
+MAX_NUM_CANDIDATES = 10000
+# 튜닝 기본 질의 (필터 없음 ~ 좁은 날짜 / 권리자 조건)
+TUNE_QUERIES = [
+    "이차전지 양극재 특허",
+    "자율주행 라이다 센서 특허",
+    "최근 5년간 출원된 전고체 배터리 특허",
+    "2023년 상반기에 출원된 이차전지 양극재 특허",
+    "2020년 이후 삼성전자가 출원한 반도체 패키징 특허",
+    "2015년부터 2018년까지 출원된 수소 연료전지 특허",
+    "LG에너지솔루션이 출원한 배터리 관리 시스템 특허",
+    "2024년에 출원된 OLED 디스플레이 특허",
+]
+
+
+def selectivity_bucket(selectivity: float) -> float:
+    for bound in SELECTIVITY_BUCKETS:
+        if selectivity <= bound:
+            return bound
+    return SELECTIVITY_BUCKETS[-1]
+
+
+class SelectivityEstimator:
+    """인덱스 표본 문서에 ES 필터를 로컬 평가(local_filter)해서 선택도 추정
+
+    표본은 처음 사용할 때 random_score 로 한 번 가져온다. 필터에 로컬에서 지원하지 않는 절이 있으면 None 을 반환한다.
+    """
+
+    def __init__(self, sample_size: int = KNN_CANDIDATE_POLICY_SETTINGS["sample_size"]):
+        self.sample_size = sample_size
+        self.sample: Optional[list[dict]] = None
+        self._loading: Optional[asyncio.Task] = None
+
+    def set_sample(self, sources: list[dict]):
+        self.sample = [{"text": source.get("text"), **source.get("metadata", {})} for source in sources]
+
+    async def _load(self, es, index: Text):
+        result = await es.search(
+            index=index,
+            size=self.sample_size,
+            query={"function_score": {"random_score": {"seed": 42, "field": "_seq_no"}}},
+            source_includes=["text", "metadata.*"],
+            filter_path=["hits.hits._source"],
+        )
+        self.set_sample([hit["_source"] for hit in result.get("hits", {}).get("hits", [])])
+
+    async def load(self, es, index: Text):
+        if self.sample is not None:
+            return
+        if self._loading is None or self._loading.done():
+            self._loading = asyncio.ensure_future(self._load(es, index))
+        await asyncio.shield(self._loading)
+
+    def estimate(self, es_filter) -> Optional[float]:
+        if not self.sample:
+            return None
+        if es_filter is None:
+            return 1.0
+
+        def get_value(row, field):
+            return self.sample[row].get(field)
+
+        try:
+            matched = sum(matches(es_filter, get_value, row) for row in range(len(self.sample)))
+        except ValueError:
+            return None
+        # 표본에서 하나도 맞지 않으면 표본 1개 미만의 비율로 본다
+        return max(matched, 0.5) / len(self.sample)
+
+
+class CandidatePolicy:
+    """선택도 구간별 num_candidates factor 정책 (tune 결과 파일)"""
+
+    def __init__(self, policy: dict, estimator: Optional[SelectivityEstimator] = None):
+        self.policy = policy
+        self.factors = {bucket["maxSelectivity"]: bucket["factor"] for bucket in policy["buckets"]}
+        self.estimator = estimator or SelectivityEstimator()
+        self.tuned = 0
+        self.fallbacks = 0
+        self.total_candidates = 0
+
+    @classmethod
+    def load(cls, path: Text = KNN_CANDIDATE_POLICY_SETTINGS["path"]) -> "CandidatePolicy":
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def factor(self, selectivity: Optional[float]) -> float:
+        if selectivity is None:
+            return DEFAULT_FACTOR
+        return self.factors.get(selectivity_bucket(selectivity), DEFAULT_FACTOR)
+
+    def num_candidates(self, size: int, selectivity: Optional[float]) -> int:
+        return int(min(MAX_NUM_CANDIDATES, max(size, size * self.factor(selectivity))))
+
+    async def tune(self, es, index: Text, es_knn: dict) -> dict:
+        """kNN 절의 num_candidates 를 필터 선택도에 맞게 바꾼 kNN 절 (원본은 수정하지 않음)"""
+        await self.estimator.load(es, index)
+        selectivity = await asyncio.to_thread(self.estimator.estimate, es_knn.get("filter"))
+        if selectivity is None:
+            self.fallbacks += 1
+        num_candidates = self.num_candidates(es_knn["k"], selectivity)
+        self.tuned += 1
+        self.total_candidates += num_candidates
+        return {**es_knn, "num_candidates": num_candidates}
+
+    def stats(self) -> dict:
+        return {
+            "targetRecall": self.policy.get("targetRecall"),
+            "factors": self.factors,
+            "sampleSize": len(self.estimator.sample) if self.estimator.sample is not None else None,
+            "tuned": self.tuned,
+            "fallbacks": self.fallbacks,
+            "avgNumCandidates": round(self.total_candidates / self.tuned, 1) if self.tuned else None,
+        }
+
+
+def _recall(hits: list[Text], exact: list[Text]) -> float:
+    return len(set(hits) & set(exact)) / len(exact) if exact else 1.0
+
+
+def build_policy(rows: list[dict], target_recall: float) -> dict:
+    """질의별 측정 결과로 선택도 구간별 factor 선택 (목표 recall 을 만족하는 가장 작은 factor, 없으면 recall 최대)"""
+    buckets = []
+    for bound in SELECTIVITY_BUCKETS:
+        bucket_rows = [row for row in rows if selectivity_bucket(row["selectivity"]) == bound]
+        if not bucket_rows:
+            continue
+        candidates = []
+        for factor in CANDIDATE_FACTORS:
+            measured = [row["factors"][str(factor)] for row in bucket_rows]
+            candidates.append({
+                "factor": factor,
+                "recall": round(float(np.mean([m["recall"] for m in measured])), 4),
+                "avgMs": round(float(np.mean([m["avgMs"] for m in measured])), 2),
+            })
+        passed = [c for c in candidates if c["recall"] >= target_recall]
+        chosen = passed[0] if passed else max(candidates, key=lambda c: (c["recall"], -c["factor"]))
+        buckets.append({
+            "maxSelectivity": bound,
+            "queries": len(bucket_rows),
+            **chosen,
+            "measured": candidates,
+        })
+    return {
+        "targetRecall": target_recall,
+        "createdAt": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "queries": len(rows),
+        "buckets": buckets,
+    }
+
+
+def load_queries(path: Optional[Text]) -> list[dict]:
+    """튜닝 질의 ({"query"} 자연어 질의 혹은 {"keywords", "filter"} 변환 결과, JSONL)"""
+    if path is None:
+        return [{"query": query} for query in TUNE_QUERIES]
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+async def tune(
+    queries: list[dict],
+    sizes: list[int],
+    repeat: int = 3,
+    target_recall: float = 0.95,
+    index: Optional[Text] = None,
+) -> dict:
+    from app.common.patent.base.es_client import es_client_pool
+    from app.common.patent.patent_utils.patent_search_utils import (
+        PatentSearchUtils,
+        INDEX_NAME,
+        VECTOR_FIELD,
+        HIT_FILTER_PATH,
+    )
+
+    index = index or INDEX_NAME
+    utils = PatentSearchUtils()
+    estimator = SelectivityEstimator()
+    rows = []
+    async with es_client_pool.acquire() as es:
+        total = (await es.count(index=index))["count"]
+        await estimator.load(es, index)
+        for item in queries:
+            if "filter" in item:
+                result = {"keywords": item["keywords"], "filter": [item["filter"]]}
+            else:
+                result = await utils.translate_nl_query(item["query"])
+                if result["status"] != "success":
+                    print(json.dumps({"query": item["query"], "error": result.get("message")}, ensure_ascii=False))
+                    continue
+            vector = await utils.encode_query(result["keywords"])
+            base_knn = utils._get_nl_knn(vector, result, max(sizes))
+            es_filter = base_knn["filter"]
+            matched = (await es.count(index=index, query=es_filter))["count"]
+            if matched == 0:
+                continue
+            selectivity = matched / total
+            for size in sizes:
+                exact = await es.search(
+                    index=index,
+                    size=size,
+                    query={
+                        "script_score": {
+                            "query": {"bool": {"filter": es_filter}},
+                            "script": {
+                                "source": f"cosineSimilarity(params.query_vector, '{VECTOR_FIELD}') + 1.0",
+                                "params": {"query_vector": list(map(float, vector))},
+                            },
+                        }
+                    },
+                    filter_path=["hits.hits._id"],
+                )
+                exact_ids = [hit["_id"] for hit in exact.get("hits", {}).get("hits", [])]
+                row = {
+                    "query": item.get("query") or result["keywords"],
+                    "size": size,
+                    "matched": matched,
+                    "selectivity": selectivity,
+                    "estimatedSelectivity": estimator.estimate(es_filter),
+                    "factors": {},
+                }
+                for factor in CANDIDATE_FACTORS:
+                    es_knn = {**base_knn, "k": size, "num_candidates": min(MAX_NUM_CANDIDATES, size * factor)}
+                    elapsed, hits = 0.0, []
+                    for _ in range(repeat):
+                        start = time.perf_counter()
+                        response = await es.search(
+                            index=index, filter_path=HIT_FILTER_PATH, **utils._get_knn_request(es, es_knn, size)
+                        )
+                        elapsed += time.perf_counter() - start
+                        hits = [hit["_id"] for hit in response.get("hits", {}).get("hits", [])]
+                    row["factors"][str(factor)] = {
+                        "recall": round(_recall(hits, exact_ids), 4),
+                        "avgMs": round(elapsed / repeat * 1000, 2),
+                    }
+                print(json.dumps(row, ensure_ascii=False), flush=True)
+                rows.append(row)
+    await es_client_pool.close()
+    policy = build_policy(rows, target_recall)
+    policy.update({"index": index, "sizes": sizes, "totalDocs": total})
+    return policy
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="kNN num_candidates 튜닝 (필터 선택도별 recall@k / 지연 시간)")
+    parser.add_argument("command", choices=["tune", "show"])
+    parser.add_argument("--queries-file", help="튜닝 질의 JSONL (생략 시 기본 질의)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--target-recall", type=float, default=0.95)
+    parser.add_argument("--index", help="대상 인덱스 (생략 시 서비스 인덱스)")
+    parser.add_argument("--output", default=KNN_CANDIDATE_POLICY_SETTINGS["path"])
+    args = parser.parse_args()
+
+    if args.command == "show":
+        policy = CandidatePolicy.load(args.output).policy
+    else:
+        policy = asyncio.run(
+            tune(load_queries(args.queries_file), args.sizes, args.repeat, args.target_recall, args.index)
+        )
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(policy, f, ensure_ascii=False, indent=4)
+    for bucket in policy["buckets"]:
+        print(json.dumps({key: value for key, value in bucket.items() if key != "measured"}, ensure_ascii=False))
@@ -0,0 +1,121 @@
+"""Elasticsearch 필터 DSL 의 로컬 평가기
+
+로컬 벡터 인덱스에서 NL 변환기(ElasticsearchTranslator)가 만든 필터를 그대로 적용하기 위해 사용한다.
+지원 범위: bool(must / filter / should / must_not), range(날짜), match / match_phrase / match_phrase_prefix(텍스트 포함 여부),
+term(일치).
+match 의 fuzziness 는 지원하지 않으며, 질의 토큰 중 하나라도 필드 값에 포함되면 일치로 본다.
+"""
+import datetime
+from typing import Any, Callable
+
+from app.config.custom_errors import UnsupportedFilterError
+
+# 행 번호와 필드명을 받아 값을 반환하는 함수
+ValueGetter = Callable[[int, str], Any]
+
+
+def date_to_int(value: str) -> int:
+    """YYYY-MM-DD 문자열을 YYYYMMDD 정수로 변환 (비교용)"""
+    return int(datetime.date.fromisoformat(value[:10]).strftime("%Y%m%d"))
+
+
+def _field_name(field: str) -> str:
+    field = field[len("metadata."):] if field.startswith("metadata.") else field
+    return field[: -len(".keyword")] if field.endswith(".keyword") else field
+
+
+def _query_value(value) -> str:
+    return value["query"] if isinstance(value, dict) else value
+
+
+def _as_text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, list):
+        return " ".join(str(v) for v in value)
+    return str(value)
+
+
+def _match(get_value: ValueGetter, row: int, spec: dict) -> bool:
+    field, value = next(iter(spec.items()))
+    text = _as_text(get_value(row, _field_name(field))).lower()
+    tokens = str(_query_value(value)).lower().split()
+    return any(token in text for token in tokens)
+
+
+def _match_phrase(get_value: ValueGetter, row: int, spec: dict) -> bool:
+    field, value = next(iter(spec.items()))
+    text = _as_text(get_value(row, _field_name(field))).lower()
+    return str(_query_value(value)).lower() in text
+
+
+def _term(get_value: ValueGetter, row: int, spec: dict) -> bool:
+    field, value = next(iter(spec.items()))
+    return get_value(row, _field_name(field)) == (value["value"] if isinstance(value, dict) else value)
+
+
+def _range(get_value: ValueGetter, row: int, spec: dict) -> bool:
+    field, bounds = next(iter(spec.items()))
+    value = get_value(row, _field_name(field))
+    if value is None or value == "":
+        return False
+    value = date_to_int(value) if isinstance(value, str) else value
+    for op, bound in bounds.items():
+        bound = date_to_int(bound) if isinstance(bound, str) else bound
+        if op == "gte" and not value >= bound:
+            return False
+        if op == "gt" and not value > bound:
+            return False
+        if op == "lte" and not value <= bound:
+            return False
+        if op == "lt" and not value < bound:
+            return False
+    return True
+
+
+def _bool(get_value: ValueGetter, row: int, spec: dict) -> bool:
+    required = _as_list(spec.get("must")) + _as_list(spec.get("filter"))
+    if not all(matches(c, get_value, row) for c in required):
+        return False
+    if any(matches(c, get_value, row) for c in _as_list(spec.get("must_not"))):
+        return False
+    should = _as_list(spec.get("should"))
+    # must/filter 가 있으면 should 는 점수에만 영향을 준다 (minimum_should_match 기본값 0)
+    if should and not required:
+        return any(matches(c, get_value, row) for c in should)
+    return True
+
+
+def _as_list(value) -> list:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+CLAUSES = {
+    "bool": _bool,
+    "range": _range,
+    "match": _match,
+    "match_phrase": _match_phrase,
+    "match_phrase_prefix": _match_phrase,
+    "term": _term,
+}
+
+
+def matches(es_filter, get_value: ValueGetter, row: int) -> bool:
+    """행이 ES 필터 조건을 만족하는지 평가
+
+    Args:
+        es_filter (dict | list): ES 필터 (리스트이면 모두 만족해야 함)
+        get_value (ValueGetter): 행 번호, 필드명으로 값을 조회하는 함수
+        row (int): 행 번호
+
+    Raises:
+        UnsupportedFilterError: 지원하지 않는 절이 포함된 경우
+    """
+    if isinstance(es_filter, list):
+        return all(matches(c, get_value, row) for c in es_filter)
+    clause, spec = next(iter(es_filter.items()))
+    if clause not in CLAUSES:
+        raise UnsupportedFilterError(f"지원하지 않는 필터 절입니다: {clause}")
+    return CLAUSES[clause](get_value, row, spec)
@@ -0,0 +1,462 @@
+"""로컬(프로세스 내) 특허 벡터 검색 백엔드
+
+Elastic Cloud kNN 대신 사용할 수 있는 IVF(inverted file) 벡터 인덱스와 컬럼 단위 메타데이터 저장소로,
+모든 파일은 디스크에서 memory-map 으로 읽는다. AsyncElasticsearch.search 와 같은 형태의 결과를 반환하므로
+PatentSearchUtils 에서 ES 클라이언트 대신 그대로 사용할 수 있다.
+
+인덱스 디렉토리 구성:
+    manifest.json           문서 수, 차원, 리스트 수, 컬럼 목록
+    centroids.npy           (nlist, dim) 리스트 중심 벡터
+    list_offsets.npy        (nlist + 1,) 리스트별 행 범위 (행은 리스트 순서로 정렬되어 저장)
+    vectors.npy             (N, dim) L2 정규화된 float32 벡터
+    vectors_int8.npy        (N, dim) int8 양자화 벡터 (int8_scale.npy: 차원별 scale)
+    vectors_binary.npy      (N, dim / 8) 부호 비트 벡터
+    {column}.offsets.npy    (N + 1,) 컬럼 값의 바이트 범위
+    {column}.data.bin       컬럼 값(JSON) 바이트
+
+Usage:
+    python -m app.common.patent.base.local_vector_index build --from-es --output /opt/patent_index
+    python -m app.common.patent.base.local_vector_index build --from-jsonl patents.jsonl --output /opt/patent_index
+    python -m app.common.patent.base.local_vector_index quantize --output /opt/patent_index   # 기존 인덱스에 양자화 벡터 추가
+    python -m app.common.patent.base.local_vector_index info --output /opt/patent_index
+"""
+import os
+import json
+import math
+import time
+import shutil
+import asyncio
+import argparse
+import datetime
+from typing import Iterator, Optional, Text
+
+import numpy as np
+
+from app.config.settings import (
+    LOCAL_INDEX_DIR,
+    LOCAL_INDEX_NPROBE,
+    LOCAL_INDEX_QUANTIZATION,
+    VECTOR_RESCORE_FACTOR,
+)
+from app.config.custom_errors import UnsupportedFilterError
+from app.common.patent.base.local_filter import matches
+from app.common.patent.base.vector_quantization import (
+    compute_int8_scale,
+    quantize_int8,
+    quantize_binary,
+    int8_scores,
+    binary_scores,
+)
+
+MANIFEST_FILE = "manifest.json"
+ID_COLUMN = "_id"
+TEXT_COLUMN = "text"
+# 로컬 인덱스에 저장하는 메타데이터 컬럼 (응답 컬럼 + 필터에 쓰이는 텍스트 컬럼)
+METADATA_COLUMNS = [
+    "applicate_number",
+    "applicate_date",
+    "applicate_nation",
+    "invention_title",
+    "ipcs",
+    "register_number",
+    "lrh_name",
+    "abstract",
+    "claim_text",
+]
+ASSIGN_BATCH_SIZE = 65536
+
+
+class ColumnWriter:
+    """컬럼 값을 JSON 으로 직렬화해서 순서대로 기록"""
+
+    def __init__(self, index_dir: Text, name: Text):
+        self.data_path = os.path.join(index_dir, f"{name}.data.bin")
+        self.offsets_path = os.path.join(index_dir, f"{name}.offsets.npy")
+        self.file = open(self.data_path, "wb")
+        self.offsets = [0]
+
+    def append(self, value):
+        data = json.dumps(value, ensure_ascii=False).encode("utf-8")
+        self.file.write(data)
+        self.offsets.append(self.offsets[-1] + len(data))
+
+    def close(self):
+        self.file.close()
+        np.save(self.offsets_path, np.asarray(self.offsets, dtype=np.int64))
+
+
+class Column:
+    """memory-map 으로 읽는 컬럼"""
+
+    def __init__(self, index_dir: Text, name: Text):
+        self.offsets = np.load(os.path.join(index_dir, f"{name}.offsets.npy"), mmap_mode="r")
+        data_path = os.path.join(index_dir, f"{name}.data.bin")
+        # 빈 파일은 memmap 할 수 없음
+        self.data = np.memmap(data_path, dtype=np.uint8, mode="r") if os.path.getsize(data_path) else b""
+
+    def __getitem__(self, row: int):
+        start, end = int(self.offsets[row]), int(self.offsets[row + 1])
+        return json.loads(bytes(self.data[start:end]))
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    return vectors / (np.linalg.norm(vectors, axis=-1, keepdims=True) + 1e-12)
+
+
+def assign_lists(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """각 벡터를 내적이 가장 큰 중심 벡터의 리스트에 할당"""
+    assign = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_BATCH_SIZE):
+        batch = np.asarray(vectors[start: start + ASSIGN_BATCH_SIZE], dtype=np.float32)
+        assign[start: start + len(batch)] = np.argmax(batch @ centroids.T, axis=1)
+    return assign
+
+
+def train_centroids(
+    vectors: np.ndarray, nlist: int, sample_size: int = 100000, iterations: int = 10, seed: int = 42
+) -> np.ndarray:
+    """spherical k-means 로 리스트 중심 벡터 학습 (표본 사용)"""
+    rng = np.random.default_rng(seed)
+    sample_rows = np.sort(rng.choice(len(vectors), min(len(vectors), sample_size), replace=False))
+    sample = np.asarray(vectors[sample_rows], dtype=np.float32)
+    centroids = sample[rng.choice(len(sample), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assign = assign_lists(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, sample)
+        counts = np.bincount(assign, minlength=nlist)
+        empty = counts == 0
+        # 빈 리스트는 임의의 표본으로 다시 초기화
+        sums[empty] = sample[rng.integers(len(sample), size=int(empty.sum()))]
+        centroids = normalize_rows(sums)
+    return centroids
+
+
+def write_quantized_vectors(index_dir: Text):
+    """float 벡터로 int8 / binary 양자화 벡터 파일 생성"""
+    vectors = np.load(os.path.join(index_dir, "vectors.npy"), mmap_mode="r")
+    count, dim = vectors.shape
+    scale = compute_int8_scale(vectors)
+    np.save(os.path.join(index_dir, "int8_scale.npy"), scale)
+    int8_codes = np.lib.format.open_memmap(
+        os.path.join(index_dir, "vectors_int8.npy"), mode="w+", dtype=np.int8, shape=(count, dim)
+    )
+    binary_codes = np.lib.format.open_memmap(
+        os.path.join(index_dir, "vectors_binary.npy"), mode="w+", dtype=np.uint8, shape=(count, dim // 8)
+    )
+    for start in range(0, count, ASSIGN_BATCH_SIZE):
+        chunk = np.asarray(vectors[start: start + ASSIGN_BATCH_SIZE], dtype=np.float32)
+        int8_codes[start: start + len(chunk)] = quantize_int8(chunk, scale)
+        binary_codes[start: start + len(chunk)] = quantize_binary(chunk)
+    int8_codes.flush()
+    binary_codes.flush()
+
+
+class LocalIndexBuilder:
+    """문서를 순서대로 받아 임시 파일에 기록한 뒤, IVF 리스트 순서로 재정렬해서 인덱스를 생성"""
+
+    def __init__(self, output_dir: Text, dim: int = 1024):
+        self.output_dir = output_dir
+        self.tmp_dir = output_dir + ".tmp"
+        self.raw_dir = os.path.join(self.tmp_dir, "raw")
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+        os.makedirs(self.raw_dir)
+        self.dim = dim
+        self.count = 0
+        self.vector_file = open(os.path.join(self.raw_dir, "vectors.f32"), "wb")
+        self.columns = [ID_COLUMN, TEXT_COLUMN] + METADATA_COLUMNS
+        self.writers = {name: ColumnWriter(self.raw_dir, name) for name in self.columns}
+
+    def add(self, doc_id: Text, vector, text: Optional[Text], metadata: dict):
+        self.vector_file.write(normalize_rows(np.asarray(vector).reshape(self.dim)).tobytes())
+        self.writers[ID_COLUMN].append(doc_id)
+        self.writers[TEXT_COLUMN].append(text)
+        for name in METADATA_COLUMNS:
+            self.writers[name].append(metadata.get(name))
+        self.count += 1
+
+    def finalize(self, nlist: Optional[int] = None, source: Text = "") -> Text:
+        """IVF 리스트 학습, 행 재정렬 후 인덱스 디렉토리로 교체
+
+        Returns:
+            인덱스 디렉토리 경로
+        """
+        self.vector_file.close()
+        for writer in self.writers.values():
+            writer.close()
+        if self.count == 0:
+            raise ValueError("인덱스에 추가된 문서가 없습니다.")
+
+        raw_vectors = np.memmap(
+            os.path.join(self.raw_dir, "vectors.f32"), dtype=np.float32, mode="r", shape=(self.count, self.dim)
+        )
+        nlist = min(self.count, nlist or max(1, int(4 * math.sqrt(self.count))))
+        centroids = train_centroids(raw_vectors, nlist)
+        assign = assign_lists(raw_vectors, centroids)
+        order = np.argsort(assign, kind="stable")
+        list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=nlist))]).astype(np.int64)
+
+        np.save(os.path.join(self.tmp_dir, "centroids.npy"), centroids)
+        np.save(os.path.join(self.tmp_dir, "list_offsets.npy"), list_offsets)
+        vectors = np.lib.format.open_memmap(
+            os.path.join(self.tmp_dir, "vectors.npy"), mode="w+", dtype=np.float32, shape=(self.count, self.dim)
+        )
+        for start in range(0, self.count, ASSIGN_BATCH_SIZE):
+            vectors[start: start + ASSIGN_BATCH_SIZE] = raw_vectors[order[start: start + ASSIGN_BATCH_SIZE]]
+        vectors.flush()
+        del vectors, raw_vectors
+        write_quantized_vectors(self.tmp_dir)
+
+        for name in self.columns:
+            column = Column(self.raw_dir, name)
+            writer = ColumnWriter(self.tmp_dir, name)
+            for row in order:
+                writer.append(column[int(row)])
+            writer.close()
+
+        manifest = {
+            "count": self.count,
+            "dim": self.dim,
+            "nlist": nlist,
+            "columns": self.columns,
+            "source": source,
+            "created_at": datetime.datetime.now().isoformat(),
+        }
+        with open(os.path.join(self.tmp_dir, MANIFEST_FILE), "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=4)
+
+        # 완성된 인덱스만 서빙 경로에 노출되도록 마지막에 교체
+        shutil.rmtree(self.raw_dir)
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+        os.rename(self.tmp_dir, self.output_dir)
+        return self.output_dir
+
+
+class LocalVectorIndex:
+    """memory-map 기반 IVF 벡터 인덱스 (AsyncElasticsearch.search 호환 인터페이스)
+
+    quantization 이 int8 / binary 이면 후보 점수는 양자화 벡터로 계산하고,
+    필터를 통과한 상위 k * rescore_factor 개만 float 벡터로 다시 점수를 계산한다.
+    """
+
+    def __init__(
+        self,
+        index_dir: Text = LOCAL_INDEX_DIR,
+        nprobe: int = LOCAL_INDEX_NPROBE,
+        quantization: Text = LOCAL_INDEX_QUANTIZATION,
+        rescore_factor: int = VECTOR_RESCORE_FACTOR,
+    ):
+        with open(os.path.join(index_dir, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        self.index_dir = index_dir
+        self.nprobe = nprobe
+        self.quantization = quantization
+        self.rescore_factor = rescore_factor
+        self.centroids = np.load(os.path.join(index_dir, "centroids.npy"))
+        self.list_offsets = np.load(os.path.join(index_dir, "list_offsets.npy"))
+        self.vectors = np.load(os.path.join(index_dir, "vectors.npy"), mmap_mode="r")
+        self.codes = None
+        if quantization == "int8":
+            self.codes = np.load(os.path.join(index_dir, "vectors_int8.npy"), mmap_mode="r")
+            self.int8_scale = np.load(os.path.join(index_dir, "int8_scale.npy"))
+        elif quantization == "binary":
+            self.codes = np.load(os.path.join(index_dir, "vectors_binary.npy"), mmap_mode="r")
+        elif quantization != "none":
+            raise ValueError(f"지원하지 않는 양자화 방식입니다: {quantization}")
+        self.columns = {name: Column(index_dir, name) for name in self.manifest["columns"]}
+        self.avg_list_size = self.manifest["count"] / self.manifest["nlist"]
+        self.total_searches = 0
+        self.total_time = 0.0
+
+    def get_value(self, row: int, field: Text):
+        column = self.columns.get(field)
+        return column[row] if column is not None else None
+
+    def filter_value(self, row: int, field: Text):
+        """필터 평가용 값 조회 (인덱스에 없는 필드로 필터링하면 모든 문서가 제외되므로 명시적으로 거부)"""
+        column = self.columns.get(field)
+        if column is None:
+            raise UnsupportedFilterError(f"로컬 인덱스에 없는 필터 필드입니다: {field}")
+        return column[row]
+
+    def _score_lists(self, lists: np.ndarray, query_vector: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """리스트에 속한 행의 점수 (양자화 사용 시 근사 점수)"""
+        rows = [np.arange(self.list_offsets[i], self.list_offsets[i + 1]) for i in lists]
+        rows = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+        if not rows.size:
+            return rows, np.empty(0, dtype=np.float32)
+        store = self.vectors if self.codes is None else self.codes
+        block = np.concatenate([store[self.list_offsets[i]: self.list_offsets[i + 1]] for i in lists])
+        if self.quantization == "int8":
+            return rows, int8_scores(block, query_vector, self.int8_scale)
+        if self.quantization == "binary":
+            return rows, binary_scores(block, quantize_binary(query_vector), self.vectors.shape[1])
+        return rows, block @ query_vector
+
+    def _rescore(self, candidates: list[tuple[int, float]], query_vector: np.ndarray, k: int) -> list:
+        """근사 점수 후보를 float 벡터로 다시 점수 계산"""
+        rows = np.array([row for row, _ in candidates], dtype=np.int64)
+        order = np.argsort(rows)
+        scores = np.empty(len(rows), dtype=np.float32)
+        # memmap 은 정렬된 행 순서로 읽는 것이 빠름
+        scores[order] = np.asarray(self.vectors[rows[order]], dtype=np.float32) @ query_vector
+        top = np.argsort(-scores)[:k]
+        return [(int(rows[i]), float(scores[i])) for i in top]
+
+    def knn(self, query_vector, k: int, num_candidates: int, es_filter=None) -> list[tuple[int, float]]:
+        """kNN 검색
+
+        중심 벡터와 가까운 리스트부터 탐색하고, 필터를 만족하는 결과가 k 개 미만이면 탐색 리스트를 늘린다.
+
+        Returns:
+            list[tuple[int, float]]: (행 번호, cosine 유사도)
+        """
+        query_vector = normalize_rows(query_vector).reshape(-1)
+        limit = k if self.codes is None else k * self.rescore_factor
+        nlist = len(self.centroids)
+        order = np.argsort(-(self.centroids @ query_vector))
+        nprobe = min(nlist, max(self.nprobe, math.ceil(num_candidates / max(self.avg_list_size, 1))))
+        probed = 0
+        rows, scores = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        checked = {}
+        while True:
+            new_rows, new_scores = self._score_lists(order[probed:nprobe], query_vector)
+            rows, scores = np.concatenate([rows, new_rows]), np.concatenate([scores, new_scores])
+            probed = nprobe
+
+            results = []
+            for i in np.argsort(-scores):
+                row = int(rows[i])
+                if es_filter is not None:
+                    if row not in checked:
+                        checked[row] = matches(es_filter, self.filter_value, row)
+                    if not checked[row]:
+                        continue
+                results.append((row, float(scores[i])))
+                if len(results) == limit:
+                    break
+            if len(results) == limit or probed >= nlist:
+                break
+            nprobe = min(nlist, nprobe * 2)
+        if self.codes is not None and results:
+            return self._rescore(results, query_vector, k)
+        return results
+
+    def _search(self, knn: dict, size: int, source_includes: Optional[list] = None) -> dict:
+        start = time.perf_counter()
+        columns = METADATA_COLUMNS
+        if source_includes is not None:
+            # ES 와 같이 요청한 metadata 필드만 읽는다
+            included = {field[len("metadata."):] for field in source_includes if field.startswith("metadata.")}
+            columns = [name for name in METADATA_COLUMNS if name in included]
+        k = min(knn.get("k", size), size)
+        results = self.knn(knn["query_vector"], k, knn.get("num_candidates", k), knn.get("filter"))
+        hits = []
+        for row, similarity in results:
+            hits.append({
+                "_id": self.get_value(row, ID_COLUMN),
+                # ES cosine similarity 점수와 같은 스케일
+                "_score": (1 + similarity) / 2,
+                "_source": {
+                    "metadata": {name: self.get_value(row, name) for name in columns},
+                },
+            })
+        took = time.perf_counter() - start
+        self.total_searches += 1
+        self.total_time += took
+        return {
+            "took": int(took * 1000),
+            "hits": {"total": {"value": len(hits), "relation": "eq"}, "hits": hits},
+        }
+
+    async def search(
+        self,
+        index: Optional[Text] = None,
+        knn: Optional[dict] = None,
+        size: int = 10,
+        source_includes: Optional[list] = None,
+        **kwargs,
+    ) -> dict:
+        """AsyncElasticsearch.search 와 같은 형식으로 kNN 검색 (이벤트 루프 밖에서 실행, filter_path 등은 무시)"""
+        return await asyncio.to_thread(self._search, knn, size, source_includes)
+
+    def stats(self) -> dict:
+        return {
+            "indexDir": self.index_dir,
+            "count": self.manifest["count"],
+            "nlist": self.manifest["nlist"],
+            "nprobe": self.nprobe,
+            "quantization": self.quantization,
+            "rescoreFactor": self.rescore_factor,
+            "createdAt": self.manifest["created_at"],
+            "searches": self.total_searches,
+            "avgTime": round(self.total_time / self.total_searches, 4) if self.total_searches else None,
+        }
+
+
+def iter_jsonl_docs(path: Text) -> Iterator[tuple]:
+    """JSONL 문서 읽기 (ES 문서 형식 {"embedding", "text", "metadata"} 혹은 검색 hit 형식 {"_id", "_source"})"""
+    with open(path, "r", encoding="utf-8") as f:
+        for i, line in enumerate(f):
+            if not line.strip():
+                continue
+            doc = json.loads(line)
+            source = doc.get("_source", doc)
+            metadata = source.get("metadata", {})
+            doc_id = doc.get("_id") or metadata.get("applicate_number") or str(i)
+            yield doc_id, source["embedding"], source.get("text"), metadata
+
+
+def build_from_jsonl(path: Text, output_dir: Text, nlist: Optional[int] = None, dim: int = 1024) -> Text:
+    builder = LocalIndexBuilder(output_dir, dim)
+    for doc_id, vector, text, metadata in iter_jsonl_docs(path):
+        builder.add(doc_id, vector, text, metadata)
+    return builder.finalize(nlist, source=path)
+
+
+async def build_from_es(index: Text, output_dir: Text, nlist: Optional[int] = None, dim: int = 1024) -> Text:
+    """ES 인덱스 전체를 scroll 로 읽어서 로컬 인덱스 생성"""
+    from elasticsearch.helpers import async_scan
+    from app.common.patent.base.es_client import es_client_pool
+
+    builder = LocalIndexBuilder(output_dir, dim)
+    async with es_client_pool.acquire() as es:
+        async for hit in async_scan(
+            es,
+            index=index,
+            query={"query": {"match_all": {}}},
+            size=1000,
+            source_includes=["embedding", "text", "metadata.*"],
+        ):
+            source = hit["_source"]
+            builder.add(hit["_id"], source["embedding"], source.get("text"), source.get("metadata", {}))
+    await es_client_pool.close()
+    return builder.finalize(nlist, source=f"es:{index}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 특허 벡터 인덱스 생성 / 조회")
+    parser.add_argument("command", choices=["build", "quantize", "info"])
+    parser.add_argument("--from-es", action="store_true", help="ES 인덱스에서 생성")
+    parser.add_argument("--index", help="ES 인덱스 이름 (생략 시 서비스 인덱스)")
+    parser.add_argument("--from-jsonl", help="JSONL 파일에서 생성")
+    parser.add_argument("--output", default=LOCAL_INDEX_DIR)
+    parser.add_argument("--nlist", type=int, help="IVF 리스트 수 (생략 시 4 * sqrt(N))")
+    args = parser.parse_args()
+
+    if args.command == "info":
+        print(json.dumps(LocalVectorIndex(args.output, quantization="none").stats(), ensure_ascii=False, indent=4))
+    elif args.command == "quantize":
+        write_quantized_vectors(args.output)
+    else:
+        start = time.perf_counter()
+        if args.from_jsonl:
+            path = build_from_jsonl(args.from_jsonl, args.output, args.nlist)
+        elif args.from_es:
+            from app.common.patent.patent_utils.patent_search_utils import INDEX_NAME
+
+            path = asyncio.run(build_from_es(args.index or INDEX_NAME, args.output, args.nlist))
+        else:
+            parser.error("--from-es 혹은 --from-jsonl 을 지정해야 합니다.")
+        print(f"{path} ({time.perf_counter() - start:.1f}s)")
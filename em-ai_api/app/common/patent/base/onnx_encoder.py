@@ -0,0 +1,287 @@
+"""BGE-M3 질의 인코더 ONNX Runtime 경로 (int8 dynamic quantization)
+
+특허 검색에는 BGE-M3 의 dense 벡터(CLS 토큰 + L2 정규화)만 사용하므로 dense head 만 ONNX 로 export 하고,
+가중치를 int8 로 동적 양자화해서 fp32 torch 모델 대비 메모리와 질의당 지연시간을 줄인다.
+EMBEDDING_BACKEND=onnx 이면 PatentSearchUtils 가 이 인코더를 사용한다.
+
+Usage:
+    python -m app.common.patent.base.onnx_encoder export               # fp32 export + int8 양자화
+    python -m app.common.patent.base.onnx_encoder verify --k 10        # 기존 인코더 대비 cosine / recall@k
+"""
+import os
+import json
+import time
+import shutil
+import argparse
+import datetime
+from typing import Optional, Text, Union
+
+import numpy as np
+
+from app.config.settings import (
+    ONNX_MODEL_DIR,
+    ONNX_LENGTH_BUCKETS,
+    EMBEDDING_SERVICE_SETTINGS,
+)
+from app.common.core.hf_hub_utils import resolve_model_path
+
+ONNX_MANIFEST_FILE = "onnx_manifest.json"
+FP32_MODEL_FILE = "model_fp32.onnx"
+INT8_MODEL_FILE = "model_int8.onnx"
+MAX_QUERY_LENGTH = 512
+
+# 검증용 고정 질의 셋
+VERIFY_QUERIES = [
+    "뚜껑 선회 라이터",
+    "스마트 웨어러블 기기",
+    "반도체 검사용 초음파 장치",
+    "이차전지 양극재",
+    "리튬 이온 배터리 분리막",
+    "자율주행 차량 라이다 센서",
+    "전기차 무선 충전 패드",
+    "딥러닝 기반 의료 영상 진단",
+    "수소 연료전지 스택",
+    "OLED 디스플레이 봉지 구조",
+    "사용자의 건강 상태를 지속적으로 모니터링하고 분석하는 스마트 웨어러블 기기",
+    (
+        "뚜껑을 선회시켜 점화하는 라이타에 관한 발명으로, 본체 내부에"
+        "가스통과 점화를 위한 압전장치를 구비, 뚜껑을 피봇축을 중심으로 선회시켜 점화된다."
+        "회전식 뚜껑으로 다양한 디자인이 가능하다."
+    ),
+]
+
+
+def get_onnx_model_dir(model_id: Text) -> Text:
+    """모델 아이디별 ONNX 아티팩트 디렉토리 (ex. BAAI/bge-m3 -> ONNX_MODEL_DIR/BAAI--bge-m3)"""
+    return os.path.join(ONNX_MODEL_DIR, model_id.replace("/", "--"))
+
+
+def export_onnx(model_id: Text, quantize: bool = True, opset: int = 14) -> Text:
+    """BGE-M3 dense head 를 ONNX 로 export 하고 int8 동적 양자화
+
+    Args:
+        model_id : 허깅페이스 모델 아이디
+        quantize : True 이면 int8 양자화 모델도 생성
+        opset : ONNX opset 버전
+
+    Returns:
+        아티팩트 디렉토리 경로
+    """
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    class DenseHead(torch.nn.Module):
+        """CLS 토큰 임베딩을 L2 정규화 (FlagEmbedding BGEM3 dense_vecs 와 동일)"""
+
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, attention_mask):
+            hidden = self.model(input_ids=input_ids, attention_mask=attention_mask).last_hidden_state
+            return torch.nn.functional.normalize(hidden[:, 0], dim=-1)
+
+    output_dir = get_onnx_model_dir(model_id)
+    tmp_output_dir = output_dir + ".tmp"
+    shutil.rmtree(tmp_output_dir, ignore_errors=True)
+    os.makedirs(tmp_output_dir)
+
+    model_path = resolve_model_path(model_id)
+    tokenizer = AutoTokenizer.from_pretrained(model_path)
+    model = DenseHead(AutoModel.from_pretrained(model_path)).eval()
+    sample = tokenizer(["반도체 검사용 초음파 장치"], return_tensors="pt")
+
+    # fp32 모델은 2GB 를 넘으므로 가중치를 external data 로 저장
+    fp32_path = os.path.join(tmp_output_dir, FP32_MODEL_FILE)
+    with torch.no_grad():
+        torch.onnx.export(
+            model,
+            (sample["input_ids"], sample["attention_mask"]),
+            fp32_path,
+            input_names=["input_ids", "attention_mask"],
+            output_names=["dense_vecs"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "sequence"},
+                "attention_mask": {0: "batch", 1: "sequence"},
+                "dense_vecs": {0: "batch"},
+            },
+            opset_version=opset,
+        )
+    if quantize:
+        quantize_dynamic(
+            fp32_path,
+            os.path.join(tmp_output_dir, INT8_MODEL_FILE),
+            weight_type=QuantType.QInt8,
+            per_channel=True,
+        )
+
+    tokenizer.save_pretrained(tmp_output_dir)
+    manifest = {
+        "model_id": model_id,
+        "opset": opset,
+        "quantization": "int8-dynamic" if quantize else None,
+        "created_at": datetime.datetime.now().isoformat(),
+    }
+    with open(os.path.join(tmp_output_dir, ONNX_MANIFEST_FILE), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=4)
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.rename(tmp_output_dir, output_dir)
+    return output_dir
+
+
+class OnnxBgeM3Encoder:
+    """ONNX Runtime 으로 BGE-M3 dense 벡터를 계산하는 인코더 (BGEM3FlagModel.encode 와 같은 반환 형식)"""
+
+    def __init__(
+        self,
+        model_dir: Text,
+        quantized: bool = True,
+        length_buckets: list[int] = ONNX_LENGTH_BUCKETS,
+        intra_op_threads: int = EMBEDDING_SERVICE_SETTINGS["intra_op_threads"],
+    ):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        model_file = INT8_MODEL_FILE if quantized else FP32_MODEL_FILE
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads > 0:
+            options.intra_op_num_threads = intra_op_threads
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, model_file), options, providers=["CPUExecutionProvider"]
+        )
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.length_buckets = sorted(b for b in length_buckets if b <= MAX_QUERY_LENGTH)
+
+    def _pad_length(self, longest: int) -> int:
+        """배치 최대 길이 이상인 가장 작은 버킷 (버킷이 없거나 모두 작으면 배치 최대 길이)"""
+        for bucket in self.length_buckets:
+            if bucket >= longest:
+                return bucket
+        return longest
+
+    def encode(self, sentences: Union[Text, list[Text]], batch_size: int = 32, **kwargs) -> dict:
+        """질의 인코딩
+
+        Args:
+            sentences : 질의 혹은 질의 리스트
+            batch_size : 한 번에 추론할 질의 수
+
+        Returns:
+            dict: {"dense_vecs": np.ndarray} (입력이 문자열이면 1차원 벡터)
+        """
+        single = isinstance(sentences, str)
+        texts = [sentences] if single else sentences
+        vectors = []
+        for i in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                texts[i: i + batch_size], truncation=True, max_length=MAX_QUERY_LENGTH
+            )
+            longest = max(len(ids) for ids in encoded["input_ids"])
+            padded = self.tokenizer.pad(
+                encoded, padding="max_length", max_length=self._pad_length(longest), return_tensors="np"
+            )
+            outputs = self.session.run(
+                ["dense_vecs"],
+                {
+                    "input_ids": padded["input_ids"].astype(np.int64),
+                    "attention_mask": padded["attention_mask"].astype(np.int64),
+                },
+            )
+            vectors.append(outputs[0])
+        dense_vecs = np.concatenate(vectors).astype(np.float32)
+        return {"dense_vecs": dense_vecs[0] if single else dense_vecs}
+
+
+async def verify_encoder(
+    model_id: Text,
+    queries: list[Text] = VERIFY_QUERIES,
+    k: int = 10,
+    quantized: bool = True,
+    index: Optional[Text] = None,
+) -> dict:
+    """ONNX 인코더를 기존 torch 인코더와 비교
+
+    질의별 두 벡터의 cosine 유사도와, 같은 인덱스에서 kNN 검색 시 torch 벡터의 top-k 대비
+    ONNX 벡터 top-k 의 recall@k, 인코딩 지연시간을 측정한다.
+
+    Returns:
+        dict: 질의별 결과와 평균
+    """
+    from FlagEmbedding import BGEM3FlagModel
+    from app.common.patent.base.es_client import es_client_pool
+    from app.common.patent.patent_utils.patent_search_utils import INDEX_NAME, VECTOR_FIELD
+
+    reference = BGEM3FlagModel(resolve_model_path(model_id), use_fp16=False, device="cpu")
+    candidate = OnnxBgeM3Encoder(get_onnx_model_dir(model_id), quantized=quantized)
+
+    async def top_k(es, vector) -> list:
+        result = await es.search(
+            index=index or INDEX_NAME,
+            knn={"field": VECTOR_FIELD, "query_vector": vector.tolist(), "k": k, "num_candidates": max(100, k * 5)},
+            size=k,
+            source=False,
+        )
+        return [hit["_id"] for hit in result["hits"]["hits"]]
+
+    rows = []
+    async with es_client_pool.acquire() as es:
+        for query in queries:
+            start = time.perf_counter()
+            ref_vec = np.asarray(reference.encode(query)["dense_vecs"], dtype=np.float32)
+            ref_time = time.perf_counter() - start
+            start = time.perf_counter()
+            cand_vec = candidate.encode(query)["dense_vecs"]
+            cand_time = time.perf_counter() - start
+
+            cosine = float(np.dot(ref_vec, cand_vec) / (np.linalg.norm(ref_vec) * np.linalg.norm(cand_vec)))
+            ref_ids = await top_k(es, ref_vec)
+            cand_ids = await top_k(es, cand_vec)
+            recall = len(set(ref_ids) & set(cand_ids)) / len(ref_ids) if ref_ids else None
+            rows.append({
+                "query": query,
+                "cosine": round(cosine, 5),
+                f"recall@{k}": recall,
+                "torchTime": round(ref_time, 4),
+                "onnxTime": round(cand_time, 4),
+            })
+    await es_client_pool.close()
+
+    recalls = [row[f"recall@{k}"] for row in rows if row[f"recall@{k}"] is not None]
+    return {
+        "queries": rows,
+        "meanCosine": round(float(np.mean([row["cosine"] for row in rows])), 5),
+        "minCosine": round(float(np.min([row["cosine"] for row in rows])), 5),
+        f"meanRecall@{k}": round(float(np.mean(recalls)), 4) if recalls else None,
+        "meanTorchTime": round(float(np.mean([row["torchTime"] for row in rows])), 4),
+        "meanOnnxTime": round(float(np.mean([row["onnxTime"] for row in rows])), 4),
+    }
+
+
+if __name__ == "__main__":
+    import asyncio
+
+    parser = argparse.ArgumentParser(description="BGE-M3 질의 인코더 ONNX export / 검증")
+    parser.add_argument("command", choices=["export", "verify"])
+    parser.add_argument("--model-id", default="BAAI/bge-m3")
+    parser.add_argument("--no-quantize", action="store_true", help="int8 양자화 없이 fp32 ONNX 만 사용")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", help="검증 질의 파일 (한 줄에 한 질의, 생략 시 고정 질의 셋)")
+    parser.add_argument("--index", help="recall 측정에 사용할 인덱스 (생략 시 서비스 인덱스)")
+    args = parser.parse_args()
+
+    if args.command == "export":
+        start = time.perf_counter()
+        path = export_onnx(args.model_id, quantize=not args.no_quantize)
+        print(f"{args.model_id} -> {path} ({time.perf_counter() - start:.1f}s)")
+    else:
+        queries = VERIFY_QUERIES
+        if args.queries:
+            with open(args.queries, "r", encoding="utf-8") as f:
+                queries = [line.strip() for line in f if line.strip()]
+        report = asyncio.run(
+            verify_encoder(args.model_id, queries, k=args.k, quantized=not args.no_quantize, index=args.index)
+        )
+        print(json.dumps(report, ensure_ascii=False, indent=4))
@@ -0,0 +1,19 @@
+"""특허 검색 결과 필드 목록
+
+라우터가 patent_search_utils(임베딩 모델, LangChain 등) 를 import 하지 않고 사용할 수 있도록 분리한다.
+"""
+
+# 유사 특허 검색 결과 필드
+COLUMN_NAMES1 = [
+    "applicate_number",
+    "applicate_date",
+    "applicate_nation",
+    "invention_title",
+    "ipcs",
+    "register_number",
+    "lrh_name",
+]
+# IPC 네트워크 검색 결과 필드
+COLUMN_NAMES2 = ["applicate_number", "invention_title", "ipcs"]
+# 검색(retrieval) 단계에서 받는 필드: 엔드포인트별 결과 필드의 합집합 (같은 검색 결과를 엔드포인트끼리 재사용)
+RETRIEVAL_COLUMNS = list(dict.fromkeys(COLUMN_NAMES1 + COLUMN_NAMES2))
@@ -0,0 +1,482 @@
+"""특허 벡터 인덱스 색인기 (MariaDB patent_scraping 혹은 JSONL -> BGE-M3 임베딩 -> ES bulk)
+
+원천 행을 출원번호 순서로 페이지 단위로 읽고, 문서 배치를 워커 프로세스(BGE-M3)에서 임베딩한 뒤
+helpers.async_streaming_bulk 로 새 인덱스에 색인한다. bulk 가 느려지면 임베딩 배치 요청도 멈추므로
+(동시에 진행하는 배치는 workers * 2 개) 메모리 사용량이 원천 크기와 관계없이 일정하다.
+
+- 새 인덱스 "{alias}_{시각}" 을 replica 0, refresh 비활성화 상태로 만들고, 색인이 끝나면 설정을 되돌린 뒤
+  alias 를 한 번의 update_aliases 로 교체한다 (서비스는 교체 전까지 기존 인덱스를 검색).
+- 색인이 확인(ack)된 문서까지의 원천 위치를 checkpoint 파일에 주기적으로 기록하므로,
+  중단 후 --resume 으로 같은 인덱스에 이어서 색인할 수 있다. 실패한 문서는 {checkpoint}.errors.jsonl 에 남긴다.
+- --partition-by-year 이면 출원 연도별 인덱스 "{alias}_{시각}_{연도}"(출원일이 없으면 "_undated")로 나누어 색인하고
+  모두 같은 alias 로 묶는다. 검색 시 date_partitions.DatePartitionRouter 가 날짜 조건과 겹치는 인덱스만 검색한다.
+- 로컬 ES 에서 실행하려면 ES_HOSTS 를 지정한다 (예: ES_HOSTS=http://localhost:9200).
+
+Usage:
+    python -m app.common.patent.base.patent_indexer --from-db
+    python -m app.common.patent.base.patent_indexer --from-db --resume
+    python -m app.common.patent.base.patent_indexer --from-db --partition-by-year
+    python -m app.common.patent.base.patent_indexer --from-jsonl patents.jsonl --alias em_ai_patent_vector_index_test --limit 1000
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+import datetime
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Optional, Text
+
+import numpy as np
+
+from app.config.settings import INDEXER_SETTINGS, PATENT_INDEX_NAME
+from app.common.patent.base.es_index import generate_index_mapping
+from app.common.patent.base.local_vector_index import METADATA_COLUMNS
+from app.common.patent.base.date_partitions import UNDATED_SUFFIX
+
+EMBEDDING_MODEL_ID = "BAAI/bge-m3"
+# 임베딩할 문서 본문 (출원 제목 + 요약)
+TEXT_COLUMNS = ["invention_title", "abstract"]
+KEY_COLUMN = "applicate_number"
+# 원천 테이블의 특허당 여러 행(법인별 행)을 구분하는 컬럼, 특허 문서 하나로 합칠 때 값을 모두 남기는 컬럼
+CORPORATION_COLUMN = "corp_num"
+MERGED_COLUMNS = ["lrh_name"]
+MERGED_SEPARATOR = ", "
+# 색인 중 진행 상황 출력 간격 (초)
+PROGRESS_INTERVAL = 10
+
+# 워커 프로세스의 임베딩 모델
+_worker_model = None
+
+
+def _init_worker(threads: int):
+    """워커 프로세스 초기화 (프로세스당 모델 1개, 프로세스 간 CPU 를 나누도록 스레드 수 제한)"""
+    global _worker_model
+    import torch
+    from FlagEmbedding import BGEM3FlagModel
+    from app.common.core.hf_hub_utils import resolve_model_path
+
+    torch.set_num_threads(threads)
+    # 문서는 질의보다 길기 때문에 질의 길이로 자르는 ONNX 인코더 대신 원본 모델을 사용
+    _worker_model = BGEM3FlagModel(resolve_model_path(EMBEDDING_MODEL_ID), use_fp16=False, device="cpu")
+
+
+def _encode_texts(texts: list[Text], max_length: int) -> np.ndarray:
+    return np.asarray(
+        _worker_model.encode(texts, batch_size=len(texts), max_length=max_length)["dense_vecs"], dtype=np.float32
+    )
+
+
+def _to_json_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.strftime("%Y-%m-%d")
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def to_document(row: dict, key: Text) -> tuple[Text, Text, dict]:
+    """원천 행(DB 행 혹은 JSONL 레코드)을 (문서 id, 임베딩 본문, 메타데이터)로 변환 (출원번호가 없으면 원천 위치를 id 로 사용)"""
+    metadata = row.get("metadata", row)
+    metadata = {
+        name: _to_json_value(metadata[name]) for name in METADATA_COLUMNS if metadata.get(name) is not None
+    }
+    text = row.get("text") or "\n".join(metadata[name] for name in TEXT_COLUMNS if metadata.get(name))
+    return str(metadata.get(KEY_COLUMN, key)), text, metadata
+
+
+async def iter_db_rows(
+    table: Text, last_key: Optional[Text], page_size: int, db_url: Text
+) -> AsyncIterator[tuple[Text, dict]]:
+    """MariaDB 원천 테이블을 (출원번호, 법인번호) keyset 페이지네이션으로 읽고 특허별 행을 하나로 합쳐서 반환
+
+    원천은 특허 x 법인 행이므로 페이지 경계가 한 특허의 행 사이에 걸릴 수 있다. 복합 키로 다음 페이지를 읽고,
+    출원번호가 바뀔 때(혹은 원천 끝에서) 모인 행을 merge_rows 로 합치므로 한 특허의 행이 누락되거나 덮어써지지 않는다.
+    위치(last_key)는 모든 행을 처리한 출원번호이다.
+    """
+    from sqlalchemy import create_engine, text
+    from app.common.patent.base.patent_queries import patent_index_source_query
+
+    engine = create_engine(db_url, pool_pre_ping=True, pool_recycle=3600)
+    query = text(patent_index_source_query.format(table=table))
+
+    def fetch_page(key, corp):
+        params = {"last_key": key, "last_corp": corp, "limit": page_size}
+        with engine.connect() as conn:
+            return [dict(row) for row in conn.execute(query, params).mappings()]
+
+    try:
+        key, corp = last_key or "", None
+        group: list[dict] = []
+        while True:
+            rows = await asyncio.to_thread(fetch_page, key, corp)
+            for row in rows:
+                if group and str(row[KEY_COLUMN]) != str(group[0][KEY_COLUMN]):
+                    yield str(group[0][KEY_COLUMN]), merge_rows(group)
+                    group = []
+                group.append(row)
+            if len(rows) < page_size:
+                break
+            key = str(rows[-1][KEY_COLUMN])
+            corp = "" if rows[-1].get(CORPORATION_COLUMN) is None else str(rows[-1][CORPORATION_COLUMN])
+        if group:
+            yield str(group[0][KEY_COLUMN]), merge_rows(group)
+    finally:
+        engine.dispose()
+
+
+def merge_rows(rows: list[dict]) -> dict:
+    """한 특허의 법인별 행을 하나로 합침 (MERGED_COLUMNS 는 중복 없이 모두 연결, 나머지는 처음 나온 값)"""
+    merged = dict(rows[0])
+    for name, value in rows[0].items():
+        if value is None:
+            merged[name] = next((row[name] for row in rows if row.get(name) is not None), None)
+    for name in MERGED_COLUMNS:
+        values = dict.fromkeys(str(row[name]) for row in rows if row.get(name) not in (None, ""))
+        if values:
+            merged[name] = MERGED_SEPARATOR.join(values)
+    return merged
+
+
+async def iter_jsonl_rows(path: Text, last_key: Optional[Text]) -> AsyncIterator[tuple[Text, dict]]:
+    """JSONL 원천 읽기 (위치는 줄 번호, 빈 줄과 embedding 필드는 무시)"""
+    start = int(last_key) + 1 if last_key is not None else 0
+    with open(path, "r", encoding="utf-8") as f:
+        for i, line in enumerate(f):
+            if i < start or not line.strip():
+                continue
+            doc = json.loads(line)
+            yield str(i), doc.get("_source", doc)
+
+
+class Checkpoint:
+    """색인 진행 위치 저장 (ack 된 문서까지의 원천 위치)
+
+    bulk 결과는 재시도(429) 때문에 보낸 순서와 다르게 돌아올 수 있으므로, 보낸 순서대로 (위치, 문서 id)를 기록하고
+    앞에서부터 연속으로 ack 된 문서까지만 위치를 전진시킨다.
+    """
+
+    def __init__(self, path: Text, state: Optional[dict] = None):
+        self.path = path
+        self.state = state or {}
+        self.sent: deque[tuple[Text, Text]] = deque()
+        self.acked: set[Text] = set()
+        self.errors_path = os.path.splitext(path)[0] + ".errors.jsonl"
+
+    @classmethod
+    def load(cls, path: Text) -> "Checkpoint":
+        with open(path, encoding="utf-8") as f:
+            return cls(path, json.load(f))
+
+    def mark_sent(self, key: Text, doc_id: Text):
+        self.sent.append((key, doc_id))
+
+    def mark_done(self, doc_id: Text, ok: bool, info: dict):
+        if ok:
+            self.state["indexed"] = self.state.get("indexed", 0) + 1
+        else:
+            self.state["failed"] = self.state.get("failed", 0) + 1
+            with open(self.errors_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(info, ensure_ascii=False, default=str) + "\n")
+        self.acked.add(doc_id)
+        while self.sent and self.sent[0][1] in self.acked:
+            key, done_id = self.sent.popleft()
+            self.acked.discard(done_id)
+            self.state["last_key"] = key
+
+    def save(self):
+        self.state["updated_at"] = datetime.datetime.now().isoformat()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=4)
+        os.replace(tmp_path, self.path)
+
+
+class PatentIndexer:
+    def __init__(
+        self,
+        alias: Text = PATENT_INDEX_NAME,
+        batch_size: int = INDEXER_SETTINGS["batch_size"],
+        workers: int = INDEXER_SETTINGS["workers"],
+        max_length: int = INDEXER_SETTINGS["max_length"],
+        bulk_chunk_size: int = INDEXER_SETTINGS["bulk_chunk_size"],
+        checkpoint_path: Text = INDEXER_SETTINGS["checkpoint_path"],
+        checkpoint_every: int = INDEXER_SETTINGS["checkpoint_every"],
+        limit: Optional[int] = None,
+        partition_by_year: bool = False,
+    ):
+        self.alias = alias
+        self.batch_size = batch_size
+        self.workers = workers
+        self.max_length = max_length
+        self.bulk_chunk_size = bulk_chunk_size
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_every = checkpoint_every
+        self.limit = limit
+        self.partition_by_year = partition_by_year
+        self.batches = 0
+        self.encode_time = 0.0
+
+    async def _encode_batches(self, rows: AsyncIterator[tuple[Text, dict]], pool: ProcessPoolExecutor):
+        """원천 행을 배치로 묶어 워커에서 임베딩 (진행 중인 배치는 최대 workers * 2 개, 결과는 원천 순서대로)"""
+        loop = asyncio.get_running_loop()
+        pending: deque = deque()
+
+        async def pop():
+            started, batch, future = pending.popleft()
+            vectors = await future
+            self.batches += 1
+            self.encode_time += time.perf_counter() - started
+            return batch, vectors
+
+        def submit(batch):
+            texts = [text for _, _, text, _ in batch]
+            pending.append((time.perf_counter(), batch, loop.run_in_executor(pool, _encode_texts, texts, self.max_length)))
+
+        batch, count = [], 0
+        async for key, row in rows:
+            doc_id, text, metadata = to_document(row, key)
+            batch.append((key, doc_id, text, metadata))
+            count += 1
+            if len(batch) == self.batch_size:
+                submit(batch)
+                batch = []
+                if len(pending) >= self.workers * 2:
+                    yield await pop()
+            if self.limit and count >= self.limit:
+                break
+        if batch:
+            submit(batch)
+        while pending:
+            yield await pop()
+
+    async def _target_index(self, es, metadata: dict, checkpoint: Checkpoint) -> Text:
+        """문서를 색인할 인덱스 (연도별 인덱스는 해당 연도 문서가 처음 나올 때 생성)"""
+        prefix = checkpoint.state["index"]
+        if not checkpoint.state.get("partitioned"):
+            return prefix
+        year = str(metadata.get("applicate_date", ""))[:4]
+        index = f"{prefix}_{year}" if year.isdigit() else prefix + UNDATED_SUFFIX
+        if index not in checkpoint.state["indices"]:
+            await self._create_index(es, index)
+            checkpoint.state["indices"].append(index)
+            checkpoint.save()
+        return index
+
+    async def _actions(self, es, rows, pool, checkpoint: Checkpoint):
+        async for batch, vectors in self._encode_batches(rows, pool):
+            for (key, doc_id, text, metadata), vector in zip(batch, vectors):
+                index = await self._target_index(es, metadata, checkpoint)
+                checkpoint.mark_sent(key, doc_id)
+                yield {
+                    "_index": index,
+                    "_id": doc_id,
+                    "_source": {"text": text, "embedding": vector.tolist(), "metadata": metadata},
+                }
+
+    async def _create_index(self, es, index: Text):
+        body = generate_index_mapping()
+        settings = body["settings"]
+        # 대량 색인 중에는 replica / refresh 비활성화 (완료 후 _finish_index 에서 복원)
+        settings["index"].update({"number_of_replicas": 0, "refresh_interval": "-1"})
+        await es.indices.create(index=index, settings=settings, mappings=body["mappings"])
+
+    async def _finish_index(self, es, index: Text):
+        replicas = generate_index_mapping()["settings"]["index"]["number_of_replicas"]
+        await es.indices.put_settings(
+            index=index, settings={"index": {"number_of_replicas": replicas, "refresh_interval": None}}
+        )
+        await es.indices.refresh(index=index)
+
+    async def swap_alias(
+        self, es, indices: list[Text], replace_concrete_index: bool = False, delete_old: bool = False
+    ) -> list:
+        """alias 를 새 인덱스(연도별 인덱스이면 전체)로 한 번에 교체
+
+        alias 이름과 같은 실제 인덱스(기존 서비스 인덱스)가 있으면, replace_concrete_index 일 때만
+        같은 요청에서 그 인덱스를 삭제하고 alias 를 만든다.
+
+        Returns:
+            list: alias 가 가리키던 이전 인덱스 목록
+        """
+        actions = []
+        old_indices = []
+        if await es.indices.exists_alias(name=self.alias):
+            old_indices = [name for name in await es.indices.get_alias(name=self.alias) if name not in indices]
+            actions += [{"remove": {"index": name, "alias": self.alias}} for name in old_indices]
+        elif await es.indices.exists(index=self.alias):
+            if not replace_concrete_index:
+                raise ValueError(
+                    f"{self.alias} 은 alias 가 아닌 인덱스입니다. --replace-concrete-index 로 삭제 후 교체할 수 있습니다."
+                )
+            actions.append({"remove_index": {"index": self.alias}})
+        actions += [{"add": {"index": index, "alias": self.alias}} for index in indices]
+        await es.indices.update_aliases(actions=actions)
+        if delete_old and old_indices:
+            await es.indices.delete(index=",".join(old_indices))
+        return old_indices
+
+    async def run(
+        self,
+        es,
+        source: Text,
+        rows_factory,
+        resume: bool = False,
+        swap: bool = True,
+        replace_concrete_index: bool = False,
+        delete_old: bool = False,
+    ) -> dict:
+        """색인 실행
+
+        Args:
+            es (AsyncElasticsearch): ES 클라이언트
+            source (str): 원천 설명 (checkpoint 에 기록, 재개 시 같은 원천인지 확인)
+            rows_factory (Callable): last_key 를 받아 (위치, 행) async iterator 를 반환하는 함수
+            resume (bool): checkpoint 의 인덱스에 이어서 색인 (연도별 색인 여부도 checkpoint 를 따름)
+            swap (bool): 완료 후 alias 교체
+
+        Returns:
+            dict: 색인 결과 요약
+        """
+        from elasticsearch.helpers import async_streaming_bulk
+
+        if resume:
+            checkpoint = Checkpoint.load(self.checkpoint_path)
+            if checkpoint.state["source"] != source:
+                raise ValueError(f"checkpoint 의 원천이 다릅니다: {checkpoint.state['source']}")
+        else:
+            index = f"{self.alias}_{datetime.datetime.now():%Y%m%d%H%M%S}"
+            checkpoint = Checkpoint(
+                self.checkpoint_path,
+                {
+                    "index": index,
+                    "alias": self.alias,
+                    "source": source,
+                    "partitioned": self.partition_by_year,
+                    "indices": [] if self.partition_by_year else [index],
+                },
+            )
+            if not self.partition_by_year:
+                await self._create_index(es, index)
+        checkpoint.save()
+
+        rows = rows_factory(checkpoint.state.get("last_key"))
+        start = time.perf_counter()
+        indexed_at_start = checkpoint.state.get("indexed", 0)
+        last_saved, last_report = 0, start
+        processed = 0
+        context = multiprocessing.get_context("spawn")
+        threads = max(1, (os.cpu_count() or 1) // self.workers)
+        with ProcessPoolExecutor(self.workers, mp_context=context, initializer=_init_worker, initargs=(threads,)) as pool:
+            async for ok, info in async_streaming_bulk(
+                es,
+                self._actions(es, rows, pool, checkpoint),
+                chunk_size=self.bulk_chunk_size,
+                max_retries=5,
+                initial_backoff=2,
+                raise_on_error=False,
+                raise_on_exception=False,
+            ):
+                item = next(iter(info.values()))
+                checkpoint.mark_done(item["_id"], ok, info)
+                processed += 1
+                if processed - last_saved >= self.checkpoint_every:
+                    checkpoint.save()
+                    last_saved = processed
+                if time.perf_counter() - last_report >= PROGRESS_INTERVAL:
+                    last_report = time.perf_counter()
+                    print(json.dumps(self._progress(checkpoint, processed, start), ensure_ascii=False), flush=True)
+        checkpoint.save()
+
+        indices = checkpoint.state.setdefault("indices", [checkpoint.state["index"]])
+        for index in indices:
+            await self._finish_index(es, index)
+        old_indices = []
+        if swap and indices:
+            old_indices = await self.swap_alias(es, indices, replace_concrete_index, delete_old)
+        checkpoint.state["completed_at"] = datetime.datetime.now().isoformat()
+        checkpoint.save()
+        summary = self._progress(checkpoint, processed, start)
+        summary.update({
+            "indices": indices,
+            "alias": self.alias if swap else None,
+            "previousIndices": old_indices,
+            "totalIndexed": checkpoint.state.get("indexed", 0),
+            "resumedFrom": indexed_at_start,
+        })
+        return summary
+
+    def _progress(self, checkpoint: Checkpoint, processed: int, start: float) -> dict:
+        elapsed = time.perf_counter() - start
+        return {
+            "processed": processed,
+            "failed": checkpoint.state.get("failed", 0),
+            "lastKey": checkpoint.state.get("last_key"),
+            "elapsed": round(elapsed, 1),
+            "docsPerSec": round(processed / elapsed, 1) if elapsed else None,
+            # 배치 제출부터 임베딩 결과 수신까지의 평균 시간 (워커 대기 포함)
+            "avgBatchEncodeTime": round(self.encode_time / self.batches, 3) if self.batches else None,
+        }
+
+
+async def main(args) -> dict:
+    from app.common.patent.base.es_client import es_client_pool
+    from app.config.settings import CPU_MARIADB_URL, DEV_MARIADB_URL
+
+    indexer = PatentIndexer(
+        alias=args.alias,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        checkpoint_path=args.checkpoint,
+        limit=args.limit,
+        partition_by_year=args.partition_by_year,
+    )
+    db_url = CPU_MARIADB_URL if args.db == "cpu" else DEV_MARIADB_URL
+    if args.from_jsonl:
+        source = f"jsonl:{os.path.abspath(args.from_jsonl)}"
+    else:
+        source = f"db:{args.db}:{args.table}"
+
+    def rows_factory(last_key):
+        if args.from_jsonl:
+            return iter_jsonl_rows(args.from_jsonl, last_key)
+        return iter_db_rows(args.table, last_key, INDEXER_SETTINGS["page_size"], db_url)
+
+    async with es_client_pool.acquire() as es:
+        summary = await indexer.run(
+            es,
+            source,
+            rows_factory,
+            resume=args.resume,
+            swap=not args.no_swap,
+            replace_concrete_index=args.replace_concrete_index,
+            delete_old=args.delete_old,
+        )
+    await es_client_pool.close()
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="특허 벡터 인덱스 색인 (원천 -> 임베딩 -> bulk -> alias 교체)")
+    parser.add_argument("--from-db", action="store_true", help="MariaDB 원천 테이블에서 색인")
+    parser.add_argument("--db", choices=["cpu", "dev"], default="cpu", help="원천 DB (patent_scraping 은 cpu)")
+    parser.add_argument("--table", default=INDEXER_SETTINGS["source_table"])
+    parser.add_argument("--from-jsonl", help="JSONL 파일에서 색인 (레코드 혹은 {\"text\", \"metadata\"} 형식)")
+    parser.add_argument("--alias", default=PATENT_INDEX_NAME, help="교체할 alias (서비스 인덱스 이름)")
+    parser.add_argument("--batch-size", type=int, default=INDEXER_SETTINGS["batch_size"])
+    parser.add_argument("--workers", type=int, default=INDEXER_SETTINGS["workers"])
+    parser.add_argument("--checkpoint", default=INDEXER_SETTINGS["checkpoint_path"])
+    parser.add_argument("--resume", action="store_true", help="checkpoint 의 인덱스에 이어서 색인")
+    parser.add_argument("--limit", type=int, help="최대 문서 수 (테스트용)")
+    parser.add_argument("--partition-by-year", action="store_true", help="출원 연도별 인덱스로 나누어 색인")
+    parser.add_argument("--no-swap", action="store_true", help="alias 교체 없이 색인만")
+    parser.add_argument("--replace-concrete-index", action="store_true", help="alias 이름의 기존 인덱스를 삭제 후 교체")
+    parser.add_argument("--delete-old", action="store_true", help="교체 후 이전 인덱스 삭제")
+    args = parser.parse_args()
+
+    if not args.from_db and not args.from_jsonl:
+        parser.error("--from-db 혹은 --from-jsonl 을 지정해야 합니다.")
+    print(json.dumps(asyncio.run(main(args)), ensure_ascii=False, indent=4))
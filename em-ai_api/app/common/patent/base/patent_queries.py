@@ -33,3 +33,15 @@ WHERE
     nci.corporation_num = :corporation_num
 ;
 """
+
+# 특허 벡터 인덱스 색인 원천 ({table} 은 INDEXER_SETTINGS["source_table"])
+# corporation_patent_view 는 특허 x 법인 행이므로 (출원번호, 법인번호) 복합 keyset 으로 페이지네이션
+# (last_corp 가 NULL 이면 last_key 출원번호의 행은 모두 처리된 것으로 보고 다음 출원번호부터 읽음)
+patent_index_source_query = """
+SELECT * FROM {table}
+WHERE applicate_number > :last_key
+    OR (applicate_number = :last_key AND COALESCE(corp_num, '') > :last_corp)
+ORDER BY applicate_number, COALESCE(corp_num, '')
+LIMIT :limit
+;
+"""
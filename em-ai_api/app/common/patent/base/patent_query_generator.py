@@ -1,5 +1,7 @@
 import os
 import traceback
+from functools import lru_cache
+from typing import Optional
 
 from dotenv import dotenv_values
 from icecream import ic
@@ -7,8 +9,10 @@ from langchain_openai import AzureChatOpenAI, ChatOpenAI
 from langchain.retrievers.self_query.elasticsearch import ElasticsearchTranslator
 from langchain.chains.query_constructor.base import AttributeInfo, StructuredQueryOutputParser
 
+from app.config.settings import FEW_SHOT_SELECTION_SETTINGS
 from app.config.custom_errors import DataNotFoundError
 from app.common.patent.base.query_generator_utils import get_query_constructor_prompt_test
+from app.common.patent.base.few_shot_selector import FewShotExampleSelector
 from app.common.patent.base.prompts import (
     PATENT_META_FIELD_INFO,
     PATENT_QUERY_FEW_SHOT_EXAMPLES,
@@ -24,12 +28,18 @@ metadata_field_info = [
     for field in PATENT_META_FIELD_INFO
 ]
 
-# 프롬프트 : 구조화된 쿼리 생성을 위한 프롬프트 생성
-prompt = get_query_constructor_prompt_test(
-    document_contents=PATENT_DOC_CONTENT_DESC,
-    attribute_info=metadata_field_info,
-    examples=PATENT_QUERY_FEW_SHOT_EXAMPLES,
-)
+
+def build_prompt(examples: list):
+    """구조화된 쿼리 생성을 위한 프롬프트 생성"""
+    return get_query_constructor_prompt_test(
+        document_contents=PATENT_DOC_CONTENT_DESC,
+        attribute_info=metadata_field_info,
+        examples=examples,
+    )
+
+
+# 프롬프트 : 전체 few-shot 예시를 사용하는 프롬프트 (질의 벡터가 없을 때 사용)
+prompt = build_prompt(PATENT_QUERY_FEW_SHOT_EXAMPLES)
 
 openai_mode = os.getenv("OPENAI_MODE")
 if openai_mode == "azure":
@@ -56,23 +66,75 @@ output_parser = StructuredQueryOutputParser.from_components()
 query_constructor = prompt | llm | output_parser
 
 
-def generate_es_query_from_nl_query(nl_query: str) -> dict:
+@lru_cache(maxsize=1)
+def get_example_selector() -> Optional[FewShotExampleSelector]:
+    """예시 선택기 : 질의와 비슷한 예시만 프롬프트에 포함 (비활성화 시 None)
+
+    import 시점에는 만들지 않고, 예시 벡터와 토큰 수는 PatentSearchUtils 가 처음 변환할 때 fit 으로 설정한다.
+    """
+    if not FEW_SHOT_SELECTION_SETTINGS["enabled"]:
+        return None
+    return FewShotExampleSelector(PATENT_QUERY_FEW_SHOT_EXAMPLES)
+
+
+@lru_cache(maxsize=FEW_SHOT_SELECTION_SETTINGS["prompt_cache_size"])
+def get_query_constructor(example_indices: tuple):
+    """선택된 예시만 포함한 쿼리 생성 체인 (예시 조합별로 재사용)"""
+    return build_prompt([PATENT_QUERY_FEW_SHOT_EXAMPLES[i] for i in example_indices]) | llm | output_parser
+
+
+def _get_query_constructor(query_vector=None):
+    example_selector = get_example_selector()
+    if example_selector is None or query_vector is None or not example_selector.fitted:
+        return query_constructor
+    return get_query_constructor(example_selector.select(query_vector))
+
+
+def _translate_structured_query(structured_query) -> dict:
+    # Elasticsearch Translator : 구조화된 쿼리를 Elasticsearch 쿼리로 변환
+    translator = ElasticsearchTranslator()
+    es_translated_query = translator.visit_structured_query(structured_query)
+    return {"status": "success", "filter": es_translated_query[1]["filter"], "keywords": es_translated_query[0]}
+
+
+def generate_es_query_from_nl_query(nl_query: str, query_vector=None) -> dict:
     """자연어 질의를 Elasticsearch query로 변환.
 
     Args:
         nl_query (str): 자연어 질의
+        query_vector (np.ndarray, optional): 질의 임베딩 (지정하면 비슷한 few-shot 예시만 사용)
+
+    Returns:
+        dict: Elasticsearch query
+    """
+    try:
+        structured_query = _get_query_constructor(query_vector).invoke(
+            {"query": nl_query}, config={"fix_invalid": True}
+        )
+        return _translate_structured_query(structured_query)
+    except KeyError:
+        raise DataNotFoundError(" 검색 결과가 없습니다. 다른 검색어로 시도해주세요.")
+    except Exception as e:
+        print(traceback.format_exc())
+        print(e)
+        return {"status": "fail", "filter": None, "keywords": None}
+
+
+async def agenerate_es_query_from_nl_query(nl_query: str, query_vector=None) -> dict:
+    """자연어 질의를 Elasticsearch query로 변환 (비동기, LLM 호출 중 이벤트 루프를 막지 않음).
+
+    Args:
+        nl_query (str): 자연어 질의
+        query_vector (np.ndarray, optional): 질의 임베딩 (지정하면 비슷한 few-shot 예시만 사용)
 
     Returns:
         dict: Elasticsearch query
     """
     try:
-        structured_query = query_constructor.invoke(
+        structured_query = await _get_query_constructor(query_vector).ainvoke(
             {"query": nl_query}, config={"fix_invalid": True}
         )
-        # Elasticsearch Translator : 구조화된 쿼리를 Elasticsearch 쿼리로 변환
-        translator = ElasticsearchTranslator()
-        es_translated_query = translator.visit_structured_query(structured_query)
-        return {"status": "success", "filter": es_translated_query[1]["filter"], "keywords": es_translated_query[0]}
+        return _translate_structured_query(structured_query)
     except KeyError:
         raise DataNotFoundError(" 검색 결과가 없습니다. 다른 검색어로 시도해주세요.")
     except Exception as e:
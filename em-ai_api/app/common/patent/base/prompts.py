@@ -293,8 +293,11 @@ PATENT_QUERY_FEW_SHOT_EXAMPLES = [
    ),
 ]
 
+# 상대 날짜("최근 5년" 등) 변환 기준일 (변환 결과 캐시에서 날짜 재계산에 사용)
+PATENT_QUERY_ANCHOR_DATE = dt.datetime.now().date()
+
 PATENT_DOC_CONTENT_DESC = f"""
 The content of the patent document. it was written in korean
-When converting to specific dates, use current date is {dt.datetime.now().date()} as the reference
+When converting to specific dates, use current date is {PATENT_QUERY_ANCHOR_DATE} as the reference
 and adjust it to match the Korean Standard Time (KST) timezone.
 """
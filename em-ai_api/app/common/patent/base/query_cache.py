@@ -0,0 +1,280 @@
+import re
+import copy
+import time
+import datetime
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+from app.config.settings import QUERY_CACHE_SETTINGS
+from app.common.patent.base.embedding_cache import normalize_text
+
+# 날짜가 질의 시점에 따라 달라지는 표현 (최근 5년 이내, 작년, 연도 없는 상반기 ...)
+RELATIVE_DATE_PATTERN = re.compile(
+    r"최근|지난|이내|올해|금년|작년|전년|재작년|이번|올\s*상반기|올\s*하반기|(?<!\d년)(?<!\d년 )(?:상|하)반기"
+)
+# 조건을 뒤집는 표현 (삼성전자가 아닌, 배터리 말고 ...)
+NEGATION_PATTERN = re.compile(r"아닌|아니고|제외|말고|빼고|없는|않은|않는")
+DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+NUMBER_PATTERN = re.compile(r"\d+")
+# 만료 항목 전체 정리 주기 (초). 조회한 항목은 조회 시점에 만료 여부를 확인한다
+EXPIRED_SWEEP_INTERVAL = 60
+# 권리자 / 기관 이름으로 보이는 토큰 (영문 약칭, 회사 / 기관 접미사)
+ENTITY_PATTERN = re.compile(
+    r"^(?:[a-z][a-z0-9&.\-]*|\S*(?:전자|전기|화학|중공업|자동차|하이닉스|그룹|홀딩스|제약|㈜|\(주\)|주식회사|"
+    r"대학교|대학|연구원|연구소|공사|재단|inc|corp|co\.?|ltd))$"
+)
+APPLICANT_PATTERN = re.compile(r"(?:권리자|출원인|특허권자)\s*(?:가|이|는)?\s*(\S+?)(?:인|이고|이며)(?=\s|$)")
+PARTICLE_PATTERN = re.compile(r"(?:에서|으로|로|가|이|은|는|을|를|의|와|과|도|만)$")
+
+
+def _entities(query: str) -> tuple:
+    entities = set(APPLICANT_PATTERN.findall(query))
+    for token in query.split():
+        stripped = PARTICLE_PATTERN.sub("", token)
+        for candidate in (token, stripped):
+            if candidate and ENTITY_PATTERN.match(candidate):
+                entities.add(stripped or token)
+                break
+    return tuple(sorted(entities))
+
+
+def get_query_signature(query: str) -> tuple:
+    """질의에서 임베딩 유사도로 구분되지 않는 조건 표현 (숫자, 상대 날짜, 부정 표현, 권리자 / 기관 이름)
+
+    임베딩이 비슷해도 "2015년 이후"와 "2020년 이후", "삼성전자"와 "LG전자", "배터리"와 "배터리 말고"처럼
+    조건이 다르면 다른 질의이므로, 유사 질의 매칭은 이 값이 같은 경우에만 허용한다.
+    """
+    query = normalize_text(query)
+    return (
+        tuple(NUMBER_PATTERN.findall(query)),
+        tuple(RELATIVE_DATE_PATTERN.findall(query)),
+        tuple(NEGATION_PATTERN.findall(query)),
+        _entities(query),
+    )
+
+
+def rebase_relative_dates(query: str, result: dict, anchor_date: datetime.date) -> dict:
+    """anchor_date 기준으로 변환된 상대 날짜 질의 결과의 filter 날짜를 오늘 기준으로 이동
+
+    LLM 변환 기준일(PATENT_QUERY_ANCHOR_DATE)은 프로세스 시작일이므로, 캐시 hit 뿐 아니라 새로 변환한 결과에도 적용한다.
+    """
+    days = (datetime.date.today() - anchor_date).days
+    if not days or result.get("status") != "success" or not RELATIVE_DATE_PATTERN.search(normalize_text(query)):
+        return result
+    result = dict(result)
+    result["filter"] = shift_filter_dates(result["filter"], days)
+    return result
+
+
+def shift_filter_dates(es_filter, days: int):
+    """ES 필터의 range 절 날짜(YYYY-MM-DD)를 days 만큼 이동"""
+    if isinstance(es_filter, list):
+        return [shift_filter_dates(item, days) for item in es_filter]
+    if not isinstance(es_filter, dict):
+        return es_filter
+    shifted = {}
+    for key, value in es_filter.items():
+        if key == "range":
+            shifted[key] = {
+                field: {
+                    op: _shift_date(bound, days) for op, bound in bounds.items()
+                }
+                for field, bounds in value.items()
+            }
+        else:
+            shifted[key] = shift_filter_dates(value, days)
+    return shifted
+
+
+def _shift_date(value, days: int):
+    if isinstance(value, str) and DATE_PATTERN.match(value):
+        date = datetime.date.fromisoformat(value) + datetime.timedelta(days=days)
+        return date.isoformat()
+    return value
+
+
+class QueryCacheEntry:
+    def __init__(
+        self,
+        query: str,
+        vector: np.ndarray,
+        result: dict,
+        relative: bool,
+        anchor_date: datetime.date,
+        expires_at: float,
+    ):
+        self.query = query
+        self.vector = vector
+        self.result = result
+        self.signature = get_query_signature(query)
+        self.relative = relative
+        self.anchor_date = anchor_date
+        self.expires_at = expires_at
+
+
+class _SignatureGroup:
+    """같은 signature 를 가진 캐시 항목과 정규화된 벡터 행렬 (변경된 뒤 처음 조회할 때만 행렬을 다시 만듦)"""
+
+    def __init__(self):
+        self.vectors: dict[str, np.ndarray] = {}
+        self.keys: list[str] = []
+        self.matrix: Optional[np.ndarray] = None
+
+    def add(self, key: str, vector: np.ndarray):
+        """정규화된 벡터 추가"""
+        self.vectors[key] = vector
+        self.matrix = None
+
+    def remove(self, key: str):
+        if self.vectors.pop(key, None) is not None:
+            self.matrix = None
+
+    def nearest(self, vector: np.ndarray) -> tuple[str, float]:
+        if self.matrix is None:
+            self.keys = list(self.vectors)
+            self.matrix = np.stack([self.vectors[key] for key in self.keys])
+        similarities = self.matrix @ (vector / (np.linalg.norm(vector) + 1e-12))
+        best = int(np.argmax(similarities))
+        return self.keys[best], float(similarities[best])
+
+
+class QueryTranslationCache:
+    """자연어 질의 -> Elasticsearch 쿼리(filter, keywords) 변환 결과 캐시
+
+    정규화된 질의가 같으면 바로 반환하고, 다르더라도 조건 표현(get_query_signature)이 같고 질의 임베딩의 cosine 유사도가
+    similarity_threshold 이상이면 같은 변환 결과를 사용한다.
+    "최근 5년" 처럼 상대 날짜가 포함된 질의는 짧은 TTL(relative_ttl)을 적용하고,
+    캐시 생성일과 조회일이 다르면 filter 의 날짜를 그만큼 이동해서 반환한다.
+    """
+
+    def __init__(
+        self,
+        max_items: int = QUERY_CACHE_SETTINGS["max_items"],
+        ttl: float = QUERY_CACHE_SETTINGS["ttl"],
+        relative_ttl: float = QUERY_CACHE_SETTINGS["relative_ttl"],
+        similarity_threshold: float = QUERY_CACHE_SETTINGS["similarity_threshold"],
+    ):
+        self.max_items = max_items
+        self.ttl = ttl
+        self.relative_ttl = relative_ttl
+        self.similarity_threshold = similarity_threshold
+        self.entries: OrderedDict[str, QueryCacheEntry] = OrderedDict()
+        self.groups: dict[tuple, _SignatureGroup] = {}
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+
+    def _serve(self, entry: QueryCacheEntry) -> dict:
+        return rebase_relative_dates(entry.query, copy.deepcopy(entry.result), entry.anchor_date)
+
+    def _remove(self, key: str):
+        entry = self.entries.pop(key)
+        group = self.groups.get(entry.signature)
+        if group is not None:
+            group.remove(key)
+            if not group.vectors:
+                del self.groups[entry.signature]
+
+    def _expire(self, key: str, now: float) -> bool:
+        """항목이 만료되었으면 제거하고 True 반환"""
+        if self.entries[key].expires_at > now:
+            return False
+        self._remove(key)
+        self.expired += 1
+        return True
+
+    def _evict_expired(self, now: float):
+        """만료 항목 전체 정리 (요청마다 전체를 훑지 않도록 EXPIRED_SWEEP_INTERVAL 마다 한 번만 실행)"""
+        if now < self._next_sweep:
+            return
+        self._next_sweep = now + EXPIRED_SWEEP_INTERVAL
+        for key in [key for key, entry in self.entries.items() if entry.expires_at <= now]:
+            self._expire(key, now)
+
+    def get(self, query: str, vector: Optional[np.ndarray] = None) -> Optional[dict]:
+        """캐시된 변환 결과 조회
+
+        Args:
+            query (str): 자연어 질의
+            vector (np.ndarray, optional): 질의 임베딩 (없으면 정확히 일치하는 질의만 조회)
+
+        Returns:
+            dict: generate_es_query_from_nl_query 와 같은 형식의 결과 (없으면 None)
+        """
+        key = normalize_text(query)
+        now = time.time()
+        with self._lock:
+            self._evict_expired(now)
+            if key in self.entries and not self._expire(key, now):
+                self.entries.move_to_end(key)
+                self.exact_hits += 1
+                return self._serve(self.entries[key])
+
+            group = self.groups.get(get_query_signature(query)) if vector is not None else None
+            if group is not None:
+                vector = np.asarray(vector, dtype=np.float32)
+                best, similarity = group.nearest(vector)
+                # 정리 주기 사이에 만료된 항목이 가장 가까우면 제거하고 다음 항목으로 다시 찾음
+                while self._expire(best, now) and group.vectors:
+                    best, similarity = group.nearest(vector)
+                if best in self.entries and similarity >= self.similarity_threshold:
+                    self.entries.move_to_end(best)
+                    self.semantic_hits += 1
+                    return self._serve(self.entries[best])
+            self.misses += 1
+        return None
+
+    def put(
+        self,
+        query: str,
+        vector: np.ndarray,
+        result: dict,
+        anchor_date: Optional[datetime.date] = None,
+    ):
+        """성공한 변환 결과 저장
+
+        Args:
+            query (str): 자연어 질의
+            vector (np.ndarray): 질의 임베딩
+            result (dict): generate_es_query_from_nl_query 결과
+            anchor_date (datetime.date, optional): 변환 시 상대 날짜 기준일. Defaults to 오늘.
+        """
+        if result.get("status") != "success":
+            return
+        key = normalize_text(query)
+        relative = bool(RELATIVE_DATE_PATTERN.search(key))
+        vector = np.asarray(vector, dtype=np.float32)
+        expires_at = time.time() + (self.relative_ttl if relative else self.ttl)
+        entry = QueryCacheEntry(
+            query,
+            vector / (np.linalg.norm(vector) + 1e-12),
+            copy.deepcopy(result),
+            relative,
+            anchor_date or datetime.date.today(),
+            expires_at,
+        )
+        with self._lock:
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = entry
+            self.groups.setdefault(entry.signature, _SignatureGroup()).add(key, entry.vector)
+            while len(self.entries) > self.max_items:
+                self._remove(next(iter(self.entries)))
+
+    def stats(self) -> dict:
+        total = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "items": len(self.entries),
+            "exactHits": self.exact_hits,
+            "semanticHits": self.semantic_hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hitRate": round((self.exact_hits + self.semantic_hits) / total, 4) if total else None,
+            "similarityThreshold": self.similarity_threshold,
+        }
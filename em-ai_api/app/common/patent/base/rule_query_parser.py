@@ -0,0 +1,326 @@
+"""자주 쓰이는 한국어 특허 검색 질의 패턴의 규칙 기반 변환 (LLM 호출 없는 fast path)
+
+PATENT_QUERY_FEW_SHOT_EXAMPLES 에 있는 날짜("YYYY년 이후", "최근 N년 이내", "YYYY년 상반기", "YYYY년 1~3월"),
+권리자("권리자가 X인") 패턴과 짧은 주제어로 이루어진 질의는 LangChain query_constructor 대신
+규칙으로 변환한다. 결과 filter 는 ElasticsearchTranslator 와 같은 구조로 만든다.
+주제어가 길거나(설명형 질의) 해석되지 않는 표현이 남으면 None 을 반환해서 LLM 으로 넘긴다.
+
+Usage:
+    python -m app.common.patent.base.rule_query_parser      # few-shot 예시로 검증
+"""
+import re
+import json
+import calendar
+import datetime
+import threading
+from typing import Optional
+
+from app.common.patent.base.embedding_cache import normalize_text
+from app.common.patent.base.query_cache import RELATIVE_DATE_PATTERN, NEGATION_PATTERN, _entities
+
+DATE_FIELD = "applicate_date"
+APPLICANT_FIELD = "lrh_name"
+TOPIC_FIELDS = ["invention_title", "claim_text", "abstract"]
+MAX_TOPIC_TOKENS = 5
+MAX_QUERY_LENGTH = 80
+
+MONTH_RANGE_PATTERN = re.compile(r"(\d{4})\s*년\s*(\d{1,2})\s*[~\-]\s*(\d{1,2})\s*월(?:\s*사이)?(?:에)?")
+HALF_PATTERN = re.compile(r"(\d{4})\s*년\s*(상반기|하반기)(?:에)?")
+AFTER_PATTERN = re.compile(r"(\d{4})\s*년\s*도?\s*(?:이후|부터)(?:에)?")
+BEFORE_PATTERN = re.compile(r"(\d{4})\s*년\s*도?\s*(이전|까지)(?:에)?")
+RECENT_PATTERN = re.compile(r"최근\s*(\d{1,2})\s*년\s*(?:이내|간|동안)?(?:의|에)?")
+YEARS_PATTERN = re.compile(r"(\d{4})\s*년\s*도?\s*(?:과|와|및|,)\s*(\d{4})\s*년\s*도?(?:에)?")
+YEAR_PATTERN = re.compile(r"(\d{4})\s*년\s*도?(?:에)?")
+APPLICANT_PATTERN = re.compile(
+    r"(?:권리자|출원인|특허권자)\s*(?:가|이|는)?\s*(\S+?)(?:인|이고|이며)(?=\s|$)"
+)
+# few-shot 예시 filter 의 날짜 ("최근 N년" 변환 결과에서 기준일 계산)
+FILTER_GTE_DATE_PATTERN = re.compile(rf'gte\("{DATE_FIELD}","(\d{{4}}-\d{{2}}-\d{{2}})"\)')
+
+STOP_PHRASES = [
+    "이라는 키워드가 포함된", "라는 키워드가 포함된", "키워드가 포함된",
+    "에 관한", "에 대한", "와 관련된", "과 관련된",
+]
+STOP_TOKENS = {
+    "관련", "관련된", "관련한", "특허", "특허를", "특허들", "특허들을", "특허중", "특허가", "중",
+    "보여줘", "보여주세요", "찾아줘", "찾아주세요", "검색해줘", "검색해주세요", "알려줘", "알려주세요",
+    "출원된", "출원한", "등록된", "나온", "것", "것들", "것들을", "이용한", "사용한", "활용한",
+}
+TOPIC_SUFFIXES = ("이라는", "라는", "를", "을", "와")
+# 날짜 패턴으로 해석한 뒤에도 남아 있으면 LLM 으로 위임하는 표현 (해석하지 못한 연도 / 문장 부호 / 날짜 표현)
+UNPARSED_PATTERN = re.compile(
+    rf"\d{{4}}|[,.?!~]|년|월|이후|이전|{RELATIVE_DATE_PATTERN.pattern}|올해|금년|작년|지난해|상반기|하반기"
+)
+# 질의에 있으면 바로 LLM 으로 위임하는 표현 (연대, 부정 조건)
+UNSUPPORTED_PATTERN = re.compile(rf"\d+\s*년대|{NEGATION_PATTERN.pattern}")
+# 주제어 끝에 남으면 LLM 으로 위임하는 주격/보조사 조사 (권리자 등 다른 조건의 주어일 수 있음)
+SUBJECT_PARTICLES = ("가", "이", "은", "는")
+
+# 규칙 변환하면 잘못 해석되므로 LLM 으로 위임되어야 하는 질의 (출원인을 권리자 패턴 외의 표현으로 지정)
+FALLBACK_REGRESSION_QUERIES = [
+    "삼성전자가 출원한 2차전지 특허",
+    "2010년 이후 출원된 배터리 특허 중 LG 것",
+    "2020년 이후 삼성전자 배터리",
+]
+
+
+class FastPathStats:
+    """규칙 기반 변환 성공(hit) / LLM 위임(fallback) 집계"""
+
+    def __init__(self):
+        self.hits = 0
+        self.fallbacks = 0
+        self._lock = threading.Lock()
+
+    def update(self, hit: bool):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.fallbacks += 1
+
+    def to_dict(self) -> dict:
+        total = self.hits + self.fallbacks
+        return {
+            "hits": self.hits,
+            "fallbacks": self.fallbacks,
+            "hitRate": round(self.hits / total, 4) if total else None,
+        }
+
+
+fast_path_stats = FastPathStats()
+
+
+# ElasticsearchTranslator 와 같은 구조의 ES 필터 생성 함수
+def _field(name: str) -> str:
+    return f"metadata.{name}"
+
+
+def _range(op: str, value: str) -> dict:
+    return {"range": {_field(DATE_FIELD): {op: value}}}
+
+
+def _like(field: str, value: str) -> dict:
+    return {"match": {_field(field): {"query": value, "fuzziness": "AUTO"}}}
+
+
+def _and(args: list) -> dict:
+    # LangChain 파서는 인자가 하나인 and/or 를 인자 자체로 바꾼다
+    return args[0] if len(args) == 1 else {"bool": {"must": args}}
+
+
+def _or(args: list) -> dict:
+    return args[0] if len(args) == 1 else {"bool": {"should": args}}
+
+
+def _year_range(year: int, start_month: int = 1, end_month: int = 12) -> list:
+    last_day = calendar.monthrange(year, end_month)[1]
+    return [
+        _range("gte", f"{year:04d}-{start_month:02d}-01"),
+        _range("lte", f"{year:04d}-{end_month:02d}-{last_day:02d}"),
+    ]
+
+
+def _years_ago(anchor: datetime.date, years: int) -> datetime.date:
+    try:
+        return anchor.replace(year=anchor.year - years)
+    except ValueError:
+        # 2월 29일 기준일
+        return anchor.replace(year=anchor.year - years, day=28)
+
+
+def _parse_date_filters(text: str, anchor: datetime.date) -> tuple[list, str]:
+    """날짜 표현을 찾아 range 필터로 바꾸고, 해당 표현을 제거한 텍스트와 함께 반환"""
+    filters = []
+
+    match = MONTH_RANGE_PATTERN.search(text)
+    if match:
+        year, start_month, end_month = (int(g) for g in match.groups())
+        if not 1 <= start_month <= end_month <= 12:
+            raise ValueError(match.group(0))
+        filters.extend(_year_range(year, start_month, end_month))
+        return filters, text.replace(match.group(0), " ")
+
+    match = HALF_PATTERN.search(text)
+    if match:
+        year = int(match.group(1))
+        months = (1, 6) if match.group(2) == "상반기" else (7, 12)
+        filters.extend(_year_range(year, *months))
+        return filters, text.replace(match.group(0), " ")
+
+    match = YEARS_PATTERN.search(text)
+    if match:
+        filters.append(_or([_and(_year_range(int(year))) for year in match.groups()]))
+        return filters, text.replace(match.group(0), " ")
+
+    for pattern in (AFTER_PATTERN, BEFORE_PATTERN, RECENT_PATTERN):
+        for match in list(pattern.finditer(text)):
+            value = int(match.group(1))
+            if pattern is AFTER_PATTERN:
+                filters.append(_range("gte", f"{value:04d}-01-01"))
+            elif pattern is BEFORE_PATTERN:
+                if match.group(2) == "까지":
+                    filters.append(_range("lte", f"{value:04d}-12-31"))
+                else:
+                    filters.append(_range("lt", f"{value:04d}-01-01"))
+            else:
+                filters.append(_range("gte", _years_ago(anchor, value).isoformat()))
+            text = text.replace(match.group(0), " ")
+    if filters:
+        return filters, text
+
+    match = YEAR_PATTERN.search(text)
+    if match:
+        filters.extend(_year_range(int(match.group(1))))
+        return filters, text.replace(match.group(0), " ")
+    return filters, text
+
+
+def _extract_topic(text: str) -> Optional[str]:
+    for phrase in STOP_PHRASES:
+        text = text.replace(phrase, " ")
+    tokens = []
+    for token in text.split():
+        if token in STOP_TOKENS:
+            continue
+        for suffix in TOPIC_SUFFIXES:
+            if token.endswith(suffix) and len(token) > len(suffix) + 1:
+                token = token[: -len(suffix)]
+                break
+        if token not in STOP_TOKENS:
+            tokens.append(token)
+    if not tokens or len(tokens) > MAX_TOPIC_TOKENS:
+        return None
+    topic = " ".join(tokens)
+    if UNPARSED_PATTERN.search(topic):
+        return None
+    # 회사/기관명, 영문 토큰이나 주어 조사가 남아 있으면 권리자 조건을 주제어로 잘못 해석했을 수 있음
+    if _entities(topic):
+        return None
+    if any(len(token) > 1 and token.endswith(SUBJECT_PARTICLES) for token in tokens):
+        return None
+    return topic
+
+
+def parse_nl_query(query: str, anchor_date: Optional[datetime.date] = None) -> Optional[dict]:
+    """규칙으로 자연어 질의를 ES 쿼리로 변환
+
+    Args:
+        query (str): 자연어 질의
+        anchor_date (datetime.date, optional): 상대 날짜("최근 N년") 기준일. Defaults to 오늘.
+
+    Returns:
+        dict: generate_es_query_from_nl_query 와 같은 형식의 결과 (확실하게 변환할 수 없으면 None)
+    """
+    text = normalize_text(query)
+    if len(text) > MAX_QUERY_LENGTH or UNSUPPORTED_PATTERN.search(text):
+        return None
+    try:
+        date_filters, text = _parse_date_filters(text, anchor_date or datetime.date.today())
+    except ValueError:
+        return None
+
+    applicant = None
+    match = APPLICANT_PATTERN.search(text)
+    if match:
+        applicant = match.group(1)
+        text = text.replace(match.group(0), " ")
+
+    topic = _extract_topic(text)
+    if topic is None:
+        return None
+
+    filters = date_filters
+    if applicant:
+        filters.append(_like(APPLICANT_FIELD, applicant))
+    filters.append(_or([_like(field, topic) for field in TOPIC_FIELDS]))
+    keywords = f"{topic},{applicant}" if applicant else topic
+    return {"status": "success", "filter": [_and(filters)], "keywords": keywords}
+
+
+def _canonical(es_filter) -> str:
+    """비교를 위해 리스트 순서를 무시한 정규화 문자열"""
+    def sort(value):
+        if isinstance(value, dict):
+            return {key: sort(v) for key, v in value.items()}
+        if isinstance(value, list):
+            return sorted((sort(v) for v in value), key=lambda v: json.dumps(v, ensure_ascii=False, sort_keys=True))
+        return value
+
+    return json.dumps(sort(es_filter), ensure_ascii=False, sort_keys=True)
+
+
+def few_shot_anchor_date(examples: list) -> datetime.date:
+    """few-shot 예시가 작성된 기준일
+
+    "최근 N년" 예시의 filter 날짜에 N 년을 더해서 구한다.
+
+    Args:
+        examples (list): PATENT_QUERY_FEW_SHOT_EXAMPLES 형식의 (질의, 출력) 목록
+
+    Returns:
+        datetime.date: 기준일
+    """
+    for query, output in examples:
+        recent = RECENT_PATTERN.search(normalize_text(query))
+        date = FILTER_GTE_DATE_PATTERN.search(output["filter"])
+        if recent and date:
+            return _years_ago(datetime.date.fromisoformat(date.group(1)), -int(recent.group(1)))
+    raise ValueError("few-shot 예시에 '최근 N년' 질의가 없습니다")
+
+
+def validate_few_shot_examples(anchor_date: Optional[datetime.date] = None) -> dict:
+    """PATENT_QUERY_FEW_SHOT_EXAMPLES 로 규칙 변환 결과 검증
+
+    예시의 filter 문자열을 LangChain 파서와 ElasticsearchTranslator 로 변환한 결과와 비교하고,
+    FALLBACK_REGRESSION_QUERIES 가 LLM 으로 위임되는지 확인한다.
+
+    Args:
+        anchor_date (datetime.date, optional): 상대 날짜 기준일. Defaults to 예시에서 계산한 기준일.
+
+    Returns:
+        dict: 예시별 결과와 fast path 비율 / 일치율, 위임 회귀 케이스 결과
+    """
+    from langchain.chains.query_constructor.parser import get_parser
+    from langchain.retrievers.self_query.elasticsearch import ElasticsearchTranslator
+    from app.common.patent.base.prompts import PATENT_QUERY_FEW_SHOT_EXAMPLES
+
+    anchor_date = anchor_date or few_shot_anchor_date(PATENT_QUERY_FEW_SHOT_EXAMPLES)
+    parser = get_parser()
+    translator = ElasticsearchTranslator()
+    rows = []
+    for query, output in PATENT_QUERY_FEW_SHOT_EXAMPLES:
+        row = {"query": query, "parsed": False, "filterMatch": None, "keywordsMatch": None}
+        result = parse_nl_query(query, anchor_date)
+        if result is not None:
+            row["parsed"] = True
+            row["keywords"] = result["keywords"]
+            row["keywordsMatch"] = result["keywords"] == output["query"]
+            try:
+                expected = parser.parse(output["filter"]).accept(translator)
+                row["filterMatch"] = _canonical(result["filter"][0]) == _canonical(expected)
+                if not row["filterMatch"]:
+                    row["expected"] = expected
+                    row["actual"] = result["filter"][0]
+            except Exception as e:
+                row["expectedError"] = str(e)
+        rows.append(row)
+
+    parsed = [row for row in rows if row["parsed"]]
+    matched = [row for row in parsed if row["filterMatch"]]
+    fallbacks = [
+        {"query": query, "fallback": parse_nl_query(query, anchor_date) is None}
+        for query in FALLBACK_REGRESSION_QUERIES
+    ]
+    return {
+        "anchorDate": anchor_date.isoformat(),
+        "examples": rows,
+        "fastPathRate": round(len(parsed) / len(rows), 4),
+        "filterMatchRate": round(len(matched) / len(parsed), 4) if parsed else None,
+        "fallbackCases": fallbacks,
+        "fallbackCasesPassed": all(row["fallback"] for row in fallbacks),
+    }
+
+
+if __name__ == "__main__":
+    print(json.dumps(validate_few_shot_examples(), ensure_ascii=False, indent=4))
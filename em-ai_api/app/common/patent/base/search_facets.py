@@ -0,0 +1,83 @@
+"""검색 결과 facet (출원 연도 / 권리자 / IPC 분포)
+
+kNN 검색에 aggregation 을 추가하면 ES 는 가장 가까운 k 개 문서에 대해 집계하므로, 결과 hit 은 size 개만 받으면서
+상위 k(facetSize)개 문서의 분포를 같은 요청으로 받는다.
+- year, lrhName: ES aggregation (date_histogram, terms). aggregation 결과가 없으면(로컬 인덱스) hit 으로 계산
+- ipc: metadata.ipcs 는 여러 코드를 담은 문자열이라 terms 집계가 불가능하므로 hit 의 IPC 를 정규화해서 계산
+  (ipc facet 을 요청하면 상위 facetSize 개 hit 을 받는다)
+"""
+from collections import Counter
+from typing import Optional
+
+from app.common.patent.base.ipc_codes import parse_ipcs, truncate_ipc
+
+FACET_NAMES = ["year", "lrhName", "ipc"]
+# ES aggregation 으로 계산하는 facet
+AGG_FACETS = ["year", "lrhName"]
+
+
+def facet_aggs(facets: dict) -> Optional[dict]:
+    """facet 옵션의 ES aggregation 절 (집계할 facet 이 없으면 None)"""
+    aggs = {}
+    if "year" in facets["names"]:
+        aggs["year"] = {
+            "date_histogram": {
+                "field": "metadata.applicate_date",
+                "calendar_interval": "year",
+                "format": "yyyy",
+                "min_doc_count": 1,
+            }
+        }
+    if "lrhName" in facets["names"]:
+        aggs["lrhName"] = {"terms": {"field": "metadata.lrh_name.keyword", "size": facets["buckets"]}}
+    return aggs or None
+
+
+def needs_hits(facets: Optional[dict], aggregates: bool) -> bool:
+    """facet 계산에 상위 facetSize 개 hit 이 필요한지 (aggregation 을 쓰지 못하거나 ipc facet 을 요청한 경우)"""
+    if facets is None:
+        return False
+    return not aggregates or any(name not in AGG_FACETS for name in facets["names"])
+
+
+def _buckets(counter: Counter, limit: Optional[int], by_value: bool = False) -> list[dict]:
+    items = sorted(counter.items()) if by_value else sorted(counter.items(), key=lambda item: (-item[1], item[0]))
+    return [{"value": value, "count": count} for value, count in items[:limit]]
+
+
+def build_facets(es_result: dict, hits: list, facets: dict) -> dict:
+    """검색 결과의 facet (연도는 전체 오름차순, 나머지는 문서 수 내림차순 상위 buckets 개)
+
+    Args:
+        es_result (dict): Elasticsearch 검색 결과 (aggregations 포함)
+        hits (list): 상위 hit (aggregation 이 없는 facet 계산용, facetSize 개까지 사용)
+        facets (dict): facet 옵션 {"names", "size", "buckets", "ipc_level"}
+
+    Returns:
+        dict: {facet 이름: [{"value", "count"}]}
+    """
+    aggregations = es_result.get("aggregations", {})
+    sources = [hit["_source"].get("metadata", {}) for hit in hits[: facets["size"]]]
+    result = {}
+    for name in facets["names"]:
+        if name in aggregations:
+            buckets = aggregations[name]["buckets"]
+            result[name] = [
+                {"value": bucket.get("key_as_string", bucket["key"]), "count": bucket["doc_count"]}
+                for bucket in (buckets if name == "year" else buckets[: facets["buckets"]])
+            ]
+        elif name == "year":
+            years = Counter(str(source["applicate_date"])[:4] for source in sources if source.get("applicate_date"))
+            result[name] = _buckets(years, None, by_value=True)
+        elif name == "lrhName":
+            result[name] = _buckets(
+                Counter(source["lrh_name"] for source in sources if source.get("lrh_name")), facets["buckets"]
+            )
+        elif name == "ipc":
+            codes = Counter(
+                code
+                for source in sources
+                for code in {truncate_ipc(ipc, facets["ipc_level"]) for ipc in parse_ipcs(source.get("ipcs"))}
+            )
+            result[name] = _buckets(codes, facets["buckets"])
+    return result
@@ -0,0 +1,81 @@
+"""특허 kNN 검색 응답 크기 / 지연 시간 비교 (전체 _source vs metadata 필드 projection + filter_path)
+
+응답 크기는 응답 본문을 JSON 으로 다시 직렬화한 바이트 수(압축 전)이며,
+지연 시간은 요청부터 응답 파싱까지의 평균이다. 질의 벡터는 인덱스 문서의 embedding 을 임의로 추출해 사용한다.
+
+Usage:
+    python -m app.common.patent.base.search_payload_report --sizes 10 50 100 --queries 30
+"""
+import json
+import time
+import asyncio
+import argparse
+from typing import Optional, Text
+
+SIZES = [10, 50, 100]
+
+
+def payload_bytes(result) -> int:
+    body = result.body if hasattr(result, "body") else result
+    return len(json.dumps(body, ensure_ascii=False).encode("utf-8"))
+
+
+async def measure_payloads(
+    sizes: list[int] = SIZES, n_queries: int = 30, index: Optional[Text] = None, column_names: Optional[list] = None
+) -> list[dict]:
+    from app.common.patent.base.es_client import es_client_pool
+    from app.common.patent.patent_utils.patent_search_utils import (
+        INDEX_NAME,
+        VECTOR_FIELD,
+        COLUMN_NAMES1,
+        HIT_FILTER_PATH,
+    )
+
+    index = index or INDEX_NAME
+    column_names = column_names or COLUMN_NAMES1
+    variants = {
+        "full": {},
+        "projected": {
+            "source_includes": [f"metadata.{column}" for column in column_names],
+            "filter_path": HIT_FILTER_PATH,
+        },
+    }
+    report = []
+    async with es_client_pool.acquire() as es:
+        sample = await es.search(
+            index=index,
+            size=n_queries,
+            query={"function_score": {"random_score": {"seed": 42, "field": "_seq_no"}}},
+            source_includes=[VECTOR_FIELD],
+        )
+        vectors = [hit["_source"][VECTOR_FIELD] for hit in sample["hits"]["hits"]]
+        for size in sizes:
+            row = {"size": size, "queries": len(vectors)}
+            for name, kwargs in variants.items():
+                total_bytes = 0
+                total_time = 0.0
+                for vector in vectors:
+                    knn = {"field": VECTOR_FIELD, "query_vector": vector, "k": size, "num_candidates": max(100, size * 5)}
+                    start = time.perf_counter()
+                    result = await es.search(index=index, knn=knn, size=size, **kwargs)
+                    total_time += time.perf_counter() - start
+                    total_bytes += payload_bytes(result)
+                n = max(1, len(vectors))
+                row[f"{name}AvgBytes"] = total_bytes // n
+                row[f"{name}AvgMs"] = round(total_time / n * 1000, 2)
+            if row["fullAvgBytes"]:
+                row["bytesReduction"] = round(1 - row["projectedAvgBytes"] / row["fullAvgBytes"], 4)
+            report.append(row)
+    await es_client_pool.close()
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="특허 검색 응답 크기 / 지연 시간 비교")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--queries", type=int, default=30)
+    parser.add_argument("--index", help="대상 인덱스 (생략 시 서비스 인덱스)")
+    args = parser.parse_args()
+
+    for row in asyncio.run(measure_payloads(args.sizes, args.queries, args.index)):
+        print(json.dumps(row, ensure_ascii=False))
@@ -0,0 +1,174 @@
+import json
+import time
+import asyncio
+import datetime
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional
+
+from app.config.settings import SEARCH_RESULT_CACHE_SETTINGS
+from app.common.patent.base.embedding_cache import normalize_text
+from app.common.patent.base.query_cache import RELATIVE_DATE_PATTERN
+
+
+async def fetch_index_version(es, index: str) -> str:
+    """검색 인덱스 버전 (alias 가 가리키는 실제 인덱스 uuid + 문서 수 + 색인/삭제 누적 횟수)
+
+    alias 교체, 문서 추가/삭제가 있으면 값이 바뀐다. 로컬 인덱스는 manifest 의 생성 시각과 문서 수를 사용한다.
+    """
+    manifest = getattr(es, "manifest", None)
+    if manifest is not None:
+        return f"local:{manifest['created_at']}:{manifest['count']}"
+    stats = await es.indices.stats(
+        index=index,
+        metric=["docs", "indexing"],
+        filter_path=[
+            "indices.*.uuid",
+            "indices.*.primaries.docs.count",
+            "indices.*.primaries.indexing.index_total",
+            "indices.*.primaries.indexing.delete_total",
+        ],
+    )
+    parts = []
+    for name, info in sorted(stats["indices"].items()):
+        primaries = info["primaries"]
+        parts.append(
+            f"{name}:{info['uuid']}:{primaries['docs']['count']}"
+            f":{primaries['indexing']['index_total']}:{primaries['indexing']['delete_total']}"
+        )
+    return "|".join(parts)
+
+
+class SearchResultCache:
+    """검색 응답 캐시 (TTL + 크기 제한 LRU + 인덱스 버전 무효화 + 동시 미스 단일화)
+
+    키는 (엔드포인트, 정규화 질의, 모드, 결과 수, 결과 필드, 기타 옵션, 인덱스 버전) 이다.
+    인덱스 버전은 version_check_interval 초마다 한 번만 조회하며, 바뀌면 캐시 전체를 비운다.
+    같은 키의 미스가 동시에 들어오면 첫 요청만 검색(임베딩, LLM, ES)을 수행하고 나머지는 그 결과를 기다린다.
+    성공한 응답(is_cacheable)만 저장하며, 캐시된 응답 dict 는 여러 요청이 공유하므로 수정하지 않는다.
+    """
+
+    def __init__(
+        self,
+        max_items: int = SEARCH_RESULT_CACHE_SETTINGS["max_items"],
+        ttl: float = SEARCH_RESULT_CACHE_SETTINGS["ttl"],
+        version_check_interval: float = SEARCH_RESULT_CACHE_SETTINGS["version_check_interval"],
+        is_cacheable: Optional[Callable[[dict], bool]] = None,
+    ):
+        self.max_items = max_items
+        self.is_cacheable = is_cacheable or (lambda response: response.get("status") == "success")
+        self.ttl = ttl
+        self.version_check_interval = version_check_interval
+        self.entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self.in_flight: dict[str, asyncio.Task] = {}
+        # 검색 백엔드(ES / 로컬 인덱스)별 인덱스 버전, 확인 시각, 진행 중인 조회
+        self.index_versions: dict[str, str] = {}
+        self.version_checked_at: dict[str, float] = {}
+        self._version_checks: dict[str, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.expired = 0
+        self.invalidations = 0
+
+    async def get_index_version(self, es, index: str) -> str:
+        """인덱스 버전 조회 (백엔드별로 주기마다 한 번, 동시 요청은 같은 조회를 기다림)
+
+        버전이 바뀌면 캐시를 모두 비운다 (이전 버전 키는 어차피 다시 조회되지 않음).
+        """
+        source = f"{type(es).__name__}:{index}"
+        current = self.index_versions.get(source)
+        if current is not None and time.time() - self.version_checked_at[source] < self.version_check_interval:
+            return current
+        check = self._version_checks.get(source)
+        if check is None or check.done():
+            check = self._version_checks[source] = asyncio.ensure_future(fetch_index_version(es, index))
+        version = await asyncio.shield(check)
+        self.version_checked_at[source] = time.time()
+        if version != self.index_versions.get(source):
+            if source in self.index_versions:
+                self.invalidations += 1
+                self.entries.clear()
+            self.index_versions[source] = version
+        return version
+
+    @staticmethod
+    def make_key(endpoint: str, query: str, index_version: str, **options) -> str:
+        return json.dumps(
+            [endpoint, normalize_text(query), index_version, options], ensure_ascii=False, sort_keys=True, default=str
+        )
+
+    def _expires_at(self, query: str, now: float) -> float:
+        # "최근 5년" 처럼 상대 날짜가 있는 질의는 날짜가 바뀌면 결과가 달라지므로 당일 자정까지만 저장
+        if RELATIVE_DATE_PATTERN.search(normalize_text(query)):
+            tomorrow = datetime.datetime.combine(datetime.date.today() + datetime.timedelta(days=1), datetime.time())
+            return min(now + self.ttl, tomorrow.timestamp())
+        return now + self.ttl
+
+    def get(self, key: str) -> Optional[dict]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if expires_at <= time.time():
+            del self.entries[key]
+            self.expired += 1
+            return None
+        self.entries.move_to_end(key)
+        return response
+
+    def put(self, key: str, query: str, response: dict):
+        if not self.is_cacheable(response):
+            return
+        self.entries[key] = (self._expires_at(query, time.time()), response)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_items:
+            self.entries.popitem(last=False)
+
+    async def get_or_compute(self, key: str, query: str, compute: Callable[[], Awaitable[dict]]) -> dict:
+        """캐시된 응답 반환, 없으면 compute() 결과를 저장 후 반환 (같은 키의 동시 미스는 한 번만 실행)
+
+        Args:
+            key (str): make_key 로 만든 캐시 키
+            query (str): 검색 질의 (TTL 결정용)
+            compute (Callable): 검색 응답을 반환하는 coroutine 함수
+
+        Returns:
+            dict: 검색 응답
+        """
+        response = self.get(key)
+        if response is not None:
+            self.hits += 1
+            return response
+        task = self.in_flight.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            # 첫 요청이 취소되어도 기다리는 요청이 결과를 받을 수 있도록 별도 task 로 실행
+            task = asyncio.ensure_future(self._compute(key, query, compute))
+            task.add_done_callback(lambda t: t.cancelled() or t.exception())
+            self.in_flight[key] = task
+        return await asyncio.shield(task)
+
+    async def _compute(self, key: str, query: str, compute: Callable[[], Awaitable[dict]]) -> dict:
+        try:
+            response = await compute()
+            self.put(key, query, response)
+            return response
+        finally:
+            self.in_flight.pop(key, None)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "items": len(self.entries),
+            "maxItems": self.max_items,
+            "ttl": self.ttl,
+            "indexVersions": self.index_versions,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "expired": self.expired,
+            "invalidations": self.invalidations,
+            "hitRate": round((self.hits + self.coalesced) / lookups, 4) if lookups else None,
+        }
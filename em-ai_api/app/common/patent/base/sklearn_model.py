@@ -72,6 +72,18 @@ class SklearnModel(ABC):
             self.logger.error(f"Exception : {e}")
             print(f"Exception : {e}\n{traceback.format_exc()}")
 
+    def warmup(self):
+        """로드된 모델로 합성 입력 추론을 1회 수행
+
+        Raises:
+            RuntimeError: 모델 로드에 실패한 경우
+        """
+        if not hasattr(self, "model"):
+            raise RuntimeError(self.response_model["message"])
+        n_features = getattr(self.model, "n_features_in_", None)
+        if n_features:
+            self.model.predict(np.zeros((1, n_features)))
+
     def get_embedding(self, text_list: list[str]) -> np.ndarray:
         embedding = requests.post(EMBEDDING_URL, json={"query_message": text_list})
         embedding = json.loads(embedding.text)["embedding_vector"]
@@ -0,0 +1,203 @@
+"""특허 벡터 양자화(int8 / binary) 및 양자화 검색 벤치마크
+
+후보 생성은 양자화된 벡터로 하고, 상위 후보만 float 벡터로 다시 점수를 계산(rescoring)한다.
+- int8   : 차원별 scale(최대 절댓값 / 127)로 대칭 양자화, 벡터당 dim 바이트
+- binary : 부호 비트만 저장, 벡터당 dim / 8 바이트, 점수는 dim - 2 * hamming 거리
+
+Usage:
+    python -m app.common.patent.base.vector_quantization benchmark --index-dir /opt/patent_index
+    python -m app.common.patent.base.vector_quantization es-benchmark --es-index em_ai_patent_vector_index_int8
+"""
+import json
+import time
+import asyncio
+import argparse
+from typing import Optional, Text
+
+import numpy as np
+
+QUANTIZATIONS = ["none", "int8", "binary"]
+CHUNK_SIZE = 65536
+# 바이트별 1 비트 수
+POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+def compute_int8_scale(vectors: np.ndarray) -> np.ndarray:
+    """차원별 int8 양자화 scale (최대 절댓값 / 127)"""
+    max_abs = np.zeros(vectors.shape[1], dtype=np.float32)
+    for start in range(0, len(vectors), CHUNK_SIZE):
+        chunk = np.abs(np.asarray(vectors[start: start + CHUNK_SIZE], dtype=np.float32))
+        max_abs = np.maximum(max_abs, chunk.max(axis=0))
+    return np.maximum(max_abs, 1e-12) / 127
+
+
+def quantize_int8(vectors: np.ndarray, scale: np.ndarray) -> np.ndarray:
+    return np.clip(np.rint(vectors / scale), -127, 127).astype(np.int8)
+
+
+def quantize_binary(vectors: np.ndarray) -> np.ndarray:
+    return np.packbits(np.asarray(vectors) > 0, axis=-1)
+
+
+def int8_scores(codes: np.ndarray, query_vector: np.ndarray, scale: np.ndarray) -> np.ndarray:
+    """int8 코드와 질의 벡터의 근사 내적"""
+    return codes.astype(np.float32) @ (query_vector * scale)
+
+
+def binary_scores(codes: np.ndarray, query_bits: np.ndarray, dim: int) -> np.ndarray:
+    """binary 코드와 질의 부호 비트의 근사 유사도 (dim - 2 * hamming, 클수록 가까움)"""
+    hamming = POPCOUNT_TABLE[np.bitwise_xor(codes, query_bits)].sum(axis=1, dtype=np.int32)
+    return (dim - 2 * hamming).astype(np.float32)
+
+
+def bytes_per_vector(quantization: Text, dim: int = 1024) -> int:
+    """벡터 1개가 후보 생성 단계에서 차지하는 메모리 (바이트)"""
+    return {"none": 4 * dim, "int8": dim, "binary": dim // 8}[quantization]
+
+
+def es_rescore(query_vector: list, window_size: int, field: Text = "embedding") -> dict:
+    """양자화 인덱스의 kNN 후보를 float 벡터로 다시 점수 계산하는 rescore 절 (점수는 ES cosine 과 같은 스케일)"""
+    return {
+        "window_size": window_size,
+        "query": {
+            "rescore_query": {
+                "script_score": {
+                    "query": {"match_all": {}},
+                    "script": {
+                        "source": f"(cosineSimilarity(params.query_vector, '{field}') + 1.0) / 2",
+                        "params": {"query_vector": query_vector},
+                    },
+                }
+            },
+            "query_weight": 0.0,
+            "rescore_query_weight": 1.0,
+        },
+    }
+
+
+def exact_top_k(vectors: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """float 벡터 전체 탐색으로 정답 top-k 행 번호 계산"""
+    best_scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+    best_rows = np.zeros((len(queries), k), dtype=np.int64)
+    for start in range(0, len(vectors), CHUNK_SIZE):
+        scores = queries @ np.asarray(vectors[start: start + CHUNK_SIZE], dtype=np.float32).T
+        rows = np.arange(start, start + scores.shape[1])
+        merged_scores = np.concatenate([best_scores, scores], axis=1)
+        merged_rows = np.concatenate([best_rows, np.broadcast_to(rows, scores.shape)], axis=1)
+        top = np.argsort(-merged_scores, axis=1)[:, :k]
+        best_scores = np.take_along_axis(merged_scores, top, axis=1)
+        best_rows = np.take_along_axis(merged_rows, top, axis=1)
+    return best_rows
+
+
+def benchmark_local(index_dir: Text, n_queries: int = 200, k: int = 10, noise: float = 0.05, seed: int = 42) -> list[dict]:
+    """로컬 인덱스의 양자화 방식별 메모리 / QPS / recall@k (float 전체 탐색 대비)
+
+    질의는 인덱스 벡터에 잡음을 더해 만든다.
+    """
+    from app.common.patent.base.local_vector_index import LocalVectorIndex, normalize_rows
+
+    base = LocalVectorIndex(index_dir)
+    dim = base.manifest["dim"]
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(base.manifest["count"], n_queries, replace=False)
+    queries = normalize_rows(
+        np.asarray(base.vectors[np.sort(rows)]) + noise * rng.normal(size=(n_queries, dim)).astype(np.float32)
+    )
+    truth = exact_top_k(base.vectors, queries, k)
+
+    report = []
+    for quantization in QUANTIZATIONS:
+        index = LocalVectorIndex(index_dir, quantization=quantization)
+        start = time.perf_counter()
+        results = [index.knn(query, k, num_candidates=k * 10) for query in queries]
+        elapsed = time.perf_counter() - start
+        recall = np.mean([
+            len({row for row, _ in result} & set(truth[i].tolist())) / k for i, result in enumerate(results)
+        ])
+        report.append({
+            "quantization": quantization,
+            "memoryPerMillionMb": round(bytes_per_vector(quantization, dim) * 1e6 / 2**20, 1),
+            "qps": round(n_queries / elapsed, 1),
+            f"recall@{k}": round(float(recall), 4),
+        })
+    return report
+
+
+async def benchmark_es(
+    es_index: Text, base_index: Optional[Text] = None, n_queries: int = 100, k: int = 10, rescore_factor: int = 4
+) -> dict:
+    """양자화 ES 인덱스(+rescore)를 현재 float 인덱스와 비교 (질의 벡터는 float 인덱스에서 임의로 추출)"""
+    from app.common.patent.base.es_client import es_client_pool
+    from app.common.patent.base.es_index import get_index_quantization
+    from app.common.patent.patent_utils.patent_search_utils import INDEX_NAME, VECTOR_FIELD
+
+    base_index = base_index or INDEX_NAME
+    timings = {base_index: 0.0, es_index: 0.0}
+    recalls = []
+    async with es_client_pool.acquire() as es:
+        quantizations = {}
+        for index in (base_index, es_index):
+            mappings = await es.indices.get_mapping(index=index)
+            quantizations[index] = get_index_quantization(next(iter(mappings.values()))["mappings"], VECTOR_FIELD)
+        sample = await es.search(
+            index=base_index,
+            size=n_queries,
+            query={"function_score": {"random_score": {"seed": 42, "field": "_seq_no"}}},
+            source_includes=[VECTOR_FIELD],
+        )
+        for hit in sample["hits"]["hits"]:
+            vector = hit["_source"][VECTOR_FIELD]
+            ids = {}
+            for index, kwargs in (
+                (base_index, {"knn": {"field": VECTOR_FIELD, "query_vector": vector, "k": k, "num_candidates": 100}}),
+                (es_index, {
+                    "knn": {
+                        "field": VECTOR_FIELD, "query_vector": vector,
+                        "k": k * rescore_factor, "num_candidates": max(100, k * rescore_factor),
+                    },
+                    "rescore": es_rescore(vector, k * rescore_factor, VECTOR_FIELD),
+                }),
+            ):
+                start = time.perf_counter()
+                result = await es.search(index=index, size=k, source=False, **kwargs)
+                timings[index] += time.perf_counter() - start
+                ids[index] = {h["_id"] for h in result["hits"]["hits"]}
+            if ids[base_index]:
+                recalls.append(len(ids[base_index] & ids[es_index]) / len(ids[base_index]))
+    await es_client_pool.close()
+
+    n = max(1, len(recalls))
+    return {
+        "baseIndex": base_index,
+        "quantizedIndex": es_index,
+        "baseQuantization": quantizations[base_index],
+        "quantization": quantizations[es_index],
+        "baseMemoryPerMillionMb": round(bytes_per_vector(quantizations[base_index]) * 1e6 / 2**20, 1),
+        "memoryPerMillionMb": round(bytes_per_vector(quantizations[es_index]) * 1e6 / 2**20, 1),
+        f"recall@{k}": round(float(np.mean(recalls)), 4) if recalls else None,
+        "baseQps": round(n / timings[base_index], 1) if timings[base_index] else None,
+        "quantizedQps": round(n / timings[es_index], 1) if timings[es_index] else None,
+    }
+
+
+if __name__ == "__main__":
+    from app.config.settings import LOCAL_INDEX_DIR
+
+    parser = argparse.ArgumentParser(description="양자화 벡터 검색 벤치마크")
+    parser.add_argument("command", choices=["benchmark", "es-benchmark"])
+    parser.add_argument("--index-dir", default=LOCAL_INDEX_DIR)
+    parser.add_argument("--es-index", help="비교할 양자화 ES 인덱스")
+    parser.add_argument("--base-index", help="기준 float ES 인덱스 (생략 시 서비스 인덱스)")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.command == "benchmark":
+        for row in benchmark_local(args.index_dir, args.queries, args.k):
+            print(json.dumps(row, ensure_ascii=False))
+    else:
+        if not args.es_index:
+            parser.error("--es-index 를 지정해야 합니다.")
+        report = asyncio.run(benchmark_es(args.es_index, args.base_index, args.queries, args.k))
+        print(json.dumps(report, ensure_ascii=False, indent=4))
@@ -1,8 +1,10 @@
+import os
+import asyncio
 import traceback
+from typing import AsyncIterator, Awaitable, Callable, Optional
 from contextlib import asynccontextmanager
 
 from icecream import ic
-from FlagEmbedding import BGEM3FlagModel
 from elasticsearch import (
     AsyncElasticsearch,
     ApiError,
@@ -14,10 +16,42 @@ from elasticsearch import (
 )
 
 from app.common.core.utils import debug_ic, snake_to_camel
-from app.config.settings import ES_CLOUD_ID, ES_API_KEY
+from app.common.core.hf_hub_utils import resolve_model_path
+from app.common.patent.base.es_client import es_client_pool
+from app.common.patent.base.embedding_cache import EmbeddingCache, normalize_text
+from app.common.patent.base.embedding_service import EmbeddingService
+from app.common.patent.base.query_cache import QueryTranslationCache, rebase_relative_dates
+from app.common.patent.base.vector_quantization import es_rescore
+from app.common.patent.base.ipc_codes import build_ipc_network
+from app.common.patent.base.hs_code_index import HsCodeIndex
+from app.common.patent.base.search_result_cache import SearchResultCache
+from app.common.patent.base.date_partitions import DatePartitionRouter
+from app.common.patent.base.knn_autotuner import CandidatePolicy
+from app.common.patent.base.search_facets import build_facets, facet_aggs, needs_hits
+from app.common.patent.base.patent_columns import COLUMN_NAMES1, COLUMN_NAMES2, RETRIEVAL_COLUMNS
+from app.common.patent.base.prompts import PATENT_QUERY_ANCHOR_DATE
+from app.common.patent.base.rule_query_parser import parse_nl_query, fast_path_stats
+from app.config.settings import (
+    EMBEDDING_BACKEND,
+    QUERY_CACHE_SETTINGS,
+    NL_FAST_PATH_ENABLED,
+    NL_SPECULATION_ENABLED,
+    SEARCH_BACKEND,
+    IPC_NETWORK_SEARCH_BACKEND,
+    ES_VECTOR_QUANTIZATION,
+    VECTOR_RESCORE_FACTOR,
+    BULK_SEARCH_SETTINGS,
+    HS_CODE_PATH,
+    SEARCH_RESULT_CACHE_SETTINGS,
+    RETRIEVAL_STORE_SETTINGS,
+    PATENT_INDEX_NAME,
+    DATE_PARTITION_SETTINGS,
+    KNN_CANDIDATE_POLICY_SETTINGS,
+)
 from app.config.custom_errors import ModelPredictionError
-from app.common.patent.base.patent_query_generator import generate_es_query_from_nl_query
 from app.config.custom_errors import DataNotFoundError
+from app.config.custom_errors import UnsupportedFilterError
+from app.config.custom_errors import HsCodeNotFoundError
 from app.config.ai_status_code import (
     ModelExecutionError,
     ServiceInternalError,
@@ -25,20 +59,20 @@ from app.config.ai_status_code import (
 )
 
 # 상수 정의
-INDEX_NAME = "em_ai_patent_vector_index_v1"
+EMBEDDING_MODEL_ID = "BAAI/bge-m3"
+EMBEDDING_DIM = 1024
+INDEX_NAME = PATENT_INDEX_NAME
 VECTOR_FIELD = "embedding"
 TEXT_FIELD = "text"
-COLUMN_NAMES1 = [
-    "applicate_number",
-    "applicate_date",
-    "applicate_nation",
-    "invention_title",
-    "ipcs",
-    "register_number",
-    "lrh_name",
-]
-COLUMN_NAMES2 = ["applicate_number", "invention_title", "ipcs"]
 SEARCH_SIZE = 10
+# facet 을 hit 으로 계산할 때 필요한 필드
+FACET_COLUMNS = ["applicate_date", "lrh_name", "ipcs"]
+# Elasticsearch kNN 의 k / num_candidates 최댓값
+MAX_KNN_CANDIDATES = 10000
+# 검색 응답에서 hit 의 _id, _score, _source 만 받는다 (took, _shards, _index 등 제외)
+HIT_FILTER_PATH = ["hits.hits._id", "hits.hits._score", "hits.hits._source"]
+MSEARCH_FILTER_PATH = [f"responses.{path}" for path in HIT_FILTER_PATH] + ["responses.error", "responses.status"]
+WARMUP_QUERY = "반도체 검사용 초음파 장치"
 
 NOT_STRING_ERROR_MSG = "입력값이 문자열이 아닙니다."
 NO_INPUT_ERROR_MSG = "입력값이 없습니다."
@@ -50,47 +84,382 @@ ES_TIMEOUT_ERROR_MSG = "Elasticsearch 연결 시간이 초과되었습니다."
 ES_AUTH_ERROR_MSG = "Elasticsearch 인증 에러가 발생했습니다."
 ES_AUTHZ_ERROR_MSG = "Elasticsearch 권한 에러가 발생했습니다."
 ES_DATA_NOT_FOUND_MSG = "검색 결과가 없습니다."
+IPC_NETWORK_FAIL_MSG = "[IPC 네트워크]"
 
 
 def _get_embedding_model(model_name):
-    return BGEM3FlagModel(model_name, use_fp16=False, device="cpu")
+    if EMBEDDING_BACKEND == "onnx":
+        from app.common.patent.base.onnx_encoder import OnnxBgeM3Encoder, get_onnx_model_dir
+
+        return OnnxBgeM3Encoder(get_onnx_model_dir(model_name))
+
+    # FlagEmbedding(torch) 은 모델 로딩 시점에만 import
+    from FlagEmbedding import BGEM3FlagModel
+
+    return BGEM3FlagModel(resolve_model_path(model_name), use_fp16=False, device="cpu")
 
 
 class PatentSearchUtils:
     def __init__(self):
-        self.model = _get_embedding_model("BAAI/bge-m3")
+        self.model = _get_embedding_model(EMBEDDING_MODEL_ID)
+        # 백엔드별로 벡터 값이 조금씩 다르므로 캐시 키에 백엔드를 포함
+        self.embedding_cache = EmbeddingCache(f"{EMBEDDING_MODEL_ID}@{EMBEDDING_BACKEND}", dim=EMBEDDING_DIM)
+        self.embedding_service = EmbeddingService(self.encode_batch)
+        self.query_cache = QueryTranslationCache() if QUERY_CACHE_SETTINGS["enabled"] else None
+        self.result_cache = SearchResultCache() if SEARCH_RESULT_CACHE_SETTINGS["enabled"] else None
+        self.retrieval_store = None
+        if RETRIEVAL_STORE_SETTINGS["enabled"]:
+            # ES 검색 결과는 status 가 없으므로 모두 저장
+            self.retrieval_store = SearchResultCache(
+                max_items=RETRIEVAL_STORE_SETTINGS["max_items"],
+                ttl=RETRIEVAL_STORE_SETTINGS["ttl"],
+                is_cacheable=lambda es_result: True,
+            )
+        self.local_index = None
+        if "local" in (SEARCH_BACKEND, IPC_NETWORK_SEARCH_BACKEND):
+            from app.common.patent.base.local_vector_index import LocalVectorIndex
 
-    @asynccontextmanager
-    async def get_es_client(self):
-        """Elasticsearch 클라이언트를 생성하는 context manager.
+            self.local_index = LocalVectorIndex()
+        self.hs_code_index = HsCodeIndex.from_json(HS_CODE_PATH)
+        self.partition_router = DatePartitionRouter(INDEX_NAME) if DATE_PARTITION_SETTINGS["enabled"] else None
+        self.candidate_policy = None
+        if KNN_CANDIDATE_POLICY_SETTINGS["enabled"] and os.path.exists(KNN_CANDIDATE_POLICY_SETTINGS["path"]):
+            self.candidate_policy = CandidatePolicy.load(KNN_CANDIDATE_POLICY_SETTINGS["path"])
+        self.speculation_hits = 0
+        self.speculation_misses = 0
 
-        Yields:
-            AsyncElasticsearch: Elasticsearch 클라이언트
+    def warmup(self):
+        """합성 질의로 임베딩 모델 추론을 1회 수행"""
+        self.model.encode(WARMUP_QUERY)
+
+    def encode_batch(self, queries: list[str]):
+        """검색 질의 배치 인코딩 (임베딩 서비스의 워커 스레드에서 실행)"""
+        return self.model.encode(queries, batch_size=len(queries))["dense_vecs"]
+
+    async def encode_query(self, query: str):
+        """검색 질의 임베딩 (같은 질의는 캐시된 벡터 재사용)
+
+        캐시에 없으면 임베딩 서비스에서 다른 동시 요청과 배치로 묶어 이벤트 루프 밖에서 인코딩한다.
+
+        Args:
+            query (str): 검색 질의
+
+        Returns:
+            np.ndarray: float32 dense 벡터
+        """
+        vector = self.embedding_cache.get(query)
+        if vector is None:
+            vector = await self.embedding_service.encode(query)
+            self.embedding_cache.put(query, vector)
+        return vector
+
+    async def encode_queries(self, queries: list[str]) -> list:
+        """검색 질의 목록 임베딩 (캐시에 없는 질의만 중복 없이 한 배치로 인코딩)
+
+        Args:
+            queries (list[str]): 검색 질의 목록
+
+        Returns:
+            list[np.ndarray]: 질의 순서대로 float32 dense 벡터
+        """
+        vectors = [self.embedding_cache.get(query) for query in queries]
+        misses = list(dict.fromkeys(query for query, vector in zip(queries, vectors) if vector is None))
+        if misses:
+            encoded = dict(zip(misses, await self.embedding_service.encode_many(misses)))
+            for query, vector in encoded.items():
+                self.embedding_cache.put(query, vector)
+            vectors = [encoded[query] if vector is None else vector for query, vector in zip(queries, vectors)]
+        return vectors
+
+    async def translate_nl_query(self, query: str) -> dict:
+        """자연어 질의를 ES 쿼리(filter, keywords)로 변환
+
+        규칙 기반 변환(fast path) -> 변환 결과 캐시 -> LLM 순으로 시도한다.
+
+        Args:
+            query (str): 자연어 질의
+
+        Returns:
+            dict: {"status", "filter", "keywords"}
         """
-        es = AsyncElasticsearch(
-            cloud_id=ES_CLOUD_ID,
-            api_key=ES_API_KEY,
-            request_timeout=60,
-            retry_on_timeout=True,
-            max_retries=3,
+        # LangChain 쿼리 생성기는 모델 레지스트리에서 별도로 병렬 로딩되므로 지연 import
+        from app.common.patent.base.patent_query_generator import (
+            agenerate_es_query_from_nl_query,
+            get_example_selector,
         )
+
+        if NL_FAST_PATH_ENABLED:
+            result = parse_nl_query(query)
+            fast_path_stats.update(result is not None)
+            if result is not None:
+                return result
+        example_selector = get_example_selector()
+        if self.query_cache is None and example_selector is None:
+            result = await agenerate_es_query_from_nl_query(query)
+            return rebase_relative_dates(query, result, PATENT_QUERY_ANCHOR_DATE)
+        # 질의 원문 벡터는 미리 검색(speculation)과 같은 캐시 항목이라 추가 인코딩 비용이 없다
+        query_vector = await self.encode_query(query)
+        if self.query_cache is not None:
+            result = self.query_cache.get(query, query_vector)
+            if result is not None:
+                return result
+        if example_selector is not None and not example_selector.fitted:
+            # few-shot 예시 질의는 처음 한 번만 임베딩 (토큰 수 계산 인코딩 로드가 이벤트 루프를 막지 않도록 스레드에서 실행)
+            await asyncio.to_thread(example_selector.fit, await self.encode_queries(example_selector.queries))
+        result = await agenerate_es_query_from_nl_query(query, query_vector)
+        if self.query_cache is not None:
+            self.query_cache.put(query, query_vector, result, PATENT_QUERY_ANCHOR_DATE)
+        # 캐시 hit 과 같이 LLM 변환 기준일(프로세스 시작일)과 오늘의 차이만큼 상대 날짜를 이동
+        return rebase_relative_dates(query, result, PATENT_QUERY_ANCHOR_DATE)
+
+    async def _speculative_search(
+        self,
+        es: AsyncElasticsearch,
+        query: str,
+        size: int,
+        column_names: list = COLUMN_NAMES1,
+        extra_filter: Optional[dict] = None,
+        aggs: Optional[dict] = None,
+        k: Optional[int] = None,
+    ) -> dict:
+        """질의 원문 그대로 임베딩 + kNN 검색 (LLM 변환 결과를 기다리는 동안 미리 수행)"""
+        query_vector = await self.encode_query(query)
+        es_knn = self._get_knn(query_vector, query, k or size, extra_filter)
+        return await self.knn_search(es, es_knn, size, column_names, aggs)
+
+    def _is_speculation_reusable(self, query: str, result: dict) -> bool:
+        """변환된 키워드가 질의 원문과 같고 키워드 외 조건(날짜, 권리자 등)이 없으면 미리 검색한 결과와 같다
+
+        filter 가 주제어 like 절(should)뿐이면 must 로 추가되는 text match 때문에 should 는 매칭에 영향이 없으므로,
+        최종 kNN 필터는 질의 원문 검색의 {"match": {"text": query}} 와 같아진다.
+        """
+        if normalize_text(result["keywords"] or "") != normalize_text(query):
+            return False
+        es_filter = result["filter"][0]
+        return set(es_filter) == {"bool"} and set(es_filter["bool"]) <= {"should"}
+
+    async def search_nl(
+        self,
+        es: AsyncElasticsearch,
+        query: str,
+        size: int,
+        column_names: list = COLUMN_NAMES1,
+        extra_filter: Optional[dict] = None,
+        aggs: Optional[dict] = None,
+        k: Optional[int] = None,
+    ) -> dict:
+        """자연어 질의 검색
+
+        LLM 으로 질의를 변환하는 동안 질의 원문 임베딩과 필터 없는 kNN 검색을 미리 수행하고,
+        변환 결과가 원문 검색과 같으면 그 결과를 그대로 사용한다. 다르면 미리 수행한 검색은 취소하고,
+        임베딩은 캐시를 통해 키워드가 같은 경우에만 재사용된다.
+        extra_filter(HS 코드 필터 등)는 두 검색 모두에 must 로 추가된다.
+        aggs 를 지정하면 kNN 의 k(기본 size) 개 문서에 대한 집계를 같은 요청으로 받는다.
+
+        Returns:
+            dict: Elasticsearch 검색 결과
+        """
+        speculation = None
+        if NL_SPECULATION_ENABLED:
+            speculation = asyncio.create_task(
+                self._speculative_search(es, query, size, column_names, extra_filter, aggs, k)
+            )
+            # 사용하지 않고 버린 미리 검색 결과의 예외는 무시
+            speculation.add_done_callback(lambda task: task.cancelled() or task.exception())
         try:
-            yield es
+            result = await self.translate_nl_query(query)
+            if result["status"] != "success":
+                raise ModelPredictionError(QUERY_GENERATION_FAIL_MSG)
+            if speculation is not None and self._is_speculation_reusable(query, result):
+                self.speculation_hits += 1
+                return await speculation
+            if speculation is not None:
+                speculation.cancel()
+                self.speculation_misses += 1
+
+            query_vector = await self.encode_query(result["keywords"])
+            es_knn = self._get_nl_knn(query_vector, result, k or size, extra_filter)
+            debug_ic(es_knn)
+            return await self.knn_search(es, es_knn, size, column_names, aggs)
         finally:
-            await es.close()
+            if speculation is not None and not speculation.done():
+                speculation.cancel()
+
+    def _get_nl_knn(self, vector: list, result: dict, size: int, extra_filter: Optional[dict] = None) -> dict:
+        """자연어 질의 변환 결과(filter, keywords)로 kNN 절 생성 (키워드 text match 를 must 로 추가)"""
+        es_filter_gen = result["filter"][0]
+        es_keyword_gen = result["keywords"]
+        es_knn = self._get_knn(vector, es_keyword_gen, size)
+        if es_filter_gen["bool"].get("must"):
+            es_filter_gen["bool"]["must"].append({"match": {"text": es_keyword_gen}})
+        else:
+            es_filter_gen["bool"]["must"] = [{"match": {"text": es_keyword_gen}}]
+        if extra_filter is not None:
+            es_filter_gen["bool"]["must"].append(extra_filter)
+        es_knn["filter"] = es_filter_gen
+        return es_knn
 
-    def _get_knn(self, vector: list, query: str, size: int) -> dict:
+    def speculation_stats(self) -> dict:
+        total = self.speculation_hits + self.speculation_misses
+        return {
+            "enabled": NL_SPECULATION_ENABLED,
+            "hits": self.speculation_hits,
+            "misses": self.speculation_misses,
+            "hitRate": round(self.speculation_hits / total, 4) if total else None,
+        }
+
+    @asynccontextmanager
+    async def get_es_client(self, backend: str = SEARCH_BACKEND):
+        """검색 백엔드를 사용하는 context manager.
+
+        Args:
+            backend (str, optional): "es" 혹은 "local". Defaults to SEARCH_BACKEND.
+
+        Yields:
+            AsyncElasticsearch | LocalVectorIndex: 애플리케이션 공유 Elasticsearch 클라이언트 혹은 로컬 인덱스
+        """
+        if backend == "local":
+            yield self.local_index
+            return
+        async with es_client_pool.acquire() as es:
+            yield es
+
+    async def knn_search(
+        self,
+        es: AsyncElasticsearch,
+        es_knn: dict,
+        size: int,
+        column_names: list = COLUMN_NAMES1,
+        aggs: Optional[dict] = None,
+    ) -> dict:
+        """kNN 검색 실행
+
+        _source 는 결과에 쓰는 metadata 필드만 요청하고(embedding, text 제외), 응답은 filter_path 로 hit 만 받는다.
+        ES 인덱스가 양자화(int8_hnsw 등)되어 있으면 k * VECTOR_RESCORE_FACTOR 개 후보를 뽑은 뒤
+        rescore 절로 float 벡터 점수를 다시 계산한다. 로컬 인덱스는 자체적으로 rescoring 한다.
+        출원 연도별 인덱스가 있으면 필터의 날짜 범위와 겹치는 인덱스만 검색하고,
+        num_candidates 정책이 있으면 필터 선택도에 맞게 num_candidates 를 정한다.
+        aggs(facet 집계)는 kNN 의 k 개 문서에 대해 계산된다.
+        """
+        es_knn = await self._tune_knn(es, es_knn)
+        request = self._get_knn_request(es, es_knn, size)
+        filter_path = HIT_FILTER_PATH
+        if aggs is not None:
+            request["aggs"] = aggs
+            filter_path = HIT_FILTER_PATH + ["aggregations"]
+        index = await self._route_index(es, es_knn)
+        source_includes = [f"metadata.{column}" for column in column_names]
+        try:
+            return await es.search(index=index, source_includes=source_includes, filter_path=filter_path, **request)
+        except NotFoundError:
+            if index == INDEX_NAME:
+                raise
+            # 캐시된 연도별 인덱스가 alias 교체 후 삭제된 경우 alias 구성을 다시 조회하고 alias 로 재시도
+            await self.partition_router.recover(es)
+            return await es.search(index=INDEX_NAME, source_includes=source_includes, filter_path=filter_path, **request)
+
+    async def _route_index(self, es: AsyncElasticsearch, es_knn: dict) -> str:
+        """kNN 검색 대상 인덱스 (연도별 인덱스 라우팅, 로컬 인덱스는 라우팅하지 않음)"""
+        if self.partition_router is None or not isinstance(es, AsyncElasticsearch):
+            return INDEX_NAME
+        return await self.partition_router.route(es, es_knn.get("filter"))
+
+    async def _tune_knn(self, es: AsyncElasticsearch, es_knn: dict) -> dict:
+        """num_candidates 정책 적용 (로컬 인덱스는 nprobe 로 탐색 범위를 정하므로 적용하지 않음)"""
+        if self.candidate_policy is None or not isinstance(es, AsyncElasticsearch):
+            return es_knn
+        return await self.candidate_policy.tune(es, INDEX_NAME, es_knn)
+
+    def _knn_k(self, es: AsyncElasticsearch, k: int, size: int) -> int:
+        """실제 요청하는 kNN k (양자화 인덱스이면 rescore window 까지 늘림)"""
+        if ES_VECTOR_QUANTIZATION == "none" or not isinstance(es, AsyncElasticsearch):
+            return k
+        return max(k, size * VECTOR_RESCORE_FACTOR)
+
+    def _facet_aggregates(self, es: AsyncElasticsearch, size: int, facets: Optional[dict]) -> bool:
+        """facet 을 ES aggregation 으로 계산할지
+
+        aggregation 은 kNN 의 k 개 문서에 대해 집계되므로, k 가 facet size 와 같을 때만 사용한다. IPC 네트워크 표본이나
+        rescore window 로 k 가 더 크면 모든 facet 을 상위 facet size 개 hit 으로 계산해서 같은 문서 집합을 사용한다.
+        """
+        if facets is None or not isinstance(es, AsyncElasticsearch):
+            return False
+        return self._knn_k(es, min(MAX_KNN_CANDIDATES, max(size, facets["size"])), size) == facets["size"]
+
+    def _get_knn_request(self, es: AsyncElasticsearch, es_knn: dict, size: int) -> dict:
+        """kNN 검색 본문 (knn, size, 양자화 인덱스이면 rescore)"""
+        if ES_VECTOR_QUANTIZATION == "none" or not isinstance(es, AsyncElasticsearch):
+            return {"knn": es_knn, "size": size}
+        window = size * VECTOR_RESCORE_FACTOR
+        # facet 집계로 k 가 size 보다 크면 k 는 그대로 두고 상위 window 개만 rescore
+        k = self._knn_k(es, es_knn["k"], size)
+        es_knn = {**es_knn, "k": k, "num_candidates": min(MAX_KNN_CANDIDATES, max(es_knn["num_candidates"], k))}
+        return {
+            "knn": es_knn,
+            "size": size,
+            "rescore": es_rescore(list(map(float, es_knn["query_vector"])), window, VECTOR_FIELD),
+        }
+
+    async def knn_msearch(
+        self, es: AsyncElasticsearch, es_knns: list[dict], sizes: list[int], column_names: list = COLUMN_NAMES1
+    ) -> list:
+        """여러 kNN 검색을 _msearch 한 번으로 실행
+
+        로컬 인덱스는 _msearch 가 없으므로 개별 검색을 동시에 실행한다.
+
+        Returns:
+            list: 검색 순서대로 검색 결과 혹은 예외
+        """
+        if not isinstance(es, AsyncElasticsearch):
+            return await asyncio.gather(
+                *(self.knn_search(es, es_knn, size, column_names) for es_knn, size in zip(es_knns, sizes)),
+                return_exceptions=True,
+            )
+        source = [f"metadata.{column}" for column in column_names]
+        searches = []
+        for es_knn, size in zip(es_knns, sizes):
+            es_knn = await self._tune_knn(es, es_knn)
+            searches += [{"index": await self._route_index(es, es_knn)}, {**self._get_knn_request(es, es_knn, size), "_source": source}]
+        result = await es.msearch(searches=searches, filter_path=MSEARCH_FILTER_PATH)
+        # 라우팅한 연도별 인덱스가 삭제된 검색은 alias 구성을 다시 조회하고 alias 로 재시도 (knn_search 참고)
+        stale = [
+            i for i, item in enumerate(result["responses"])
+            if isinstance(item.get("error"), dict) and item["error"].get("type") == "index_not_found_exception"
+            and searches[2 * i]["index"] != INDEX_NAME
+        ]
+        if stale:
+            await self.partition_router.recover(es)
+            retried = await es.msearch(
+                searches=[part for i in stale for part in ({"index": INDEX_NAME}, searches[2 * i + 1])],
+                filter_path=MSEARCH_FILTER_PATH,
+            )
+            for i, item in zip(stale, retried["responses"]):
+                result["responses"][i] = item
+        responses = []
+        for item in result["responses"]:
+            if "error" in item:
+                responses.append(RuntimeError(f"{ES_API_ERROR_MSG} [{item.get('status')}] {item['error']}"))
+            else:
+                responses.append(item)
+        return responses
+
+    def _get_knn(self, vector: list, query: str, size: int, extra_filter: Optional[dict] = None) -> dict:
+        es_filter = {"match": {"text": query}}
+        if extra_filter is not None:
+            es_filter = {"bool": {"must": [es_filter, extra_filter]}}
         return {
             "field": VECTOR_FIELD,
             "query_vector": vector,
             "k": size,
-            "num_candidates": max(100, size * 5),
-            "filter": {"match": {"text": query}},
+            "num_candidates": min(MAX_KNN_CANDIDATES, max(100, size * 5)),
+            "filter": es_filter,
         }
 
     def filter_search_result(self, hits: list, results: list, column_names: list) -> list:
         """검색 결과 필터링
 
+        결과 key 는 camelCase 로 바로 만든다 (필드명 변환은 호출당 한 번).
+
         Args:
             hits (list): 검색 결과
             results (list): 결과 리스트
@@ -99,13 +468,13 @@ class PatentSearchUtils:
         Returns:
             list: 필터링된 결과 리스트
         """
+        columns = [(column, snake_to_camel(column)) for column in column_names]
         for hit in hits:
-            data = {}
             score = round(hit["_score"], 4) * 100
-            data["score"] = format(score, ".2f")  # 소수점 이하 두 자리로 포맷
+            data = {"score": format(score, ".2f")}  # 소수점 이하 두 자리로 포맷
             metadata = hit["_source"]["metadata"]
-            for column in column_names:
-                data[column] = metadata[column]
+            for column, key in columns:
+                data[key] = metadata[column]
             results.append(data)
         return results
 
@@ -131,6 +500,9 @@ class PatentSearchUtils:
         size: int = SEARCH_SIZE,
         mode: str = "keyword",  # 'keyword' or 'nl'
         column_names: list = COLUMN_NAMES1,
+        ipc_network: Optional[dict] = None,
+        hs_code: Optional[str] = None,
+        facets: Optional[dict] = None,
     ) -> dict:
         """knn 검색과 텍스트 검색을 혼합하여 수행합니다.
 
@@ -140,6 +512,303 @@ class PatentSearchUtils:
             size (int, optional): 검색 결과 수. Defaults to SEARCH_SIZE.
             mode (str, optional): 검색 모드. Defaults to "keyword". 'keyword' or 'nl'
             column_names (list, optional): 결과 필드명. Defaults to COLUMN_NAMES1. COLUMN_NAMES1 or COLUMN_NAMES2
+            ipc_network (dict, optional): IPC 네트워크 계산 옵션 {"level", "sample_size", "max_nodes"}.
+                지정하면 같은 kNN 검색으로 상위 sample_size 개 문서를 받아 data.network 를 계산하고,
+                results 는 상위 size 개만 반환한다. Defaults to None.
+            hs_code (str, optional): HS 품목 분류("품목:세부분류" 혹은 "품목"). 지정하면 해당 분류의 IPC 로
+                kNN 검색을 필터링하고, 결과마다 해당하는 HS 분류(hsCategories)를 표시한다. Defaults to None.
+            facets (dict, optional): facet 옵션 {"names", "size", "buckets", "ipc_level"}. 지정하면 상위 size(facetSize)개
+                문서의 연도 / 권리자 / IPC 분포를 같은 검색으로 계산해 data.facets 로 반환한다. Defaults to None.
+        Returns:
+            dict: 검색 결과
+        """
+        search_size = self._get_search_size(size, ipc_network, facets, es)
+        search_columns = column_names
+        if ipc_network is not None or hs_code:
+            search_columns = list(dict.fromkeys(column_names + ["ipcs"]))
+        if facets is not None:
+            search_columns = list(dict.fromkeys(search_columns + FACET_COLUMNS))
+        search = self.retrieve(es, query, search_size, mode, search_columns, hs_code, facets)
+        return await self._search_response(
+            search, column_names, size, ipc_network, tag_hs_codes=bool(hs_code), facets=facets
+        )
+
+    async def search_combined(
+        self,
+        es: AsyncElasticsearch,
+        query: str,
+        size: int = SEARCH_SIZE,
+        mode: str = "nl",
+        ipc_network: Optional[dict] = None,
+        facets: Optional[dict] = None,
+    ) -> dict:
+        """검색 1회로 유사 특허(COLUMN_NAMES1)와 IPC 네트워크(COLUMN_NAMES2) 결과를 함께 반환
+
+        IPC 네트워크 검색 백엔드(IPC_NETWORK_SEARCH_BACKEND)가 유사 특허 검색 백엔드(SEARCH_BACKEND)와 다르면
+        IPC 네트워크는 해당 백엔드에서 따로 검색한다. 두 결과 중 하나라도 실패하면 실패 응답이다.
+
+        Args:
+            es (AsyncElasticsearch): SEARCH_BACKEND 의 Elasticsearch 클라이언트
+            query (str): 검색 질의
+            size (int, optional): 검색 결과 수. Defaults to SEARCH_SIZE.
+            mode (str, optional): 검색 모드. Defaults to "nl". 'keyword' or 'nl'
+            ipc_network (dict, optional): IPC 네트워크 계산 옵션 (search_es_patent_vector 참고). Defaults to None.
+            facets (dict, optional): facet 옵션 (search_es_patent_vector 참고, similarPatents 에 포함). Defaults to None.
+
+        Returns:
+            dict: {"status", "code", "message", "data": {"similarPatents": {...}, "ipcNetwork": {...}}}
+        """
+        if IPC_NETWORK_SEARCH_BACKEND == SEARCH_BACKEND:
+            search_size = self._get_search_size(size, ipc_network, facets, es)
+            # 두 결과가 같은 검색 결과를 사용하도록 future 로 한 번만 실행
+            retrieval = asyncio.ensure_future(
+                self.retrieve(es, query, search_size, mode, RETRIEVAL_COLUMNS, facets=facets)
+            )
+            similar = await self._search_response(retrieval, COLUMN_NAMES1, size, facets=facets)
+            ipc = await self._search_response(retrieval, COLUMN_NAMES2, size, ipc_network)
+        else:
+            async with self.get_es_client(IPC_NETWORK_SEARCH_BACKEND) as ipc_es:
+                similar_retrieval = asyncio.ensure_future(self.retrieve(
+                    es, query, self._get_search_size(size, None, facets, es), mode, RETRIEVAL_COLUMNS, facets=facets
+                ))
+                ipc_retrieval = asyncio.ensure_future(self.retrieve(
+                    ipc_es, query, self._get_search_size(size, ipc_network, None, ipc_es), mode, RETRIEVAL_COLUMNS
+                ))
+                similar = await self._search_response(similar_retrieval, COLUMN_NAMES1, size, facets=facets)
+                ipc = await self._search_response(ipc_retrieval, COLUMN_NAMES2, size, ipc_network)
+        status = similar
+        if similar["status"] == "success" and ipc["status"] != "success":
+            status = {**ipc, "message": f"{IPC_NETWORK_FAIL_MSG} {ipc['message']}"}
+        return {
+            "status": status["status"],
+            "code": status["code"],
+            "message": status["message"],
+            "data": {"similarPatents": similar["data"], "ipcNetwork": ipc["data"]},
+        }
+
+    def _get_search_size(
+        self,
+        size: int,
+        ipc_network: Optional[dict] = None,
+        facets: Optional[dict] = None,
+        es: Optional[AsyncElasticsearch] = None,
+    ) -> int:
+        """검색할 hit 수 (IPC 네트워크를 계산하면 sample_size, hit 으로 facet 을 계산하면 facet size 까지)"""
+        search_size = size
+        if ipc_network is not None:
+            search_size = max(search_size, ipc_network["sample_size"])
+        if needs_hits(facets, self._facet_aggregates(es, search_size, facets)):
+            search_size = max(search_size, facets["size"])
+        return min(MAX_KNN_CANDIDATES, search_size)
+
+    async def retrieve(
+        self,
+        es: AsyncElasticsearch,
+        query: str,
+        size: int,
+        mode: str = "keyword",
+        column_names: list = COLUMN_NAMES1,
+        hs_code: Optional[str] = None,
+        facets: Optional[dict] = None,
+    ) -> dict:
+        """검색(retrieval) 단계: (자연어 질의 변환) -> 임베딩 -> kNN 검색 결과 반환 (결과 필드 projection 전)
+
+        retrieval store 가 켜져 있으면 엔드포인트와 관계없이 RETRIEVAL_COLUMNS 를 받아 잠시 저장하므로,
+        같은 질의 / 모드 / 검색 수 / 필터의 검색은 다른 엔드포인트(예: /similar-patents 와 /ipc-network-nl)에서도
+        한 번만 실행된다.
+
+        Args:
+            es (AsyncElasticsearch): Elasticsearch 클라이언트
+            query (str): 검색 질의
+            size (int): 검색할 hit 수
+            mode (str, optional): 검색 모드. Defaults to "keyword". 'keyword' or 'nl'
+            column_names (list, optional): 필요한 결과 필드명. Defaults to COLUMN_NAMES1.
+            hs_code (str, optional): HS 품목 분류 필터. Defaults to None.
+            facets (dict, optional): facet 옵션. aggregation 으로 계산할 수 있으면(_facet_aggregates) kNN 의 k 를 facet size 로
+                두고 facet 집계를 함께 요청한다. Defaults to None.
+
+        Returns:
+            dict: Elasticsearch 검색 결과
+        """
+        if self.retrieval_store is not None:
+            column_names = RETRIEVAL_COLUMNS
+
+        async def search() -> dict:
+            self.validate_input(query)
+            hs_filter = None
+            if hs_code:
+                hs_mask = self.hs_code_index.resolve(hs_code)
+                if not hs_mask:
+                    raise HsCodeNotFoundError(hs_code)
+                hs_filter = self.hs_code_index.es_filter(hs_mask)
+            aggs, k = None, size
+            if self._facet_aggregates(es, size, facets):
+                aggs = facet_aggs(facets)
+                k = facets["size"]
+            if mode == "nl":
+                return await self.search_nl(es, query, size, column_names, hs_filter, aggs, k)
+            elif mode == "keyword":
+                query_vector = await self.encode_query(query)
+                es_knn = self._get_knn(query_vector, query, k, hs_filter)
+                return await self.knn_search(es, es_knn, size, column_names, aggs)
+
+        if self.retrieval_store is None:
+            return await search()
+        try:
+            index_version = await self.retrieval_store.get_index_version(es, INDEX_NAME)
+        except Exception as e:
+            ic(f"인덱스 버전 조회 실패로 검색 결과를 저장하지 않습니다: {e}")
+            return await search()
+        key = self.retrieval_store.make_key(
+            "retrieval", query, index_version, mode=mode, size=size, hs_code=hs_code, facets=facets
+        )
+        return await self.retrieval_store.get_or_compute(key, query, search)
+
+    async def cached_search_es_patent_vector(
+        self, es: AsyncElasticsearch, endpoint: str, query: str, **options
+    ) -> dict:
+        """search_es_patent_vector 결과 캐시 사용
+
+        (엔드포인트, 정규화 질의, 검색 옵션, 인덱스 버전)이 같은 성공 응답은 임베딩 / LLM 변환 / ES 검색 없이 반환한다.
+        인덱스 버전을 조회할 수 없으면 캐시 없이 검색한다.
+
+        Args:
+            es (AsyncElasticsearch): Elasticsearch 클라이언트
+            endpoint (str): 엔드포인트 이름 (캐시 키 구분)
+            query (str): 검색 질의
+            **options: search_es_patent_vector 의 나머지 인자 (size, mode, column_names, ...)
+
+        Returns:
+            dict: 검색 결과
+        """
+        return await self._cached_search(es, endpoint, query, self.search_es_patent_vector, options)
+
+    async def cached_search_combined(self, es: AsyncElasticsearch, endpoint: str, query: str, **options) -> dict:
+        """search_combined 결과 캐시 사용 (cached_search_es_patent_vector 참고)"""
+        return await self._cached_search(es, endpoint, query, self.search_combined, options)
+
+    async def _cached_search(
+        self, es: AsyncElasticsearch, endpoint: str, query: str, search: Callable[..., Awaitable[dict]], options: dict
+    ) -> dict:
+        if self.result_cache is None:
+            return await search(es, query, **options)
+        try:
+            index_version = await self.result_cache.get_index_version(es, INDEX_NAME)
+        except Exception as e:
+            ic(f"인덱스 버전 조회 실패로 캐시를 사용하지 않습니다: {e}")
+            return await search(es, query, **options)
+        key = self.result_cache.make_key(endpoint, query, index_version, **options)
+        return await self.result_cache.get_or_compute(key, query, lambda: search(es, query, **options))
+
+    async def _bulk_search_chunk(
+        self, es: AsyncElasticsearch, queries: list[str], sizes: list[int], mode: str, column_names: list
+    ) -> list:
+        """질의 묶음 검색: (자연어 질의 변환) -> 배치 인코딩 -> _msearch
+
+        Returns:
+            list: 질의 순서대로 검색 결과 혹은 예외
+        """
+        outcomes = [None] * len(queries)
+        valid = []
+        for i, query in enumerate(queries):
+            try:
+                self.validate_input(query)
+                valid.append(i)
+            except (TypeError, ValueError) as e:
+                outcomes[i] = e
+
+        translations = {}
+        if mode == "nl":
+            results = await asyncio.gather(*(self.translate_nl_query(queries[i]) for i in valid), return_exceptions=True)
+            for i, result in zip(valid, results):
+                if isinstance(result, BaseException):
+                    outcomes[i] = result
+                elif result["status"] != "success":
+                    outcomes[i] = ModelPredictionError(QUERY_GENERATION_FAIL_MSG)
+                else:
+                    translations[i] = result
+            valid = [i for i in valid if i in translations]
+        if not valid:
+            return outcomes
+
+        keywords = [translations[i]["keywords"] if mode == "nl" else queries[i] for i in valid]
+        try:
+            vectors = await self.encode_queries(keywords)
+            es_knns = [
+                self._get_nl_knn(vector, translations[i], sizes[i]) if mode == "nl"
+                else self._get_knn(vector, keyword, sizes[i])
+                for i, keyword, vector in zip(valid, keywords, vectors)
+            ]
+            es_results = await self.knn_msearch(es, es_knns, [sizes[i] for i in valid], column_names)
+        except Exception as e:
+            es_results = [e] * len(valid)
+        for i, es_result in zip(valid, es_results):
+            outcomes[i] = es_result
+        return outcomes
+
+    async def bulk_search_es_patent_vector(
+        self,
+        es: AsyncElasticsearch,
+        queries: list[str],
+        sizes: list[int],
+        mode: str = "nl",
+        column_names: list = COLUMN_NAMES1,
+        chunk_size: int = BULK_SEARCH_SETTINGS["chunk_size"],
+    ) -> AsyncIterator[dict]:
+        """여러 질의를 chunk_size 개씩 묶어 검색하고 질의별 결과를 순서대로 반환
+
+        묶음마다 임베딩은 한 배치로, 검색은 _msearch 한 번으로 실행한다. 현재 묶음의 결과를 내보내는 동안
+        다음 묶음 하나만 미리 실행하므로 메모리 사용량은 입력 크기와 관계없이 묶음 2개 분량으로 제한된다.
+
+        Args:
+            es (AsyncElasticsearch): Elasticsearch 클라이언트
+            queries (list[str]): 검색 질의 목록
+            sizes (list[int]): 질의별 검색 결과 수
+            mode (str, optional): 검색 모드. Defaults to "nl". 'keyword' or 'nl'
+            column_names (list, optional): 결과 필드명. Defaults to COLUMN_NAMES1.
+            chunk_size (int, optional): 묶음 크기. Defaults to BULK_SEARCH_SETTINGS["chunk_size"].
+
+        Yields:
+            dict: {"index": 질의 번호, status, code, message, data} (search_es_patent_vector 응답 형식)
+        """
+
+        def run_chunk(start: int) -> asyncio.Task:
+            end = start + chunk_size
+            return asyncio.create_task(
+                self._bulk_search_chunk(es, queries[start:end], sizes[start:end], mode, column_names)
+            )
+
+        task = run_chunk(0) if queries else None
+        try:
+            for start in range(0, len(queries), chunk_size):
+                outcomes = await task
+                task = run_chunk(start + chunk_size) if start + chunk_size < len(queries) else None
+                for offset, outcome in enumerate(outcomes):
+                    response = await self._search_response(_resolve(outcome), column_names)
+                    yield {"index": start + offset, **response}
+        finally:
+            if task is not None and not task.done():
+                task.cancel()
+
+    async def _search_response(
+        self,
+        search: Awaitable,
+        column_names: list,
+        size: Optional[int] = None,
+        ipc_network: Optional[dict] = None,
+        tag_hs_codes: bool = False,
+        facets: Optional[dict] = None,
+    ) -> dict:
+        """검색 실행 결과를 응답 형식으로 변환 (예외는 응답 코드 / 메시지로 변환)
+
+        Args:
+            search (Awaitable): Elasticsearch 검색 결과를 반환하는 awaitable
+            column_names (list): 결과 필드명
+            size (int, optional): 결과로 반환할 상위 hit 수 (None 이면 전부)
+            ipc_network (dict, optional): 지정하면 전체 hit 의 IPC 로 data.network 계산
+            tag_hs_codes (bool, optional): 결과마다 IPC 가 속한 HS 분류(hsCategories) 표시
+            facets (dict, optional): 지정하면 aggregation 결과와 hit 으로 data.facets 계산
+
         Returns:
             dict: 검색 결과
         """
@@ -150,42 +819,26 @@ class PatentSearchUtils:
             "data": {"results": []},
         }
         try:
-            self.validate_input(query)
-            if mode == "nl":
-                result = generate_es_query_from_nl_query(query)
-                if result["status"] == "success":
-                    es_filter_gen = result["filter"][0]
-                    es_keyword_gen = result["keywords"]
-                    query_vector = self.model.encode(result["keywords"])["dense_vecs"]
-                    es_knn = self._get_knn(query_vector, es_keyword_gen, size)
-                    if es_filter_gen["bool"].get("must"):
-                        es_filter_gen["bool"]["must"].append({"match": {"text": es_keyword_gen}})
-                    else:
-                        es_filter_gen["bool"]["must"] = [{"match": {"text": es_keyword_gen}}]
-                    es_knn["filter"] = es_filter_gen
-                    debug_ic(es_knn)
-                else:
-                    raise ModelPredictionError(QUERY_GENERATION_FAIL_MSG)
-            elif mode == "keyword":
-                query_vector = self.model.encode(query)["dense_vecs"]
-                es_knn = self._get_knn(query_vector, query, size)
-
-            es_result = await es.search(
-                index=INDEX_NAME,
-                knn=es_knn,
-                size=size
-            )
-            hits = es_result["hits"]["hits"]
+            es_result = await search
+            # filter_path 적용 시 결과가 없으면 hits 키가 빠진다
+            hits = es_result.get("hits", {}).get("hits", [])
+            if ipc_network is not None:
+                response["data"]["network"] = build_ipc_network(
+                    (hit["_source"]["metadata"].get("ipcs") for hit in hits),
+                    level=ipc_network["level"],
+                    max_nodes=ipc_network["max_nodes"],
+                )
+            if facets is not None:
+                response["data"]["facets"] = build_facets(es_result, hits, facets)
+            hits = hits[:size]
             response["data"]["results"] = self.filter_search_result(
                 hits, response["data"]["results"], column_names
             )
+            if tag_hs_codes:
+                for result, hit in zip(response["data"]["results"], hits):
+                    result["hsCategories"] = self.hs_code_index.tag(hit["_source"]["metadata"].get("ipcs"))
             if not response["data"]["results"]:
                 raise DataNotFoundError(ES_DATA_NOT_FOUND_MSG)
-            # data>results 안에 있는 key를 snake_case를 camelCase로 변환
-            response["data"]["results"] = [
-                {snake_to_camel(key): value for key, value in result.items()}
-                for result in response["data"]["results"]
-            ]
             response["status"] = "success"
             response["code"] = Success.SUCCESS["code"]
             response["message"] = "검색에 성공했습니다."
@@ -193,10 +846,18 @@ class PatentSearchUtils:
             response["data"]["results"] = []
             response["code"] = ServiceInternalError.DATA_NOT_FOUND_ERROR["code"]
             response["message"] = ServiceInternalError.DATA_NOT_FOUND_ERROR["message"] + str(e)
+        except HsCodeNotFoundError as e:
+            response["data"]["results"] = []
+            response["code"] = ServiceInternalError.HS_CODE_NOT_FOUND_ERROR["code"]
+            response["message"] = ServiceInternalError.HS_CODE_NOT_FOUND_ERROR["message"] + f" {e}"
         except ModelPredictionError as e:
             response["data"]["results"] = []
             response["code"] = ModelExecutionError.MODEL_PREDICTION_ERROR["code"]
             response["message"] = ModelExecutionError.MODEL_PREDICTION_ERROR["message"] + str(e)
+        except UnsupportedFilterError as e:
+            response["data"]["results"] = []
+            response["code"] = ModelExecutionError.UNSUPPORTED_FILTER_ERROR["code"]
+            response["message"] = ModelExecutionError.UNSUPPORTED_FILTER_ERROR["message"] + f" {e}"
         except ValueError as e:
             response["data"]["results"] = []
             response["message"] = ModelExecutionError.INPUT_LENGTH_ERROR["message"] + str(e)
@@ -230,9 +891,14 @@ class PatentSearchUtils:
         return response
 
 
-if __name__ == "__main__":
-    import asyncio
+async def _resolve(outcome):
+    """묶음 검색 결과(검색 결과 혹은 예외)를 awaitable 로 변환"""
+    if isinstance(outcome, BaseException):
+        raise outcome
+    return outcome
+
 
+if __name__ == "__main__":
     patent_search_utils = PatentSearchUtils()
 
     async def main(query, mode, size=SEARCH_SIZE):
@@ -241,6 +907,8 @@ if __name__ == "__main__":
                 es, query, mode=mode, size=size
                 )
             ic(es_result)
+        await patent_search_utils.embedding_service.close()
+        await es_client_pool.close()
 
     size = 10
     modes = ["nl", "keyword"]
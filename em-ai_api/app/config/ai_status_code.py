@@ -43,6 +43,11 @@ class ModelExecutionError:
         "message": "모델 실행 중 API 연결 에러가 발생했습니다. 서버의 인터넷 연결을 확인해주세요.",
         "type": "APIConnectionError",
     }
+    UNSUPPORTED_FILTER_ERROR = {
+        "code": 880,
+        "message": "지원하지 않는 검색 필터 조건입니다. 검색 조건을 확인해주세요.",
+        "type": "UnsupportedFilterError",
+    }
     AUTHENTICATION_ERROR = {
         "code": 890,
         "message": "모델 실행 중 인증 에러가 발생했습니다. 허깅페이스 혹은 OpenAI 토큰을 확인하거나, 담당자에게 문의해주세요.",
@@ -95,6 +100,12 @@ class ServiceInternalError:
         "type": "DataNotFoundError",
     }
 
+    HS_CODE_NOT_FOUND_ERROR = {
+        "code": 610,
+        "message": "등록되지 않은 HS 코드입니다. HS 코드 목록을 확인해주세요.",
+        "type": "HsCodeNotFoundError",
+    }
+
     SERVICE_INTERNAL_ERROR = {
         "code": 666,
         "message": "서비스 내부 에러가 발생했습니다. 담당자에게 문의해주세요.",
@@ -9,3 +9,21 @@ class ModelPredictionError(Exception):
     def __init__(self, message="모델 예측 중 오류가 발생했습니다"):
         self.message = message
         super().__init__(self.message)
+
+
+class HsCodeNotFoundError(Exception):
+    def __init__(self, message="등록되지 않은 HS 코드입니다"):
+        self.message = message
+        super().__init__(self.message)
+
+
+class UnsupportedFilterError(ValueError):
+    def __init__(self, message="지원하지 않는 검색 필터입니다"):
+        self.message = message
+        super().__init__(self.message)
+
+
+class ModelNotReadyError(Exception):
+    def __init__(self, message="모델이 아직 준비되지 않았습니다"):
+        self.message = message
+        super().__init__(self.message)
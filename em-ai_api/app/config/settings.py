@@ -17,6 +17,127 @@ CPU_MARIADB_URL = (
 # elasticsearch
 ES_CLOUD_ID = os.getenv("ELASTICSEARCH_CLOUD_ID")
 ES_API_KEY = os.getenv("ELASTICSEARCH_API_KEY")
+# 자체 클러스터/로컬 ES 를 사용할 때만 지정 (콤마 구분, 지정 시 cloud_id 대신 사용)
+ES_HOSTS = [host for host in os.getenv("ELASTICSEARCH_HOSTS", "").split(",") if host]
+ES_CLIENT_SETTINGS = {
+    "request_timeout": int(os.getenv("ES_REQUEST_TIMEOUT", 60)),
+    "max_retries": int(os.getenv("ES_MAX_RETRIES", 3)),
+    "connections_per_node": int(os.getenv("ES_CONNECTIONS_PER_NODE", 32)),
+    "http_compress": os.getenv("ES_HTTP_COMPRESS", "true").lower() == "true",
+    "sniff": os.getenv("ES_SNIFF", "false").lower() == "true",
+    "dead_node_backoff_factor": float(os.getenv("ES_DEAD_NODE_BACKOFF_FACTOR", 1.0)),
+    "max_dead_node_backoff": float(os.getenv("ES_MAX_DEAD_NODE_BACKOFF", 30.0)),
+}
+
+# 질의 임베딩 캐시 (disk_dir 을 지정하면 워커 프로세스 간 공유되는 mmap 캐시 사용)
+EMBEDDING_CACHE_SETTINGS = {
+    "max_items": int(os.getenv("EMBEDDING_CACHE_MAX_ITEMS", 10000)),
+    "disk_dir": os.getenv("EMBEDDING_CACHE_DIR", ""),
+    "disk_slots": int(os.getenv("EMBEDDING_CACHE_DISK_SLOTS", 100000)),
+}
+
+# 질의 임베딩 배치 인코딩 서비스 (intra_op_threads 0 이면 torch / ONNX Runtime 기본값 사용)
+EMBEDDING_SERVICE_SETTINGS = {
+    "max_batch_size": int(os.getenv("EMBEDDING_MAX_BATCH_SIZE", 32)),
+    "max_wait_ms": float(os.getenv("EMBEDDING_MAX_WAIT_MS", 5)),
+    "workers": int(os.getenv("EMBEDDING_WORKERS", 1)),
+    "intra_op_threads": int(os.getenv("EMBEDDING_INTRA_OP_THREADS", os.cpu_count() or 0)),
+}
+
+# 자연어 질의 -> ES 쿼리 변환 결과 캐시 (상대 날짜 질의는 relative_ttl 적용)
+QUERY_CACHE_SETTINGS = {
+    "enabled": os.getenv("QUERY_CACHE_ENABLED", "1").lower() in ("1", "true"),
+    "max_items": int(os.getenv("QUERY_CACHE_MAX_ITEMS", 5000)),
+    "ttl": float(os.getenv("QUERY_CACHE_TTL", 7 * 24 * 3600)),
+    "relative_ttl": float(os.getenv("QUERY_CACHE_RELATIVE_TTL", 24 * 3600)),
+    "similarity_threshold": float(os.getenv("QUERY_CACHE_SIMILARITY_THRESHOLD", 0.95)),
+}
+
+# 자주 쓰이는 자연어 질의 패턴을 LLM 없이 규칙으로 변환
+NL_FAST_PATH_ENABLED = os.getenv("NL_FAST_PATH_ENABLED", "1").lower() in ("1", "true")
+
+# 자연어 검색 시 LLM 변환과 병렬로 질의 원문 임베딩/kNN 검색을 미리 수행
+NL_SPECULATION_ENABLED = os.getenv("NL_SPECULATION_ENABLED", "1").lower() in ("1", "true")
+
+# 특허 벡터 검색 백엔드 (es: Elasticsearch kNN, local: 프로세스 내 memory-map 인덱스)
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "es")
+IPC_NETWORK_SEARCH_BACKEND = os.getenv("IPC_NETWORK_SEARCH_BACKEND", SEARCH_BACKEND)
+# 로컬 인덱스 경로 (app.common.patent.base.local_vector_index build 로 생성) 및 최소 탐색 리스트 수
+LOCAL_INDEX_DIR = os.getenv("LOCAL_INDEX_DIR", "/opt/patent_index")
+LOCAL_INDEX_NPROBE = int(os.getenv("LOCAL_INDEX_NPROBE", 16))
+# 양자화 벡터 후보 생성 (none, int8, binary) 후 상위 k * VECTOR_RESCORE_FACTOR 개를 float 벡터로 재계산
+LOCAL_INDEX_QUANTIZATION = os.getenv("LOCAL_INDEX_QUANTIZATION", "none")
+ES_VECTOR_QUANTIZATION = os.getenv("ES_VECTOR_QUANTIZATION", "none")
+VECTOR_RESCORE_FACTOR = int(os.getenv("VECTOR_RESCORE_FACTOR", 4))
+
+# 서비스가 검색하는 특허 벡터 인덱스 (색인기가 alias 를 새 인덱스로 교체하므로 alias 이름을 지정할 수 있음)
+PATENT_INDEX_NAME = os.getenv("PATENT_INDEX_NAME", "em_ai_patent_vector_index_v1")
+# 쿼리 생성 프롬프트 few-shot 예시 동적 선택 (질의와 비슷한 예시 k 개, 예시 토큰 합 token_budget 이하)
+FEW_SHOT_SELECTION_SETTINGS = {
+    "enabled": os.getenv("FEW_SHOT_SELECTION_ENABLED", "1").lower() in ("1", "true"),
+    "k": int(os.getenv("FEW_SHOT_SELECTION_K", 4)),
+    "token_budget": int(os.getenv("FEW_SHOT_SELECTION_TOKEN_BUDGET", 1200)),
+    "encoding": os.getenv("FEW_SHOT_SELECTION_ENCODING", "cl100k_base"),  # tiktoken 인코딩 (토큰 수 계산용)
+    "prompt_cache_size": int(os.getenv("FEW_SHOT_SELECTION_PROMPT_CACHE_SIZE", 256)),
+}
+# 검색 결과 facet (연도 / 권리자 / IPC 분포)
+SEARCH_FACET_SETTINGS = {
+    "size": int(os.getenv("SEARCH_FACET_SIZE", 100)),  # 기본 집계 대상 문서 수 (kNN 상위 k)
+    "max_size": int(os.getenv("SEARCH_FACET_MAX_SIZE", 1000)),
+    "buckets": int(os.getenv("SEARCH_FACET_BUCKETS", 20)),  # facet 별 최대 항목 수
+}
+# 출원 연도별 인덱스 라우팅 (alias 에 "{alias}_..._{연도}" 인덱스가 있을 때 날짜 조건과 겹치는 인덱스만 검색)
+DATE_PARTITION_SETTINGS = {
+    "enabled": os.getenv("DATE_PARTITION_ROUTING_ENABLED", "1").lower() in ("1", "true"),
+    "refresh_interval": int(os.getenv("DATE_PARTITION_REFRESH_INTERVAL", 300)),  # alias 구성 재조회 주기 (초)
+}
+# kNN num_candidates 정책 (knn_autotuner tune 결과, 파일이 없으면 size * 5 고정)
+KNN_CANDIDATE_POLICY_SETTINGS = {
+    "enabled": os.getenv("KNN_CANDIDATE_POLICY_ENABLED", "1").lower() in ("1", "true"),
+    "path": os.getenv("KNN_CANDIDATE_POLICY_PATH", "app/common/patent/resources/knn_candidate_policy.json"),
+    "sample_size": int(os.getenv("KNN_CANDIDATE_POLICY_SAMPLE_SIZE", 1000)),  # 선택도 추정 표본 문서 수
+}
+# 특허 벡터 인덱스 색인기 (app.common.patent.base.patent_indexer)
+INDEXER_SETTINGS = {
+    "source_table": os.getenv("INDEXER_SOURCE_TABLE", "patent_scraping.corporation_patent_view"),
+    "page_size": int(os.getenv("INDEXER_PAGE_SIZE", 2000)),
+    "batch_size": int(os.getenv("INDEXER_BATCH_SIZE", 128)),
+    "workers": int(os.getenv("INDEXER_WORKERS", 2)),
+    "max_length": int(os.getenv("INDEXER_MAX_LENGTH", 512)),
+    "bulk_chunk_size": int(os.getenv("INDEXER_BULK_CHUNK_SIZE", 500)),
+    "checkpoint_every": int(os.getenv("INDEXER_CHECKPOINT_EVERY", 5000)),
+    "checkpoint_path": os.getenv("INDEXER_CHECKPOINT_PATH", "/opt/patent_indexer/checkpoint.json"),
+}
+
+# 검색 응답 캐시 (인덱스 버전은 version_check_interval 초마다 확인, 바뀌면 전체 무효화)
+SEARCH_RESULT_CACHE_SETTINGS = {
+    "enabled": os.getenv("SEARCH_RESULT_CACHE_ENABLED", "1").lower() in ("1", "true"),
+    "max_items": int(os.getenv("SEARCH_RESULT_CACHE_MAX_ITEMS", 2000)),
+    "ttl": float(os.getenv("SEARCH_RESULT_CACHE_TTL", 3600)),
+    "version_check_interval": float(os.getenv("SEARCH_RESULT_CACHE_VERSION_CHECK_INTERVAL", 60)),
+}
+
+# 검색(retrieval) 결과 임시 저장: 결과 필드만 다른 엔드포인트(/similar-patents, /ipc-network-nl)가 같은 검색 결과를 재사용
+RETRIEVAL_STORE_SETTINGS = {
+    "enabled": os.getenv("RETRIEVAL_STORE_ENABLED", "1").lower() in ("1", "true"),
+    "max_items": int(os.getenv("RETRIEVAL_STORE_MAX_ITEMS", 256)),
+    "ttl": float(os.getenv("RETRIEVAL_STORE_TTL", 120)),
+}
+
+# IPC 네트워크 계산: 검색 결과 수와 별개로 상위 sample_size 개 문서의 IPC 로 노드/엣지 계산 (노드는 상위 max_nodes 개)
+IPC_NETWORK_SETTINGS = {
+    "sample_size": int(os.getenv("IPC_NETWORK_SAMPLE_SIZE", 1000)),
+    "max_nodes": int(os.getenv("IPC_NETWORK_MAX_NODES", 100)),
+}
+
+# HS 품목 분류 -> IPC 코드 매핑 (IPC 네트워크 검색의 hsCode 필터)
+HS_CODE_PATH = os.getenv("HS_CODE_PATH", "app/common/patent/resources/hscode.json")
+
+# 대량 유사 특허 검색: chunk_size 개씩 묶어 배치 인코딩 + _msearch 후 NDJSON 으로 스트리밍
+BULK_SEARCH_SETTINGS = {
+    "chunk_size": int(os.getenv("BULK_SEARCH_CHUNK_SIZE", 32)),
+    "max_queries": int(os.getenv("BULK_SEARCH_MAX_QUERIES", 2000)),
+}
 
 # oauth2 secret key
 SECRET_KEY = os.getenv("SECRET_KEY")
@@ -25,6 +146,29 @@ ALGORITHM = os.getenv("ALGORITHM")
 # huggingface token
 HF_TOKEN = os.getenv("HF_TOKEN")
 
+# huggingface hub 캐시 (컨테이너에 마운트되는 경로) 및 오프라인 모드
+HF_HUB_CACHE = os.getenv("HF_HUB_CACHE", "/opt/hf/hub")
+HF_HUB_OFFLINE = os.getenv("HF_HUB_OFFLINE", "0").lower() in ("1", "true")
+MODEL_MANIFEST_PATH = os.getenv("MODEL_MANIFEST_PATH", "app/config/model_manifest.json")
+
+# 사전 병합/양자화된 모델 아티팩트 경로 (app.common.news.base.model_bake 로 생성)
+BAKED_MODEL_DIR = os.getenv("BAKED_MODEL_DIR", "/opt/hf/hub/baked")
+
+# 특허 검색 질의 인코더 (torch: FlagEmbedding fp32, onnx: int8 ONNX Runtime dense head)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+# ONNX 인코더 아티팩트 경로 (app.common.patent.base.onnx_encoder export 로 생성)
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", "/opt/hf/hub/onnx")
+# 질의 길이 버킷 (토큰 수, 배치 최대 길이 이상인 가장 작은 버킷으로 패딩 / 비우면 배치 최대 길이로 패딩)
+ONNX_LENGTH_BUCKETS = [
+    int(bucket) for bucket in os.getenv("ONNX_LENGTH_BUCKETS", "32,64,128,256,512").split(",") if bucket
+]
+
+
+# 배포 역할 (news, patent-search, patent-gen, buyers, all / 콤마로 여러 개 지정 가능)
+SERVICE_ROLES = [
+    role.strip() for role in os.getenv("SERVICE_ROLE", "all").split(",") if role.strip()
+]
+
 
 # cors allow origins
 CORS_ALLOW_ORIGINS = [
@@ -55,5 +199,25 @@ AZURE_OPENAI_API_KEY = os.getenv("AZURE_OPENAI_API_KEY")
 AZURE_OPENAI_ENDPOINT = os.getenv("AZURE_OPENAI_ENDPOINT")
 AZURE_OPENAI_API_VERSION = os.getenv("AZURE_OPENAI_API_VERSION")
 
+# 뉴스 사전 필터 (mode: off, lexicon, linear, shadow)
+# shadow: 모든 기사를 채점하되 스킵하지 않고 실제 모델 결과와 함께 기록 (학습 데이터 / 오스킵률 수집)
+# skip_confidence: 관련 없을 확률이 이 값 이상이면 GPU 추론 없이 DATA_NOT_FOUND 응답
+# audit_rate: 스킵 판정 중 실제 모델을 실행해서 오스킵률을 측정할 비율
+# log_enabled: 판정 로그 기록 (본문 해시만), log_text: 학습 데이터 수집용으로 기사 본문도 기록
+NEWS_PREFILTER_SETTINGS = {
+    task: {
+        "mode": os.getenv(f"NEWS_{task.upper()}_PREFILTER_MODE", "off"),
+        "skip_confidence": float(os.getenv(f"NEWS_{task.upper()}_PREFILTER_SKIP_CONFIDENCE", 0.9)),
+        "audit_rate": float(os.getenv(f"NEWS_{task.upper()}_PREFILTER_AUDIT_RATE", 0.05)),
+        "log_enabled": os.getenv("NEWS_PREFILTER_LOG_ENABLED", "false").lower() == "true",
+        "log_text": os.getenv("NEWS_PREFILTER_LOG_TEXT", "false").lower() == "true",
+    }
+    for task in ("investment", "esg")
+}
+NEWS_PREFILTER_MODEL_DIR = os.getenv("NEWS_PREFILTER_MODEL_DIR", "app/common/news/resources/prefilter")
+
+# model loading
+MODEL_LOAD_WORKERS_PER_DEVICE = int(os.getenv("MODEL_LOAD_WORKERS_PER_DEVICE", 4))
+
 # cuda
 os.environ["CUBLAS_WORKSPACE_CONFIG"] = ":4096:8"
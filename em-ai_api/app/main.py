@@ -1,11 +1,52 @@
+import importlib
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.config.settings import CORS_ALLOW_ORIGINS
-from app.api.news_router import router as news_router
-from app.api.patent_router import router as patent_router
+from app.config.settings import CORS_ALLOW_ORIGINS, SERVICE_ROLES
+from app.common.core.model_registry import model_registry
+
+# 역할별로 마운트할 라우터 (모듈 경로, prefix, tag)
+# 선택되지 않은 역할의 라우터 모듈은 import 되지 않으므로, 해당 모델과 의존성도 로드되지 않는다.
+ROLE_ROUTERS = {
+    "news": [("app.api.news_router", "/api/v1/news", "em-ai_news")],
+    "patent-search": [("app.api.patent_search_router", "/api/v1/patent", "em-ai_patent")],
+    "patent-gen": [("app.api.patent_gen_router", "/api/v1/patent", "em-ai_patent")],
+    "buyers": [("app.api.patent_buyer_router", "/api/v1/patent", "em-ai_patent")],
+}
+ROLE_ROUTERS["all"] = [router for routers in ROLE_ROUTERS.values() for router in routers]
+
+
+def get_role_routers(roles: list[str]) -> list[tuple]:
+    """역할 목록에 해당하는 라우터 목록 반환 (중복 제거)"""
+    unknown_roles = [role for role in roles if role not in ROLE_ROUTERS]
+    if unknown_roles:
+        raise ValueError(f"알 수 없는 SERVICE_ROLE 입니다: {unknown_roles} (가능한 값: {list(ROLE_ROUTERS)})")
+    routers = []
+    for role in roles:
+        for router in ROLE_ROUTERS[role]:
+            if router not in routers:
+                routers.append(router)
+    return routers
+
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 모델 로딩은 백그라운드에서 병렬로 진행하고, 준비 상태는 /ready 로 확인
+    model_registry.start()
+    # 라우터 모듈별 공유 자원(ES 클라이언트 등) 생성/정리
+    for module in router_modules:
+        if hasattr(module, "on_startup"):
+            await module.on_startup()
+    yield
+    for module in router_modules:
+        if hasattr(module, "on_shutdown"):
+            await module.on_shutdown()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # CORS 미들웨어 추가
 app.add_middleware(
@@ -16,10 +57,20 @@ app.add_middleware(
     allow_headers=["*"],  # 모든 헤더를 허용
 )
 
-app.include_router(news_router, prefix="/api/v1/news", tags=["em-ai_news"])
-app.include_router(patent_router, prefix="/api/v1/patent", tags=["em-ai_patent"])
+router_modules = []
+for module_path, prefix, tag in get_role_routers(SERVICE_ROLES):
+    module = importlib.import_module(module_path)
+    app.include_router(module.router, prefix=prefix, tags=[tag])
+    router_modules.append(module)
 
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    return {"status": "healthy", "roles": SERVICE_ROLES}
+
+
+@app.get("/ready")
+async def readiness_check():
+    """모델 컴포넌트별 로딩 상태와 소요 시간을 반환합니다. 모두 준비되기 전에는 503을 반환합니다."""
+    status = model_registry.status()
+    return JSONResponse(status_code=200 if status["ready"] else 503, content=status)
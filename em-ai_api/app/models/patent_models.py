@@ -1,4 +1,4 @@
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Union, Literal
 
 from pydantic import BaseModel
 
@@ -37,6 +37,15 @@ class PatentGenerationResponse(BaseModel):
 class SimilarPatentsRequest(BaseModel):
     userText: str
     size: int
+    facets: Optional[List[Literal["year", "lrhName", "ipc"]]] = None  # 함께 계산할 분포 (대량 검색에서는 무시)
+    facetSize: Optional[int] = None  # facet 을 계산할 상위 문서 수
+    facetBuckets: Optional[int] = None  # facet 별 최대 항목 수
+
+
+# 유사 특허 대량 검색 API
+class SimilarPatentsBulkRequest(BaseModel):
+    queries: List[SimilarPatentsRequest]
+    mode: Literal["nl", "keyword"] = "nl"  # 질의문(nl) 혹은 키워드(keyword)
 
 
 # 유사 특허 보유 기업 검색 API
@@ -49,14 +58,41 @@ class PotentialBuyersRequest(BaseModel):
 class SimilarPatentIPCNetworKeywordRequest(BaseModel):
     keyword: str  # 특허기술 키워드
     size: int  # 검색수량
-    # hsCode: str # HS코드
+    hsCode: Optional[str] = None  # HS코드 (hscode.json 의 "품목:세부분류" 혹은 "품목")
+    network: bool = False  # IPC 네트워크(노드/엣지) 계산 여부
+    ipcLevel: Literal["section", "class", "subclass", "group", "subgroup"] = "subclass"  # IPC 계층
+    networkSize: Optional[int] = None  # 네트워크 계산에 사용할 상위 문서 수
+    maxNodes: Optional[int] = None  # 최대 노드 수
+    facets: Optional[List[Literal["year", "lrhName", "ipc"]]] = None  # 함께 계산할 분포
+    facetSize: Optional[int] = None  # facet 을 계산할 상위 문서 수
+    facetBuckets: Optional[int] = None  # facet 별 최대 항목 수
 
 
 # 특허 IPC 네트워크 검색 API - 질의문 형태
 class SimilarPatentIPCNetworNLRequest(BaseModel):
     userText: str
     size: int
-    # hsCode: str
+    hsCode: Optional[str] = None
+    network: bool = False
+    ipcLevel: Literal["section", "class", "subclass", "group", "subgroup"] = "subclass"
+    networkSize: Optional[int] = None
+    maxNodes: Optional[int] = None
+    facets: Optional[List[Literal["year", "lrhName", "ipc"]]] = None
+    facetSize: Optional[int] = None
+    facetBuckets: Optional[int] = None
+
+
+# 유사 특허 + IPC 네트워크 통합 검색 API - 질의문 형태 (검색 1회로 두 결과 반환)
+class SimilarPatentsIPCNetworkRequest(BaseModel):
+    userText: str
+    size: int
+    network: bool = False
+    ipcLevel: Literal["section", "class", "subclass", "group", "subgroup"] = "subclass"
+    networkSize: Optional[int] = None
+    maxNodes: Optional[int] = None
+    facets: Optional[List[Literal["year", "lrhName", "ipc"]]] = None
+    facetSize: Optional[int] = None
+    facetBuckets: Optional[int] = None
 
 
 # 특허 가격 조회 API